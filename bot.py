@@ -6,6 +6,7 @@ from utils.logging_setup import setup_logging
 import discord
 from discord.ext import commands
 import motor.motor_asyncio
+from pymongo.errors import OperationFailure
 from typing import Optional, List, Dict, Any, Union, cast
 import traceback
 from datetime import datetime
@@ -113,26 +114,53 @@ class Bot(commands.Bot):
         Returns:
             bool: True if connection successful, False otherwise
         """
+        # Reuse the existing connection pool if already connected
+        if self._db is not None:
+            return True
+
         mongo_uri = os.environ.get("MONGODB_URI")
         if not mongo_uri:
             logger.critical("MONGODB_URI environment variable not set")
             return False
 
+        # A single client is shared across retries and by the whole bot so
+        # every query is multiplexed over the same connection pool
+        client = motor.motor_asyncio.AsyncIOMotorClient(
+            mongo_uri, 
+            serverSelectionTimeoutMS=5000,  # 5 second timeout
+            connectTimeoutMS=5000,
+            socketTimeoutMS=10000,
+            maxPoolSize=50,
+            minPoolSize=5  # Keep warm connections so the first queries skip the handshake
+        )
+        db = client.emeralds_killfeed
+
         for attempt in range(1, max_retries + 1):
             try:
                 # Connect to MongoDB
                 logger.info(f"Connecting to MongoDB (attempt {attempt}/{max_retries})...")
-                client = motor.motor_asyncio.AsyncIOMotorClient(
-                    mongo_uri, 
-                    serverSelectionTimeoutMS=5000,  # 5 second timeout
-                    connectTimeoutMS=5000,
-                    socketTimeoutMS=10000
-                )
-                self._db = client.emeralds_killfeed
 
                 # Test connection with a simple operation
-                await self._db.command("ping")
+                await db.command("ping")
+                self._db = db
                 logger.info(f"Successfully connected to MongoDB on attempt {attempt}")
+
+                # Player upserts match on player and server; the unique index
+                # keeps them from scanning the collection or racing into duplicates
+                try:
+                    await db.players.create_index([("player_id", 1), ("server_id", 1)], unique=True)
+                except OperationFailure as e:
+                    logger.warning(f"Could not create players index: {e}")
+
+                # Evict cached server lookups as soon as server documents change
+                from models.server import watch_server_changes
+                watcher = self.create_background_task(watch_server_changes(db), "server_change_stream")
+                # The watcher returns cleanly when change streams are unsupported;
+                # stop tracking it then so the task monitor does not keep reporting it
+                watcher.add_done_callback(
+                    lambda task: self.background_tasks.pop("server_change_stream", None)
+                    if not task.cancelled() and task.exception() is None else None
+                )
                 return True
 
             except Exception as e:
@@ -142,6 +170,7 @@ class Bot(commands.Bot):
                     await asyncio.sleep(retry_delay)
                 else:
                     logger.critical("All database connection attempts failed")
+                    client.close()
                     return False
 
     async def on_ready(self):
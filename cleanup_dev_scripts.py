@@ -14,6 +14,7 @@ import os
 import re
 import sys
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Set, Dict, Tuple
 from datetime import datetime
 
@@ -81,6 +82,9 @@ EXPLICIT_DEV_SCRIPTS = {
     'final_map_files_fix.py',
 }
 
+# Number of backup copies allowed in flight at once
+BACKUP_WORKERS = 8
+
 def should_preserve(file_path: str) -> bool:
     """
     Check if a file should be preserved (not deleted)
@@ -161,6 +165,24 @@ def create_backup_dir() -> str:
     os.makedirs(backup_dir, exist_ok=True)
     return backup_dir
 
+def backup_file(file_path: str, backup_path: str) -> None:
+    """
+    Link a file into the backup directory, creating parent directories
+    
+    The original is deleted once backed up, so a hard link preserves it
+    without copying any data. Files that can't be linked, such as ones on
+    another filesystem, are copied instead.
+    
+    Args:
+        file_path: Path of the file to back up
+        backup_path: Destination path inside the backup directory
+    """
+    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+    try:
+        os.link(file_path, backup_path)
+    except OSError:
+        shutil.copy2(file_path, backup_path)
+
 def cleanup_dev_scripts(dry_run: bool = False) -> Tuple[List[str], List[str]]:
     """
     Clean up development scripts
@@ -200,23 +222,39 @@ def cleanup_dev_scripts(dry_run: bool = False) -> Tuple[List[str], List[str]]:
                         deleted_files.append(file_path)
                         print(f"{'Would delete' if dry_run else 'Deleting'}: {file_path}")
                         
-                        # Move to backup instead of deleting
-                        if not dry_run:
-                            rel_path = os.path.relpath(file_path, '.')
-                            backup_path = os.path.join(backup_dir, rel_path)
-                            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-                            shutil.copy2(file_path, backup_path)
-                            try:
-                                os.remove(file_path)
-                                print(f"Successfully deleted: {file_path}")
-                            except Exception as e:
-                                print(f"Failed to delete {file_path}: {e}")
-                                # Try force delete
-                                try:
-                                    os.unlink(file_path)
-                                    print(f"Force deleted using unlink: {file_path}")
-                                except Exception as unlink_error:
-                                    print(f"Even force delete failed for {file_path}: {unlink_error}")
+    
+    # Move to backup instead of deleting. All backup copies are queued at
+    # once and awaited together, and a file is only removed once its copy
+    # has landed.
+    if not dry_run and deleted_files:
+        backup_paths = [
+            os.path.join(backup_dir, os.path.relpath(file_path, '.'))
+            for file_path in deleted_files
+        ]
+        with ThreadPoolExecutor(max_workers=BACKUP_WORKERS) as executor:
+            backups = [
+                executor.submit(backup_file, file_path, backup_path)
+                for file_path, backup_path in zip(deleted_files, backup_paths)
+            ]
+        
+        for file_path, backup in zip(deleted_files, backups):
+            try:
+                backup.result()
+            except Exception as e:
+                print(f"Failed to back up {file_path}, not deleting: {e}")
+                continue
+            
+            try:
+                os.remove(file_path)
+                print(f"Successfully deleted: {file_path}")
+            except Exception as e:
+                print(f"Failed to delete {file_path}: {e}")
+                # Try force delete
+                try:
+                    os.unlink(file_path)
+                    print(f"Force deleted using unlink: {file_path}")
+                except Exception as unlink_error:
+                    print(f"Even force delete failed for {file_path}: {unlink_error}")
     
     return deleted_files, preserved_files
 
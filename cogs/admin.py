@@ -2,6 +2,7 @@
 Admin commands for bot management
 """
 import os
+import re
 import logging
 import asyncio
 import discord
@@ -16,6 +17,9 @@ from utils.decorators import premium_tier_required, has_admin_permission, requir
 
 logger = logging.getLogger(__name__)
 
+# The HOME_GUILD_ID line of a .env file
+HOME_GUILD_ENV_PATTERN = re.compile(r"^HOME_GUILD_ID=.*$", re.MULTILINE)
+
 class Admin(commands.Cog):
     """Admin commands for bot management"""
 
@@ -328,20 +332,18 @@ class Admin(commands.Cog):
                 # Try to update .env file as a backup (may not work in Replit)
                 try:
                     with open(".env", "r") as f:
-                        lines = f.readlines()
+                        env_content = f.read()
+
+                    # Replace the setting in a single pass over the file
+                    home_guild_line = f"HOME_GUILD_ID={str(ctx.guild.id)}"
+                    env_content, env_updated = HOME_GUILD_ENV_PATTERN.subn(home_guild_line, env_content)
+
+                    # Add the line if it doesn't exist
+                    if not env_updated:
+                        env_content += f"{home_guild_line}\n"
 
                     with open(".env", "w") as f:
-                        env_updated = False
-                        for line in lines:
-                            if line.startswith("HOME_GUILD_ID="):
-                                f.write(f"HOME_GUILD_ID={str(ctx.guild.id)}\n")
-                                env_updated = True
-                            else:
-                                f.write(line)
-                        
-                        # Add the line if it doesn't exist
-                        if not env_updated:
-                            f.write(f"HOME_GUILD_ID={str(ctx.guild.id)}\n")
+                        f.write(env_content)
 
                     logger.info(f"Updated .env file with new home guild ID: {ctx.guild.id}")
                 except Exception as env_error:
@@ -55,6 +55,7 @@ T = TypeVar('T')
 # Import utils 
 from utils.csv_parser import CSVParser
 from utils.sftp import SFTPManager
+from utils.async_utils import semaphore_gather
 from utils.embed_builder import EmbedBuilder
 from utils.helpers import has_admin_permission
 from utils.parser_utils import parser_coordinator, normalize_event_data, categorize_event
@@ -66,6 +67,30 @@ from utils.pycord_utils import create_option
 
 logger = logging.getLogger(__name__)
 
+# Known map subdirectory names in preference order, plus a hashed set for
+# membership tests against directory listings
+MAP_SUBDIRS = ("world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default")
+MAP_SUBDIR_NAMES = frozenset(MAP_SUBDIRS)
+
+# Upper bound on directory listings in flight at once on one SFTP session
+MAX_CONCURRENT_LISTINGS = 16
+
+# Number of CSV files downloaded ahead of the one being processed
+DOWNLOAD_PREFETCH_DEPTH = 4
+
+# Servers whose CSV files are processed at the same time
+MAX_CONCURRENT_SERVERS = 3
+
+# Attribute names worth dumping in debug output, matched in a single scan
+FILE_ATTRIBUTE_PATTERN = re.compile(r"map|csv|file", re.IGNORECASE)
+
+# Seconds before the deathlogs of a server where no map directories were found
+# are probed again; until then the known map paths are not checked each pass
+MISSING_MAP_DIRS_RETRY_INTERVAL = 300.0
+
+# Timestamp embedded in CSV filenames, e.g. 2025.05.03-00.00.00.csv
+CSV_TIMESTAMP_PATTERN = re.compile(r"(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})")
+
 class CSVProcessorCog(commands.Cog):
     """Commands and background tasks for processing CSV files"""
 
@@ -242,9 +267,6 @@ class CSVProcessorCog(commands.Cog):
         except Exception as e:
             logger.error(f"Error saving CSV state for server {server_id}: {e}")
             
-    async def _save_state(self):
-        """Save current CSV processing state to database for all servers"""
-
     async def _check_server_activity(self, server_id, events_found):
         """Track server activity for adaptive processing
 
@@ -287,6 +309,8 @@ class CSVProcessorCog(commands.Cog):
         # Default to standard interval
         return self.default_check_interval
 
+    async def _save_state(self):
+        """Save current CSV processing state to database for all servers"""
         try:
             # Make sure we have a DB connection
             if self.bot.db is None:
@@ -390,59 +414,49 @@ class CSVProcessorCog(commands.Cog):
             # Only log server count, not details (reduce log spam)
             logger.debug(f"Processing CSV files for {len(server_configs)} servers")
 
-            # BATCH PROCESSING: Group servers for efficient processing
-            # Process servers in groups of 3 to balance load
-            batch_size = 3
+            # Process up to MAX_CONCURRENT_SERVERS servers at a time. A server
+            # starts as soon as another finishes, instead of each batch of
+            # servers waiting for its slowest member
             server_items = list(server_configs.items())
-            
-            # Process in batches
-            for i in range(0, len(server_items), batch_size):
-                # Check if we've been processing too long
+            server_slots = asyncio.Semaphore(MAX_CONCURRENT_SERVERS)
+
+            async def process_server(server_id, config):
+                # Don't start more servers once we've been processing too long
                 if time.time() - start_time > 300:  # 5 minute total limit
-                    logger.warning("CSV processing taking too long, stopping after current batch")
-                    break
-                
-                # Get the current batch
-                batch = server_items[i:i+batch_size]
-                batch_tasks = []
-                
-                # Create tasks for the batch
-                for server_id, config in batch:
-                    # Set up processing task with timeout
-                    task = asyncio.create_task(
-                        asyncio.wait_for(
-                            self._process_server_csv_files(server_id, config),
-                            timeout=120  # 2 minute timeout per server
-                        )
-                    )
-                    batch_tasks.append(task)
-                
-                # Process batch concurrently with error handling
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                
-                # Process results and handle errors
-                for j, result in enumerate(batch_results):
-                    server_id = batch[j][0]
-                    if isinstance(result, Exception):
-                        if isinstance(result, asyncio.TimeoutError):
-                            logger.warning(f"CSV processing timed out for server {server_id}")
-                        else:
-                            logger.error(f"Error processing CSV files for server {server_id}: {str(result)}")
+                    return None
+                return await asyncio.wait_for(
+                    self._process_server_csv_files(server_id, config),
+                    timeout=120  # 2 minute timeout per server
+                )
+
+            results = await semaphore_gather(
+                server_slots,
+                [process_server(server_id, config) for server_id, config in server_items]
+            )
+
+            skipped_servers = sum(1 for result in results if result is None)
+            if skipped_servers:
+                logger.warning(f"CSV processing taking too long, skipped {skipped_servers} servers")
+
+            # Process results and handle errors
+            for (server_id, _), result in zip(server_items, results):
+                if isinstance(result, Exception):
+                    if isinstance(result, asyncio.TimeoutError):
+                        logger.warning(f"CSV processing timed out for server {server_id}")
                     else:
-                        # If the result is a valid tuple of (files_processed, events_processed)
-                        if isinstance(result, tuple) and len(result) == 2:
-                            files_processed, events_processed = result
-                            # Update our global counters
-                            if not hasattr(self, 'total_files_processed'):
-                                self.total_files_processed = 0
-                            if not hasattr(self, 'total_events_processed'):
-                                self.total_events_processed = 0
-                                
-                            self.total_files_processed += files_processed
-                            self.total_events_processed += events_processed
-                
-                # Brief pause between batches to reduce resource spikes
-                await asyncio.sleep(5)
+                        logger.error(f"Error processing CSV files for server {server_id}: {str(result)}")
+                else:
+                    # If the result is a valid tuple of (files_processed, events_processed)
+                    if isinstance(result, tuple) and len(result) == 2:
+                        files_processed, events_processed = result
+                        # Update our global counters
+                        if not hasattr(self, 'total_files_processed'):
+                            self.total_files_processed = 0
+                        if not hasattr(self, 'total_events_processed'):
+                            self.total_events_processed = 0
+                            
+                        self.total_files_processed += files_processed
+                        self.total_events_processed += events_processed
 
         except Exception as e:
             logger.error(f"Error in CSV processing task: {str(e)}")
@@ -483,7 +497,7 @@ class CSVProcessorCog(commands.Cog):
                                 logger.debug(f"self.{attr} = list with {len(value)} items")
                             elif isinstance(value, dict) and len(value) > 0:
                                 logger.debug(f"self.{attr} = dict with {len(value)} keys")
-                            elif attr.lower().find('map') >= 0 or attr.lower().find('csv') >= 0 or attr.lower().find('file') >= 0:
+                            elif FILE_ATTRIBUTE_PATTERN.search(attr):
                                 logger.debug(f"self.{attr} = {value} (type: {type(value)})")
                 
                 # Calculate total files found including map directories 
@@ -549,8 +563,9 @@ class CSVProcessorCog(commands.Cog):
     async def before_process_csv_files_task(self):
         """Wait for bot to be ready before starting task"""
         await self.bot.wait_until_ready()
-        # Add a small delay to avoid startup issues
-        await asyncio.sleep(10)
+        # Start once the persisted line positions are loaded, so the first pass
+        # does not reprocess files, waiting no longer than the old fixed delay
+        await asyncio.wait({self.load_state_task}, timeout=10)
 
     async def direct_csv_processing(self, server_id: str, days: int = 30) -> Tuple[int, int]:
         """
@@ -1051,21 +1066,26 @@ class CSVProcessorCog(commands.Cog):
                     if await sftp.exists(deathlogs_path):
                         logger.debug(f"Deathlogs path exists: {deathlogs_path}, checking for map subdirectories")
 
-                        # Define known map directory names to check directly (in order of most common)
-                        known_map_names = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
+                        # Initialize caches if needed. Servers whose deathlogs had no
+                        # map directories are remembered too, so the known paths are not
+                        # probed again on every pass
+                        if not hasattr(self, '_cached_map_dirs'):
+                            self._cached_map_dirs = {}
+                        if not hasattr(self, '_missing_map_dirs_until'):
+                            self._missing_map_dirs_until = {}
+                        map_dirs_missing = self._missing_map_dirs_until.get(server_id, 0) > time.monotonic()
                         
                         # Use cached map directories if available for this server
-                        if hasattr(self, '_cached_map_dirs') and server_id in self._cached_map_dirs:
+                        if server_id in self._cached_map_dirs:
                             map_directories = self._cached_map_dirs[server_id]
                             logger.debug(f"Using {len(map_directories)} cached map directories for server {server_id}")
+                        elif map_dirs_missing:
+                            map_directories = []
+                            logger.debug(f"Skipping map directory checks for server {server_id}, none were found recently")
                         else:
-                            # Initialize cache if needed
-                            if not hasattr(self, '_cached_map_dirs'):
-                                self._cached_map_dirs = {}
-                                
                             # Try to directly check known map directories first, prioritizing the most common ones
                             map_directories = []
-                            for map_name in known_map_names:
+                            for map_name in MAP_SUBDIRS:
                                 map_path = os.path.join(deathlogs_path, map_name)
                                 try:
                                     if await sftp.exists(map_path):
@@ -1079,7 +1099,7 @@ class CSVProcessorCog(commands.Cog):
                                 logger.debug(f"Cached {len(map_directories)} map directories for server {server_id}")
 
                         # If we didn't find any known map directories, list all directories in deathlogs
-                        if not map_directories:
+                        if not map_directories and not map_dirs_missing:
                             logger.debug("No known map directories found, checking all directories in deathlogs")
                             try:
                                 deathlogs_entries = await sftp.client.listdir(deathlogs_path)
@@ -1098,6 +1118,12 @@ class CSVProcessorCog(commands.Cog):
                                             map_directories.append(entry_path)
                                     except Exception as entry_err:
                                         logger.debug(f"Error checking entry {entry_path}: {entry_err}")
+
+                                # Cache what the listing found, or that it found nothing
+                                if map_directories:
+                                    self._cached_map_dirs[server_id] = map_directories
+                                else:
+                                    self._missing_map_dirs_until[server_id] = time.monotonic() + MISSING_MAP_DIRS_RETRY_INTERVAL
                             except Exception as list_err:
                                 logger.warning(f"Error listing deathlogs directory: {list_err}")
 
@@ -1247,9 +1273,6 @@ class CSVProcessorCog(commands.Cog):
                 # Enhanced list of possible paths to check (when map directories search fails)
                 # For Tower of Temptation, we need to include possible map subdirectory paths
 
-                # Define known map subdirectory names
-                map_subdirs = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
-
                 # Build base paths list
                 base_paths = [
                     deathlogs_path,  # Standard path: /hostname_serverid/actual1/deathlogs/
@@ -1264,16 +1287,35 @@ class CSVProcessorCog(commands.Cog):
                     os.path.join("/", server_dir, "actual1"),  # Just the actual1 directory
                 ]
 
-                # Now add map subdirectory variations to each base path
+                # Now add the map subdirectories that exist under each base path.
+                # One listing per base path replaces a separate round trip for
+                # every candidate map subdirectory, and the listings are issued
+                # concurrently so the whole scan costs about one round trip
+                listing_slots = asyncio.Semaphore(MAX_CONCURRENT_LISTINGS)
+
+                async def list_base_path(base_path):
+                    async with listing_slots:
+                        return await sftp.client.list_directory(base_path) if sftp.client else []
+
+                listings = await asyncio.gather(
+                    *(list_base_path(base_path) for base_path in base_paths),
+                    return_exceptions=True
+                )
+
                 possible_paths = []
-                for base_path in base_paths:
+                for base_path, entries in zip(base_paths, listings):
                     # Add the base path first
                     possible_paths.append(base_path)
 
-                    # Then add each map subdirectory variation
-                    for map_subdir in map_subdirs:
-                        map_path = os.path.join(base_path, map_subdir)
-                        possible_paths.append(map_path)
+                    if isinstance(entries, Exception):
+                        logger.debug(f"Could not list {base_path} for map subdirectories: {entries}")
+                        continue
+
+                    # Then add the map subdirectories present, in preference order
+                    present_subdirs = MAP_SUBDIR_NAMES.intersection(entries)
+                    for map_subdir in MAP_SUBDIRS:
+                        if map_subdir in present_subdirs:
+                            possible_paths.append(os.path.join(base_path, map_subdir))
 
                 # Add root as last resort
                 possible_paths.append("/")
@@ -1586,7 +1628,7 @@ class CSVProcessorCog(commands.Cog):
 
                             # Extract the date portion (if it exists)
                             # Match patterns like: 2025.05.03-00.00.00.csv or 2025.05.03-00.00.00
-                            date_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
+                            date_match = CSV_TIMESTAMP_PATTERN.search(filename)
 
                             if date_match:
                                 file_date_str = date_match.group(1)
@@ -1736,7 +1778,7 @@ class CSVProcessorCog(commands.Cog):
                             logger.debug(f"Would any files be included if using a 30-day old cutoff of {debug_date_str}?")
                             for f in csv_files[:5]:  # Check first 5 files
                                 filename = os.path.basename(f)
-                                date_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
+                                date_match = CSV_TIMESTAMP_PATTERN.search(filename)
                                 if date_match:
                                     file_date_str = date_match.group(1)
                                     try:
@@ -2027,344 +2069,480 @@ class CSVProcessorCog(commands.Cog):
                         events_processed = 0
                         processed_files_list = []
                         total_files_to_process = len(files_to_process)
-                        
-                        for file in files_to_process:
-                            try:
-                                # Download file content - use the correct path
-                                file_path = file  # file is already the full path
-                                logger.debug(f"Downloading CSV file: {file_path} ({files_processed + 1}/{len(files_to_process)})")
-
-                                # DISABLED: No longer using attached_assets for testing or debugging
-                                try_attached_assets = False  # Disable attached_assets fallback completely
-
-                                # Special handling for local files in the attached_assets directory is no longer used
-                                if 'attached_assets' in file_path:
-                                    logger.warning(f"Skipping local file in attached_assets: {file_path}")
-                                    logger.warning(f"Attached_assets files should not be processed in production.")
-                                    content = None
-                                else:
-                                    try:
-                                        logger.debug(f"Using enhanced download for file: {file_path}")
 
-                                        # First attempt: Use the standard download method
-                                        content = await sftp.download_file(file_path)
+                        # Downloads run up to DOWNLOAD_PREFETCH_DEPTH files ahead of
+                        # the file being processed, so transfer round trips overlap
+                        # with parsing and database writes instead of adding to them
+                        prefetched_downloads = {}
 
-                                        # Check if we got content
-                                        if content:
-                                            content_bytes = len(content)
-                                            logger.debug(f"Successfully downloaded {file_path} ({content_bytes} bytes)")
-                                        else:
-                                            # Second attempt: Try direct SFTP access if possible
-                                            logger.debug(f"First download attempt failed for {file_path}, trying direct SFTP access")
-                                            try:
-                                                # Try to access the SFTP connection directly
-                                                if hasattr(sftp, 'sftp') and sftp.sftp:
-                                                    async with sftp.sftp.open(file_path, 'r') as remote_file:
-                                                        content = await remote_file.read()
-                                                        content_bytes = len(content) if content else 0
-                                                        logger.debug(f"Successfully accessed file directly: {file_path} ({content_bytes} bytes)")
-                                            except Exception as direct_error:
-                                                logger.debug(f"Direct SFTP access failed: {str(direct_error)}")
-
-                                            # DISABLED: No longer using attached_assets as a fallback
-                                            if not content:
-                                                logger.error(f"All SFTP download attempts failed for {file_path}")
-                                                logger.error(f"Could not retrieve content from SFTP server - this is a legitimate file access failure")
-                                                # No fallback available in production - attached_assets fallback is disabled
-                                    except Exception as e:
-                                        logger.error(f"Exception during SFTP download of {file_path}: {str(e)}")
+                        try:
+                            for file_index, file in enumerate(files_to_process):
+                                for upcoming_file in files_to_process[file_index:file_index + DOWNLOAD_PREFETCH_DEPTH]:
+                                    if upcoming_file not in prefetched_downloads and 'attached_assets' not in upcoming_file:
+                                        prefetched_downloads[upcoming_file] = asyncio.create_task(sftp.download_file(upcoming_file))
+
+                                try:
+                                    # Download file content - use the correct path
+                                    file_path = file  # file is already the full path
+                                    logger.debug(f"Downloading CSV file: {file_path} ({files_processed + 1}/{len(files_to_process)})")
+
+                                    # DISABLED: No longer using attached_assets for testing or debugging
+                                    try_attached_assets = False  # Disable attached_assets fallback completely
+
+                                    # Special handling for local files in the attached_assets directory is no longer used
+                                    if 'attached_assets' in file_path:
+                                        logger.warning(f"Skipping local file in attached_assets: {file_path}")
+                                        logger.warning(f"Attached_assets files should not be processed in production.")
                                         content = None
+                                    else:
+                                        try:
+                                            logger.debug(f"Using enhanced download for file: {file_path}")
 
-                                if content:
-                                    content_length = len(content) if hasattr(content, '__len__') else 0
-                                    logger.debug(f"Downloaded content type: {type(content)}, length: {content_length}")
+                                            # First attempt: Use the standard download method
+                                            download = prefetched_downloads.pop(file_path, None)
+                                            content = await (download or sftp.download_file(file_path))
 
-                                    # Verify the content is not empty
-                                    if content_length == 0:
-                                        logger.warning(f"Empty content downloaded from {file_path} - skipping processing")
-                                        continue
+                                            # Check if we got content
+                                            if content:
+                                                content_bytes = len(content)
+                                                logger.debug(f"Successfully downloaded {file_path} ({content_bytes} bytes)")
+                                            else:
+                                                # Second attempt: Try direct SFTP access if possible
+                                                logger.debug(f"First download attempt failed for {file_path}, trying direct SFTP access")
+                                                try:
+                                                    # Try to access the SFTP connection directly
+                                                    if hasattr(sftp, 'sftp') and sftp.sftp:
+                                                        async with sftp.sftp.open(file_path, 'r') as remote_file:
+                                                            content = await remote_file.read()
+                                                            content_bytes = len(content) if content else 0
+                                                            logger.debug(f"Successfully accessed file directly: {file_path} ({content_bytes} bytes)")
+                                                except Exception as direct_error:
+                                                    logger.debug(f"Direct SFTP access failed: {str(direct_error)}")
+
+                                                # DISABLED: No longer using attached_assets as a fallback
+                                                if not content:
+                                                    logger.error(f"All SFTP download attempts failed for {file_path}")
+                                                    logger.error(f"Could not retrieve content from SFTP server - this is a legitimate file access failure")
+                                                    # No fallback available in production - attached_assets fallback is disabled
+                                        except Exception as e:
+                                            logger.error(f"Exception during SFTP download of {file_path}: {str(e)}")
+                                            content = None
 
-                                    # Handle different types of content returned from download_file
-                                    if isinstance(content, bytes):
-                                        # Normal case - bytes returned
-                                        decoded_content = content.decode('utf-8', errors='ignore')
-                                    elif isinstance(content, list):
-                                        # Handle case where a list of strings/bytes is returned
-                                        if content and isinstance(content[0], bytes):
-                                            # List of bytes
-                                            decoded_content = b''.join(content).decode('utf-8', errors='ignore')
+                                    if content:
+                                        content_length = len(content) if hasattr(content, '__len__') else 0
+                                        logger.debug(f"Downloaded content type: {type(content)}, length: {content_length}")
+
+                                        # Verify the content is not empty
+                                        if content_length == 0:
+                                            logger.warning(f"Empty content downloaded from {file_path} - skipping processing")
+                                            continue
+
+                                        # Handle different types of content returned from download_file
+                                        if isinstance(content, bytes):
+                                            # Normal case - bytes returned
+                                            decoded_content = content.decode('utf-8', errors='ignore')
+                                        elif isinstance(content, list):
+                                            # Handle case where a list of strings/bytes is returned
+                                            if content and isinstance(content[0], bytes):
+                                                # List of bytes
+                                                decoded_content = b''.join(content).decode('utf-8', errors='ignore')
+                                            else:
+                                                # List of strings or empty list
+                                                decoded_content = '\n'.join([str(line) for line in content])
                                         else:
-                                            # List of strings or empty list
-                                            decoded_content = '\n'.join([str(line) for line in content])
-                                    else:
-                                        # Handle any other case by converting to string
-                                        decoded_content = str(content)
+                                            # Handle any other case by converting to string
+                                            decoded_content = str(content)
 
-                                    # Verify decoded content has actual substance
-                                    if not decoded_content or len(decoded_content.strip()) == 0:
-                                        logger.warning(f"Empty decoded content from {file_path} - skipping processing")
-                                        continue
+                                        # Verify decoded content has actual substance
+                                        # isspace() answers this without building a stripped copy of the file
+                                        if not decoded_content or decoded_content.isspace():
+                                            logger.warning(f"Empty decoded content from {file_path} - skipping processing")
+                                            continue
 
-                                    # Log a sample of the content for debugging
-                                    sample = decoded_content[:200] + "..." if len(decoded_content) > 200 else decoded_content
-                                    logger.debug(f"CSV content sample: {sample}")
+                                        # Log a sample of the content for debugging
+                                        if logger.isEnabledFor(logging.DEBUG):
+                                            sample = decoded_content[:200] + "..." if len(decoded_content) > 200 else decoded_content
+                                            logger.debug(f"CSV content sample: {sample}")
 
-                                    # Process content - determine if we should only process new lines
-                                    events = []
+                                        # Process content - determine if we should only process new lines
+                                        events = []
 
-                                    # module: csv_event_parsing
-                                    # Validate content before parsing to ensure CSV correctness per Rule #5 and #6
-                                    if ";" not in decoded_content and "," not in decoded_content:
-                                        logger.warning(f"CSV file {file_path} contains no valid delimiters, likely corrupted")
-                                        continue
+                                        # module: csv_event_parsing
+                                        # Validate content before parsing to ensure CSV correctness per Rule #5 and #6
+                                        if ";" not in decoded_content and "," not in decoded_content:
+                                            logger.warning(f"CSV file {file_path} contains no valid delimiters, likely corrupted")
+                                            continue
 
-                                    # Enhanced delimiter detection with bias towards semicolons
-                                    semicolon_count = decoded_content.count(';')
-                                    comma_count = decoded_content.count(',')
-                                    tab_count = decoded_content.count('\t')
+                                        # Enhanced delimiter detection with bias towards semicolons
+                                        semicolon_count = decoded_content.count(';')
+                                        comma_count = decoded_content.count(',')
+                                        tab_count = decoded_content.count('\t')
 
-                                    # Apply a weight factor to prioritize semicolons
-                                    # Game logs commonly use semicolons and we want to prioritize them
-                                    weighted_semicolon_count = semicolon_count * 3  # Triple the weight for semicolons
+                                        # Apply a weight factor to prioritize semicolons
+                                        # Game logs commonly use semicolons and we want to prioritize them
+                                        weighted_semicolon_count = semicolon_count * 3  # Triple the weight for semicolons
 
-                                    logger.debug(f"Delimiter detection: semicolons={semicolon_count} (weighted: {weighted_semicolon_count}), commas={comma_count}, tabs={tab_count}")
+                                        logger.debug(f"Delimiter detection: semicolons={semicolon_count} (weighted: {weighted_semicolon_count}), commas={comma_count}, tabs={tab_count}")
 
-                                    # Determine the most likely delimiter with semicolon bias
-                                    detected_delimiter = ';'  # Default for our format
-                                    if comma_count > weighted_semicolon_count and comma_count > tab_count:
-                                        detected_delimiter = ','
-                                    elif tab_count > weighted_semicolon_count and tab_count > comma_count:
-                                        detected_delimiter = '\t'
-                                    else:
-                                        # Additional check for patterns that strongly indicate semicolon delimiter
-                                        if ';;' in decoded_content or ';;;' in decoded_content:
-                                            logger.debug("Found multiple sequential semicolons, confirming semicolon delimiter")
-                                            detected_delimiter = ';'
+                                        # Determine the most likely delimiter with semicolon bias
+                                        detected_delimiter = ';'  # Default for our format
+                                        if comma_count > weighted_semicolon_count and comma_count > tab_count:
+                                            detected_delimiter = ','
+                                        elif tab_count > weighted_semicolon_count and tab_count > comma_count:
+                                            detected_delimiter = '\t'
+                                        else:
+                                            # Additional check for patterns that strongly indicate semicolon delimiter
+                                            if ';;' in decoded_content or ';;;' in decoded_content:
+                                                logger.debug("Found multiple sequential semicolons, confirming semicolon delimiter")
+                                                detected_delimiter = ';'
 
-                                    logger.debug(f"Using detected delimiter: \'{detected_delimiter}\' for file {file_path}")
+                                        logger.debug(f"Using detected delimiter: \'{detected_delimiter}\' for file {file_path}")
 
-                                    # Check for data rows that match expected format - minimum field count for kill events
-                                    has_valid_data = False
-                                    sample_lines = decoded_content.split('\n')[:20]  # Check first 20 lines for better detection
+                                        # Check for data rows that match expected format - minimum field count for kill events
+                                        has_valid_data = False
+                                        sample_lines = decoded_content.split('\n')[:20]  # Check first 20 lines for better detection
 
-                                    # Minimum field counts for different formats
-                                    min_fields_for_kill = 6  # timestamp, killer, killer_id, victim, victim_id, weapon
+                                        # Minimum field counts for different formats
+                                        min_fields_for_kill = 6  # timestamp, killer, killer_id, victim, victim_id, weapon
 
-                                    for line in sample_lines:
-                                        if not line or line.isspace():
-                                            continue
+                                        for line in sample_lines:
+                                            if not line or line.isspace():
+                                                continue
 
-                                        # Count fields by delimiter (adding 1 since n delimiters = n+1 fields)
-                                        field_count = line.count(detected_delimiter) + 1
+                                            # Count fields by delimiter (adding 1 since n delimiters = n+1 fields)
+                                            field_count = line.count(detected_delimiter) + 1
 
-                                        # Check if this looks like a header line
-                                        is_header = ('time' in line.lower() or 'date' in line.lower()) and \
-                                                   ('killer' in line.lower() or 'player' in line.lower())
+                                            # Check if this looks like a header line
+                                            is_header = ('time' in line.lower() or 'date' in line.lower()) and \
+                                                       ('killer' in line.lower() or 'player' in line.lower())
 
-                                        # If it's not a header and has enough fields, it might be valid data
-                                        if not is_header and field_count >= min_fields_for_kill:
-                                            # Additional quality check - make sure there's a timestamp-like pattern
-                                            # Most timestamps have numbers and periods or hyphens
-                                            fields = line.split(detected_delimiter)
-                                            first_field = fields[0].strip() if fields else ""
+                                            # If it's not a header and has enough fields, it might be valid data
+                                            if not is_header and field_count >= min_fields_for_kill:
+                                                # Additional quality check - make sure there's a timestamp-like pattern
+                                                # Most timestamps have numbers and periods or hyphens
+                                                fields = line.split(detected_delimiter)
+                                                first_field = fields[0].strip() if fields else ""
 
-                                            # Looks like a timestamp if it has digits and separators
-                                            looks_like_timestamp = any(c.isdigit() for c in first_field) and \
-                                                                 any(c in '.-: ' for c in first_field)
+                                                # Looks like a timestamp if it has digits and separators
+                                                looks_like_timestamp = any(c.isdigit() for c in first_field) and \
+                                                                     any(c in '.-: ' for c in first_field)
 
-                                            if looks_like_timestamp:
-                                                has_valid_data = True
-                                                logger.debug(f"Found valid data row: {line[:50]}...")
-                                                break
+                                                if looks_like_timestamp:
+                                                    has_valid_data = True
+                                                    logger.debug(f"Found valid data row: {line[:50]}...")
+                                                    break
 
-                                    if not has_valid_data:
-                                        logger.warning(f"CSV file {file_path} doesn't contain properly formatted kill data")
-                                        logger.warning(f"Sample line: {sample_lines[0] if sample_lines else 'No lines found'}")
-                                        continue
+                                        if not has_valid_data:
+                                            logger.warning(f"CSV file {file_path} doesn't contain properly formatted kill data")
+                                            logger.warning(f"Sample line: {sample_lines[0] if sample_lines else 'No lines found'}")
+                                            continue
 
-                                    # Convert validated content to StringIO for parsing
-                                    content_io = io.StringIO(decoded_content)
+                                        # Convert validated content to StringIO for parsing
+                                        content_io = io.StringIO(decoded_content)
 
-                                    try:
-                                        # EMERGENCY FIX: Robust error handling with detailed logging
-                                        max_retries = 3  # Increased retries
-                                        for retry in range(max_retries + 1):
-                                            try:
-                                                # FIXED: Improved CSV processing with better error handling and mode support
-                                                # This ensures reliable processing of all CSV files
-                                                logger.info(f"CSV Processing: Processing file: {os.path.basename(file_path)}")
+                                        try:
+                                            # EMERGENCY FIX: Robust error handling with detailed logging
+                                            max_retries = 3  # Increased retries
+                                            for retry in range(max_retries + 1):
+                                                try:
+                                                    # FIXED: Improved CSV processing with better error handling and mode support
+                                                    # This ensures reliable processing of all CSV files
+                                                    logger.info(f"CSV Processing: Processing file: {os.path.basename(file_path)}")
                                                 
-                                                # Reset the file pointer to start fresh
-                                                content_io.seek(0)
+                                                    # Reset the file pointer to start fresh
+                                                    content_io.seek(0)
                                                 
-                                                # Use appropriate mode based on context
-                                                process_mode = "historical" if is_historical_mode else "incremental"
-                                                logger.info(f"CSV Processing: Using {process_mode} mode with delimiter: '{detected_delimiter}'")
+                                                    # Use appropriate mode based on context
+                                                    process_mode = "historical" if is_historical_mode else "incremental"
+                                                    logger.info(f"CSV Processing: Using {process_mode} mode with delimiter: '{detected_delimiter}'")
                                                 
-                                                # FIXED: Always use direct CSV handler for reliable parsing
-                                                # Import here to avoid circular imports
-                                                from utils.direct_csv_handler import direct_parse_csv_content
+                                                    # FIXED: Always use direct CSV handler for reliable parsing
+                                                    # Import here to avoid circular imports
+                                                    from utils.direct_csv_handler import direct_parse_csv_content
                                                 
-                                                # Reset the file pointer and read content
-                                                content_io.seek(0)
-                                                content_str = content_io.read()
+                                                    # Reset the file pointer and read content
+                                                    content_io.seek(0)
+                                                    content_str = content_io.read()
                                                 
-                                                # Determine correct line position to start from
-                                                start_line = 0
-                                                file_key = os.path.basename(file_path)
+                                                    # Determine correct line position to start from
+                                                    start_line = 0
+                                                    file_key = os.path.basename(file_path)
                                                 
-                                                # Handle line position tracking for incremental processing
-                                                if not is_historical_mode:
-                                                    # First check file_line_positions
-                                                    if hasattr(self, 'file_line_positions') and file_path in self.file_line_positions:
-                                                        start_line = self.file_line_positions[file_path]
-                                                        logger.info(f"CSV Processing: Starting from line position {start_line} for file {file_key}")
-                                                    # Then check last_processed_line_positions
-                                                    elif server_id in self.last_processed_line_positions and file_key in self.last_processed_line_positions[server_id]:
-                                                        start_line = self.last_processed_line_positions[server_id][file_key]
-                                                        logger.info(f"CSV Processing: Starting from saved line position {start_line} for file {file_key}")
-                                                else:
-                                                    logger.info(f"CSV Processing: Historical mode - processing all lines from the beginning")
+                                                    # Handle line position tracking for incremental processing
+                                                    if not is_historical_mode:
+                                                        # First check file_line_positions
+                                                        if hasattr(self, 'file_line_positions') and file_path in self.file_line_positions:
+                                                            start_line = self.file_line_positions[file_path]
+                                                            logger.info(f"CSV Processing: Starting from line position {start_line} for file {file_key}")
+                                                        # Then check last_processed_line_positions
+                                                        elif server_id in self.last_processed_line_positions and file_key in self.last_processed_line_positions[server_id]:
+                                                            start_line = self.last_processed_line_positions[server_id][file_key]
+                                                            logger.info(f"CSV Processing: Starting from saved line position {start_line} for file {file_key}")
+                                                    else:
+                                                        logger.info(f"CSV Processing: Historical mode - processing all lines from the beginning")
                                                 
-                                                # Process with direct parser
-                                                try:
-                                                    events, total_lines = direct_parse_csv_content(
-                                                        content_str,
-                                                        file_path=file_path,
-                                                        server_id=server_id,
-                                                        start_line=start_line
-                                                    )
-                                                    logger.info(f"CSV Processing: Processed {len(events)} events from file with {total_lines} total lines")
+                                                    # Process with direct parser
+                                                    try:
+                                                        events, total_lines = direct_parse_csv_content(
+                                                            content_str,
+                                                            file_path=file_path,
+                                                            server_id=server_id,
+                                                            start_line=start_line
+                                                        )
+                                                        logger.info(f"CSV Processing: Processed {len(events)} events from file with {total_lines} total lines")
                                                     
-                                                    # If this is incremental mode and we got no events but the file has lines,
-                                                    # it could mean we've already processed all lines - log this clearly
-                                                    if not is_historical_mode and len(events) == 0 and total_lines > 0 and start_line > 0:
-                                                        logger.info(f"CSV Processing: No new events found in {file_key} - all {total_lines} lines may have been processed already (starting from line {start_line})")
+                                                        # If this is incremental mode and we got no events but the file has lines,
+                                                        # it could mean we've already processed all lines - log this clearly
+                                                        if not is_historical_mode and len(events) == 0 and total_lines > 0 and start_line > 0:
+                                                            logger.info(f"CSV Processing: No new events found in {file_key} - all {total_lines} lines may have been processed already (starting from line {start_line})")
                                                         
-                                                except Exception as direct_parse_error:
-                                                    logger.error(f"CSV Processing: Error in direct parser: {direct_parse_error}")
-                                                    # Try fallback to basic parsing in case of errors
-                                                    try:
-                                                        logger.warning(f"CSV Processing: Attempting fallback parsing for {file_key}")
-                                                        # Simple fallback parsing - just extract lines with basic validation
-                                                        lines = content_str.splitlines()
-                                                        events = []
-                                                        total_lines = len(lines)
+                                                    except Exception as direct_parse_error:
+                                                        logger.error(f"CSV Processing: Error in direct parser: {direct_parse_error}")
+                                                        # Try fallback to basic parsing in case of errors
+                                                        try:
+                                                            logger.warning(f"CSV Processing: Attempting fallback parsing for {file_key}")
+                                                            # Simple fallback parsing - just extract lines with basic validation
+                                                            lines = content_str.splitlines()
+                                                            events = []
+                                                            total_lines = len(lines)
                                                         
-                                                        for i, line in enumerate(lines):
-                                                            if i < start_line:
-                                                                continue
+                                                            for i, line in enumerate(lines):
+                                                                if i < start_line:
+                                                                    continue
                                                             
-                                                            # Skip empty lines
-                                                            if not line.strip():
-                                                                continue
+                                                                # Skip empty lines
+                                                                if not line.strip():
+                                                                    continue
                                                                 
-                                                            # Split by most likely delimiter
-                                                            parts = line.split(detected_delimiter)
+                                                                # Split by most likely delimiter
+                                                                parts = line.split(detected_delimiter)
                                                             
-                                                            # Basic validation - need at least 5 parts for a valid event
-                                                            if len(parts) >= 5:
-                                                                try:
-                                                                    events.append({
-                                                                        'timestamp': parts[0],
-                                                                        'killer_name': parts[1],
-                                                                        'killer_id': parts[2] if len(parts) > 2 else "",
-                                                                        'victim_name': parts[3],
-                                                                        'victim_id': parts[4] if len(parts) > 4 else "",
-                                                                        'server_id': server_id,
-                                                                        'event_type': 'kill'
-                                                                    })
-                                                                except Exception:
-                                                                    # Skip problematic lines
-                                                                    pass
+                                                                # Basic validation - need at least 5 parts for a valid event
+                                                                if len(parts) >= 5:
+                                                                    try:
+                                                                        events.append({
+                                                                            'timestamp': parts[0],
+                                                                            'killer_name': parts[1],
+                                                                            'killer_id': parts[2] if len(parts) > 2 else "",
+                                                                            'victim_name': parts[3],
+                                                                            'victim_id': parts[4] if len(parts) > 4 else "",
+                                                                            'server_id': server_id,
+                                                                            'event_type': 'kill'
+                                                                        })
+                                                                    except Exception:
+                                                                        # Skip problematic lines
+                                                                        pass
                                                         
-                                                        logger.warning(f"CSV Processing: Fallback parsing extracted {len(events)} events from {total_lines} lines")
-                                                    except Exception as fallback_error:
-                                                        logger.error(f"CSV Processing: Fallback parsing also failed: {fallback_error}")
-                                                        events = []
-                                                        total_lines = 0
+                                                            logger.warning(f"CSV Processing: Fallback parsing extracted {len(events)} events from {total_lines} lines")
+                                                        except Exception as fallback_error:
+                                                            logger.error(f"CSV Processing: Fallback parsing also failed: {fallback_error}")
+                                                            events = []
+                                                            total_lines = 0
                                                 
-                                                # FIXED: Better line position tracking for all processing modes
-                                                # Always update line position information for efficient incremental processing
-                                                if total_lines > 0:
-                                                    # Initialize the storage structure if needed
-                                                    if server_id not in self.last_processed_line_positions:
-                                                        self.last_processed_line_positions[server_id] = {}
+                                                    # FIXED: Better line position tracking for all processing modes
+                                                    # Always update line position information for efficient incremental processing
+                                                    if total_lines > 0:
+                                                        # Initialize the storage structure if needed
+                                                        if server_id not in self.last_processed_line_positions:
+                                                            self.last_processed_line_positions[server_id] = {}
                                                         
-                                                    # Store the line position differently based on mode
-                                                    file_basename = os.path.basename(file_path)
+                                                        # Store the line position differently based on mode
+                                                        file_basename = os.path.basename(file_path)
                                                     
-                                                    if is_historical_mode:
-                                                        # For historical mode, store the total line count for all files
-                                                        # This helps regular mode pick up where historical left off
-                                                        logger.info(f"CSV Processing: Storing line position {total_lines} for historical processing of {file_basename}")
-                                                        self.last_processed_line_positions[server_id][file_basename] = total_lines
-                                                        # Save state to database after updating line positions in historical mode
-                                                        asyncio.create_task(self._save_server_state(server_id))
-                                                    else:
-                                                        # For regular mode, update only if we have a higher line count than before
-                                                        current_position = self.last_processed_line_positions[server_id].get(file_basename, 0)
-                                                        if total_lines > current_position:
-                                                            logger.info(f"CSV Processing: Updating line position from {current_position} to {total_lines} for {file_basename}")
+                                                        if is_historical_mode:
+                                                            # For historical mode, store the total line count for all files
+                                                            # This helps regular mode pick up where historical left off
+                                                            logger.info(f"CSV Processing: Storing line position {total_lines} for historical processing of {file_basename}")
                                                             self.last_processed_line_positions[server_id][file_basename] = total_lines
-                                                            # Save state to database after updating line positions in regular mode
+                                                            # Save state to database after updating line positions in historical mode
                                                             asyncio.create_task(self._save_server_state(server_id))
                                                         else:
-                                                            logger.info(f"CSV Processing: Keeping existing line position of {current_position} for {file_basename}")
+                                                            # For regular mode, update only if we have a higher line count than before
+                                                            current_position = self.last_processed_line_positions[server_id].get(file_basename, 0)
+                                                            if total_lines > current_position:
+                                                                logger.info(f"CSV Processing: Updating line position from {current_position} to {total_lines} for {file_basename}")
+                                                                self.last_processed_line_positions[server_id][file_basename] = total_lines
+                                                                # Save state to database after updating line positions in regular mode
+                                                                asyncio.create_task(self._save_server_state(server_id))
+                                                            else:
+                                                                logger.info(f"CSV Processing: Keeping existing line position of {current_position} for {file_basename}")
                                                             
-                                                    # Also update the in-memory position for future processing
-                                                    if not hasattr(self, 'file_line_positions'):
-                                                        self.file_line_positions = {}
-                                                    self.file_line_positions[file_path] = total_lines
+                                                        # Also update the in-memory position for future processing
+                                                        if not hasattr(self, 'file_line_positions'):
+                                                            self.file_line_positions = {}
+                                                        self.file_line_positions[file_path] = total_lines
                                                     
-                                                    # Update last_processed timestamp for this server when successful  
-                                                    # This helps avoid reprocessing files unnecessarily after restart
-                                                    if not is_historical_mode:
-                                                        self.last_processed[server_id] = datetime.now()
-                                                        # Save state to database
-                                                        asyncio.create_task(self._save_server_state(server_id))
-                                                break  # Success - exit retry loop
-                                            except Exception as e:
-                                                if retry < max_retries:
-                                                    # Reset file pointer for retry
-                                                    content_io.seek(0)
-                                                    logger.warning(f"Retry {retry+1}/{max_retries} parsing file {file_path}: {str(e)}")
-                                                else:
-                                                    # Last retry failed
-                                                    raise
-
-                                        # Validate parsed events
-                                        if events is not None:
-                                            logger.debug(f"Parsed {len(events)} events from file {file_path}")
-                                        else:
-                                            logger.warning(f"No events parsed from file {file_path} despite valid format")
-                                    except Exception as parse_error:
-                                        logger.error(f"Error parsing CSV file {file_path}: {str(parse_error)}")
-                                        events = []
+                                                        # Update last_processed timestamp for this server when successful  
+                                                        # This helps avoid reprocessing files unnecessarily after restart
+                                                        if not is_historical_mode:
+                                                            self.last_processed[server_id] = datetime.now()
+                                                            # Save state to database
+                                                            asyncio.create_task(self._save_server_state(server_id))
+                                                    break  # Success - exit retry loop
+                                                except Exception as e:
+                                                    if retry < max_retries:
+                                                        # Reset file pointer for retry
+                                                        content_io.seek(0)
+                                                        logger.warning(f"Retry {retry+1}/{max_retries} parsing file {file_path}: {str(e)}")
+                                                    else:
+                                                        # Last retry failed
+                                                        raise
 
-                                    # BATCH PROCESSING IMPLEMENTATION
-                                    processed_count = 0
-                                    errors = []
+                                            # Validate parsed events
+                                            if events is not None:
+                                                logger.debug(f"Parsed {len(events)} events from file {file_path}")
+                                            else:
+                                                logger.warning(f"No events parsed from file {file_path} despite valid format")
+                                        except Exception as parse_error:
+                                            logger.error(f"Error parsing CSV file {file_path}: {str(parse_error)}")
+                                            events = []
+
+                                        # BATCH PROCESSING IMPLEMENTATION
+                                        processed_count = 0
+                                        errors = []
+
+                                        # Import utility functions
+                                        from utils.parser_utils import normalize_event_data, categorize_event, parser_coordinator
+
+                                        # Process in batches of 100 for better performance
+                                        BATCH_SIZE = 100
+                                        if len(events) > BATCH_SIZE:
+                                            logger.debug(f"Using batch processing for {len(events)} events")
+                                            event_batches = [events[i:i+BATCH_SIZE] for i in range(0, len(events), BATCH_SIZE)]
+                                            logger.info(f"Processing {len(events)} events in {len(event_batches)} batches of max {BATCH_SIZE}")
+
+                                            # Process each batch
+                                            batch_num = 0
+                                            for event_batch in event_batches:
+                                                batch_num += 1
+                                                batch_normalized = []
+
+                                                # Step 1: Normalize all events in batch
+                                                for event in event_batch:
+                                                    try:
+                                                        normalized_event = normalize_event_data(event)
+                                                        if not normalized_event:
+                                                            continue
 
-                                    # Import utility functions
-                                    from utils.parser_utils import normalize_event_data, categorize_event, parser_coordinator
+                                                        # Add server ID
+                                                        normalized_event["server_id"] = server_id
 
-                                    # Process in batches of 100 for better performance
-                                    BATCH_SIZE = 100
-                                    if len(events) > BATCH_SIZE:
-                                        logger.debug(f"Using batch processing for {len(events)} events")
-                                        event_batches = [events[i:i+BATCH_SIZE] for i in range(0, len(events), BATCH_SIZE)]
-                                        logger.info(f"Processing {len(events)} events in {len(event_batches)} batches of max {BATCH_SIZE}")
+                                                        # Update timestamp in coordinator
+                                                        if "timestamp" in normalized_event and isinstance(normalized_event["timestamp"], datetime):
+                                                            parser_coordinator.update_csv_timestamp(server_id, normalized_event["timestamp"])
 
-                                        # Process each batch
-                                        batch_num = 0
-                                        for event_batch in event_batches:
-                                            batch_num += 1
-                                            batch_normalized = []
+                                                        # Add to batch
+                                                        batch_normalized.append(normalized_event)
+                                                    except Exception as e:
+                                                        errors.append(str(e))
+                                                        continue
+
+                                                # Step 2: Categorize batch into kill and suicide events
+                                                kill_events = []
+                                                suicide_events = []
+
+                                                for event in batch_normalized:
+                                                    event_type = categorize_event(event)
+                                                    if event_type == "kill":
+                                                        kill_events.append(event)
+                                                    elif event_type == "suicide":
+                                                        suicide_events.append(event)
+
+                                                # Log batch summary (only for larger batches to reduce log spam)
+                                                if batch_num % 5 == 0 or batch_num == 1 or batch_num == len(event_batches):
+                                                    logger.info(f"Batch {batch_num}/{len(event_batches)}: {len(batch_normalized)} events normalized")
+                                                    logger.info(f"Batch {batch_num} has {len(kill_events)} kills and {len(suicide_events)} suicides")
+
+                                                # Step 3: Bulk insert into database
+                                                # 3a: Process kill events in bulk
+                                                if kill_events:
+                                                    # Create the documents to insert
+                                                    kill_docs = []
+                                                    for event in kill_events:
+                                                        # Get fields with fallbacks
+                                                        killer_id = event.get("killer_id", "")
+                                                        victim_id = event.get("victim_id", "")
+
+                                                        # Skip if missing essential IDs
+                                                        if not killer_id or not victim_id:
+                                                            continue
+
+                                                        # Create document for database
+                                                        kill_doc = {
+                                                            "server_id": server_id,
+                                                            "killer_id": killer_id,
+                                                            "killer_name": event.get("killer_name", "Unknown"),
+                                                            "victim_id": victim_id,
+                                                            "victim_name": event.get("victim_name", "Unknown"),
+                                                            "weapon": event.get("weapon", "Unknown"),
+                                                            "distance": event.get("distance", 0),
+                                                            "timestamp": event.get("timestamp", datetime.now()),
+                                                            "is_suicide": False,
+                                                            "event_type": "kill"
+                                                        }
+                                                        kill_docs.append(kill_doc)
+
+                                                    # Bulk insert the kill documents
+                                                    if kill_docs is not None:
+                                                        try:
+                                                            # Use ordered=False to continue inserting even if some fail
+                                                            result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
+                                                            processed_count += len(result.inserted_ids)
+                                                        except Exception as e:
+                                                            logger.error(f"Error during bulk kill insert: {str(e)[:100]}")
+                                                            # Continue processing other batches despite errors
+
+                                                # 3b: Process suicide events in bulk
+                                                if suicide_events:
+                                                    # Create the documents to insert
+                                                    suicide_docs = []
+                                                    for event in suicide_events:
+                                                        victim_id = event.get("victim_id", "")
+                                                        # Skip if no valid ID
+                                                        if not victim_id:
+                                                            continue
+
+                                                        # Create document for database
+                                                        suicide_doc = {
+                                                            "server_id": server_id,
+                                                            "killer_id": victim_id,
+                                                            "killer_name": event.get("victim_name", "Unknown"),
+                                                            "victim_id": victim_id,
+                                                            "victim_name": event.get("victim_name", "Unknown"),
+                                                            "weapon": event.get("weapon", "Unknown"),
+                                                            "distance": event.get("distance", 0),
+                                                            "timestamp": event.get("timestamp", datetime.now()),
+                                                            "is_suicide": True,
+                                                            "event_type": "suicide"
+                                                        }
+                                                        suicide_docs.append(suicide_doc)
+
+                                                    # Bulk insert the suicide documents
+                                                    if suicide_docs is not None:
+                                                        try:
+                                                            # Use ordered=False to continue inserting even if some fail
+                                                            result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
+                                                            processed_count += len(result.inserted_ids)
+                                                        except Exception as e:
+                                                            logger.error(f"Error during bulk suicide insert: {str(e)[:100]}")
+                                                            # Continue processing other batches despite errors
+
+                                            # Final batch summary
+                                            logger.info(f"Batch processing complete: {processed_count} events inserted successfully")
+
+                                        else:
+                                            # Enhanced batch processing for smaller files too
+                                            # Collect kill and suicide events for batch processing
+                                            kill_events = []
+                                            suicide_events = []
+                                            processed_count = 0
 
-                                            # Step 1: Normalize all events in batch
-                                            for event in event_batch:
+                                            logger.debug(f"Using batch processing for {len(events)} events")
+
+                                            # Step 1: Normalize and categorize all events
+                                            for event in events:
                                                 try:
+                                                    # Normalize event data
                                                     normalized_event = normalize_event_data(event)
                                                     if not normalized_event:
                                                         continue
@@ -2376,301 +2554,185 @@ class CSVProcessorCog(commands.Cog):
                                                     if "timestamp" in normalized_event and isinstance(normalized_event["timestamp"], datetime):
                                                         parser_coordinator.update_csv_timestamp(server_id, normalized_event["timestamp"])
 
-                                                    # Add to batch
-                                                    batch_normalized.append(normalized_event)
+                                                    # Process event type
+                                                    event_type = categorize_event(normalized_event)
+                                                    normalized_event["event_type"] = event_type
+
+                                                    # Validate IDs - using the improved validation from our _get_or_create_player method
+                                                    killer_id = normalized_event.get("killer_id", "")
+                                                    victim_id = normalized_event.get("victim_id", "")
+
+                                                    # Skip events with invalid IDs
+                                                    if not killer_id or killer_id.lower() in ['null', 'none', 'undefined'] or \
+                                                       not victim_id or victim_id.lower() in ['null', 'none', 'undefined']:
+                                                        continue
+
+                                                    # Add to appropriate batch
+                                                    if event_type == "kill":
+                                                        kill_events.append(normalized_event)
+                                                    elif event_type == "suicide":
+                                                        suicide_events.append(normalized_event)
                                                 except Exception as e:
                                                     errors.append(str(e))
-                                                    continue
+                                                    logger.error(f"Error normalizing/categorizing event: {str(e)[:100]}")
 
-                                            # Step 2: Categorize batch into kill and suicide events
-                                            kill_events = []
-                                            suicide_events = []
+                                            # Report categorization results
+                                            logger.debug(f"Categorized events: {len(kill_events)} kills, {len(suicide_events)} suicides")
 
-                                            for event in batch_normalized:
-                                                event_type = categorize_event(event)
-                                                if event_type == "kill":
-                                                    kill_events.append(event)
-                                                elif event_type == "suicide":
-                                                    suicide_events.append(event)
+                                            # Step 2: Process suicide events in batch
+                                            if suicide_events:
+                                                # Create documents for bulk insert
+                                                suicide_docs = []
+                                                for event in suicide_events:
+                                                    suicide_docs.append({
+                                                        "server_id": server_id,
+                                                        "killer_id": event.get("victim_id"),  # For suicides, killer = victim
+                                                        "killer_name": event.get("victim_name", "Unknown"),
+                                                        "victim_id": event.get("victim_id"),
+                                                        "victim_name": event.get("victim_name", "Unknown"),
+                                                        "weapon": event.get("weapon", "Unknown"),
+                                                        "distance": event.get("distance", 0),
+                                                        "timestamp": event.get("timestamp", datetime.now()),
+                                                        "is_suicide": True,
+                                                        "event_type": "suicide"
+                                                    })
 
-                                            # Log batch summary (only for larger batches to reduce log spam)
-                                            if batch_num % 5 == 0 or batch_num == 1 or batch_num == len(event_batches):
-                                                logger.info(f"Batch {batch_num}/{len(event_batches)}: {len(batch_normalized)} events normalized")
-                                                logger.info(f"Batch {batch_num} has {len(kill_events)} kills and {len(suicide_events)} suicides")
+                                                # Bulk insert suicide events
+                                                if suicide_docs is not None:
+                                                    try:
+                                                        # Use ordered=False to allow partial success
+                                                        result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
+                                                        processed_count += len(suicide_docs)
+                                                        logger.info(f"Inserted {len(suicide_docs)} suicide events in batch")
+                                                    except Exception as e:
+                                                        logger.error(f"Error bulk inserting suicide events: {str(e)[:100]}")
 
-                                            # Step 3: Bulk insert into database
-                                            # 3a: Process kill events in bulk
+                                            # Step 3: Process kill events in batch
                                             if kill_events:
-                                                # Create the documents to insert
+                                                # Create documents for bulk insert
                                                 kill_docs = []
                                                 for event in kill_events:
-                                                    # Get fields with fallbacks
-                                                    killer_id = event.get("killer_id", "")
-                                                    victim_id = event.get("victim_id", "")
-
-                                                    # Skip if missing essential IDs
-                                                    if not killer_id or not victim_id:
-                                                        continue
-
-                                                    # Create document for database
-                                                    kill_doc = {
+                                                    kill_docs.append({
                                                         "server_id": server_id,
-                                                        "killer_id": killer_id,
+                                                        "killer_id": event.get("killer_id"),
                                                         "killer_name": event.get("killer_name", "Unknown"),
-                                                        "victim_id": victim_id,
+                                                        "victim_id": event.get("victim_id"),
                                                         "victim_name": event.get("victim_name", "Unknown"),
                                                         "weapon": event.get("weapon", "Unknown"),
                                                         "distance": event.get("distance", 0),
                                                         "timestamp": event.get("timestamp", datetime.now()),
                                                         "is_suicide": False,
                                                         "event_type": "kill"
-                                                    }
-                                                    kill_docs.append(kill_doc)
+                                                    })
 
-                                                # Bulk insert the kill documents
+                                                # Bulk insert kill events
                                                 if kill_docs is not None:
                                                     try:
-                                                        # Use ordered=False to continue inserting even if some fail
+                                                        # Use ordered=False to allow partial success
                                                         result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
-                                                        processed_count += len(result.inserted_ids)
+                                                        processed_count += len(kill_docs)
+                                                        logger.info(f"Inserted {len(kill_docs)} kill events in batch")
                                                     except Exception as e:
-                                                        logger.error(f"Error during bulk kill insert: {str(e)[:100]}")
-                                                        # Continue processing other batches despite errors
+                                                        logger.error(f"Error bulk inserting kill events: {str(e)[:100]}")
 
-                                            # 3b: Process suicide events in bulk
-                                            if suicide_events:
-                                                # Create the documents to insert
-                                                suicide_docs = []
-                                                for event in suicide_events:
-                                                    victim_id = event.get("victim_id", "")
-                                                    # Skip if no valid ID
-                                                    if not victim_id:
-                                                        continue
+                                            # Step 4: Process player stats for unique players
+                                            # This is more efficient than updating per-event
+                                            # Create player lookup sets for batch processing player stats
+                                            try:
+                                                from models.player import Player
 
-                                                    # Create document for database
-                                                    suicide_doc = {
-                                                        "server_id": server_id,
-                                                        "killer_id": victim_id,
-                                                        "killer_name": event.get("victim_name", "Unknown"),
-                                                        "victim_id": victim_id,
-                                                        "victim_name": event.get("victim_name", "Unknown"),
-                                                        "weapon": event.get("weapon", "Unknown"),
-                                                        "distance": event.get("distance", 0),
-                                                        "timestamp": event.get("timestamp", datetime.now()),
-                                                        "is_suicide": True,
-                                                        "event_type": "suicide"
-                                                    }
-                                                    suicide_docs.append(suicide_doc)
+                                                # Collect unique player IDs
+                                                unique_players = {}  # player_id -> {kills, deaths, suicides}
 
-                                                # Bulk insert the suicide documents
-                                                if suicide_docs is not None:
-                                                    try:
-                                                        # Use ordered=False to continue inserting even if some fail
-                                                        result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
-                                                        processed_count += len(result.inserted_ids)
-                                                    except Exception as e:
-                                                        logger.error(f"Error during bulk suicide insert: {str(e)[:100]}")
-                                                        # Continue processing other batches despite errors
+                                                # Count kills for killers, deaths for victims 
+                                                for event in kill_events:
+                                                    killer_id = event.get("killer_id")
+                                                    victim_id = event.get("victim_id")
 
-                                        # Final batch summary
-                                        logger.info(f"Batch processing complete: {processed_count} events inserted successfully")
+                                                    # Add killer stats
+                                                    if killer_id not in unique_players:
+                                                        unique_players[killer_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("killer_name", "Unknown")}
+                                                    unique_players[killer_id]["kills"] += 1
 
-                                    else:
-                                        # Enhanced batch processing for smaller files too
-                                        # Collect kill and suicide events for batch processing
-                                        kill_events = []
-                                        suicide_events = []
-                                        processed_count = 0
+                                                    # Add victim stats
+                                                    if victim_id not in unique_players:
+                                                        unique_players[victim_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
+                                                    unique_players[victim_id]["deaths"] += 1
 
-                                        logger.debug(f"Using batch processing for {len(events)} events")
+                                                # Count suicides
+                                                for event in suicide_events:
+                                                    player_id = event.get("victim_id")
+
+                                                    # Add player stats
+                                                    if player_id not in unique_players:
+                                                        unique_players[player_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
+                                                    unique_players[player_id]["suicides"] += 1
+
+                                                # Update stats for each unique player
+                                                logger.debug(f"Updating stats for {len(unique_players)} unique players")
+                                                for player_id, stats in unique_players.items():
+                                                    # Get or create player
+                                                    player = await self._get_or_create_player(server_id, player_id, stats["name"])
+
+                                                    if player is not None:
+                                                        # Update stats
+                                                        await player.update_stats(self.bot.db, 
+                                                                                kills=stats["kills"], 
+                                                                                deaths=stats["deaths"], 
+                                                                                suicides=stats["suicides"])
+
+                                                # Update nemesis/prey relationships in bulk
+                                                logger.debug(f"Updating nemesis/prey relationships")
+                                                await Player.update_all_nemesis_and_prey(self.bot.db, server_id)
 
-                                        # Step 1: Normalize and categorize all events
-                                        for event in events:
-                                            try:
-                                                # Normalize event data
-                                                normalized_event = normalize_event_data(event)
-                                                if not normalized_event:
-                                                    continue
-
-                                                # Add server ID
-                                                normalized_event["server_id"] = server_id
-
-                                                # Update timestamp in coordinator
-                                                if "timestamp" in normalized_event and isinstance(normalized_event["timestamp"], datetime):
-                                                    parser_coordinator.update_csv_timestamp(server_id, normalized_event["timestamp"])
-
-                                                # Process event type
-                                                event_type = categorize_event(normalized_event)
-                                                normalized_event["event_type"] = event_type
-
-                                                # Validate IDs - using the improved validation from our _get_or_create_player method
-                                                killer_id = normalized_event.get("killer_id", "")
-                                                victim_id = normalized_event.get("victim_id", "")
-
-                                                # Skip events with invalid IDs
-                                                if not killer_id or killer_id.lower() in ['null', 'none', 'undefined'] or \
-                                                   not victim_id or victim_id.lower() in ['null', 'none', 'undefined']:
-                                                    continue
-
-                                                # Add to appropriate batch
-                                                if event_type == "kill":
-                                                    kill_events.append(normalized_event)
-                                                elif event_type == "suicide":
-                                                    suicide_events.append(normalized_event)
                                             except Exception as e:
-                                                errors.append(str(e))
-                                                logger.error(f"Error normalizing/categorizing event: {str(e)[:100]}")
-
-                                        # Report categorization results
-                                        logger.debug(f"Categorized events: {len(kill_events)} kills, {len(suicide_events)} suicides")
-
-                                        # Step 2: Process suicide events in batch
-                                        if suicide_events:
-                                            # Create documents for bulk insert
-                                            suicide_docs = []
-                                            for event in suicide_events:
-                                                suicide_docs.append({
-                                                    "server_id": server_id,
-                                                    "killer_id": event.get("victim_id"),  # For suicides, killer = victim
-                                                    "killer_name": event.get("victim_name", "Unknown"),
-                                                    "victim_id": event.get("victim_id"),
-                                                    "victim_name": event.get("victim_name", "Unknown"),
-                                                    "weapon": event.get("weapon", "Unknown"),
-                                                    "distance": event.get("distance", 0),
-                                                    "timestamp": event.get("timestamp", datetime.now()),
-                                                    "is_suicide": True,
-                                                    "event_type": "suicide"
-                                                })
-
-                                            # Bulk insert suicide events
-                                            if suicide_docs is not None:
-                                                try:
-                                                    # Use ordered=False to allow partial success
-                                                    result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
-                                                    processed_count += len(suicide_docs)
-                                                    logger.info(f"Inserted {len(suicide_docs)} suicide events in batch")
-                                                except Exception as e:
-                                                    logger.error(f"Error bulk inserting suicide events: {str(e)[:100]}")
-
-                                        # Step 3: Process kill events in batch
-                                        if kill_events:
-                                            # Create documents for bulk insert
-                                            kill_docs = []
-                                            for event in kill_events:
-                                                kill_docs.append({
-                                                    "server_id": server_id,
-                                                    "killer_id": event.get("killer_id"),
-                                                    "killer_name": event.get("killer_name", "Unknown"),
-                                                    "victim_id": event.get("victim_id"),
-                                                    "victim_name": event.get("victim_name", "Unknown"),
-                                                    "weapon": event.get("weapon", "Unknown"),
-                                                    "distance": event.get("distance", 0),
-                                                    "timestamp": event.get("timestamp", datetime.now()),
-                                                    "is_suicide": False,
-                                                    "event_type": "kill"
-                                                })
-
-                                            # Bulk insert kill events
-                                            if kill_docs is not None:
-                                                try:
-                                                    # Use ordered=False to allow partial success
-                                                    result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
-                                                    processed_count += len(kill_docs)
-                                                    logger.info(f"Inserted {len(kill_docs)} kill events in batch")
-                                                except Exception as e:
-                                                    logger.error(f"Error bulk inserting kill events: {str(e)[:100]}")
+                                                logger.error(f"Error processing player stats in batch: {str(e)[:150]}")
+                                                logger.error(f"Will continue with event recording even if player stats update failed")
 
-                                        # Step 4: Process player stats for unique players
-                                        # This is more efficient than updating per-event
-                                        # Create player lookup sets for batch processing player stats
-                                        try:
-                                            from models.player import Player
-
-                                            # Collect unique player IDs
-                                            unique_players = {}  # player_id -> {kills, deaths, suicides}
-
-                                            # Count kills for killers, deaths for victims 
-                                            for event in kill_events:
-                                                killer_id = event.get("killer_id")
-                                                victim_id = event.get("victim_id")
-
-                                                # Add killer stats
-                                                if killer_id not in unique_players:
-                                                    unique_players[killer_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("killer_name", "Unknown")}
-                                                unique_players[killer_id]["kills"] += 1
-
-                                                # Add victim stats
-                                                if victim_id not in unique_players:
-                                                    unique_players[victim_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
-                                                unique_players[victim_id]["deaths"] += 1
-
-                                            # Count suicides
-                                            for event in suicide_events:
-                                                player_id = event.get("victim_id")
-
-                                                # Add player stats
-                                                if player_id not in unique_players:
-                                                    unique_players[player_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
-                                                unique_players[player_id]["suicides"] += 1
-
-                                            # Update stats for each unique player
-                                            logger.debug(f"Updating stats for {len(unique_players)} unique players")
-                                            for player_id, stats in unique_players.items():
-                                                # Get or create player
-                                                player = await self._get_or_create_player(server_id, player_id, stats["name"])
-
-                                                if player is not None:
-                                                    # Update stats
-                                                    await player.update_stats(self.bot.db, 
-                                                                            kills=stats["kills"], 
-                                                                            deaths=stats["deaths"], 
-                                                                            suicides=stats["suicides"])
-
-                                            # Update nemesis/prey relationships in bulk
-                                            logger.debug(f"Updating nemesis/prey relationships")
-                                            await Player.update_all_nemesis_and_prey(self.bot.db, server_id)
+                                        processed = processed_count
 
-                                        except Exception as e:
-                                            logger.error(f"Error processing player stats in batch: {str(e)[:150]}")
-                                            logger.error(f"Will continue with event recording even if player stats update failed")
+                                        events_processed += processed
+                                        files_processed += 1
 
-                                    processed = processed_count
+                                        if errors:
+                                            logger.warning(f"Errors processing {file}: {len(errors)} errors")
 
-                                    events_processed += processed
-                                    files_processed += 1
-
-                                    if errors:
-                                        logger.warning(f"Errors processing {file}: {len(errors)} errors")
-
-                                    # Update last processed time if this is the newest file
-                                    if file == new_files[-1]:
-                                        try:
-                                            file_time = datetime.strptime(file.split('.csv')[0], "%Y.%m.%d-%H.%M.%S")
-                                            self.last_processed[server_id] = file_time
+                                        # Update last processed time if this is the newest file
+                                        if file == new_files[-1]:
+                                            try:
+                                                file_time = datetime.strptime(file.split('.csv')[0], "%Y.%m.%d-%H.%M.%S")
+                                                self.last_processed[server_id] = file_time
                                             
-                                            # CRITICAL FIX: Also track line position for newest file when in historical mode
-                                            if is_historical_mode:
-                                                # Count total lines in file for position tracking
-                                                try:
-                                                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                                                        line_count = sum(1 for _ in f)
+                                                # CRITICAL FIX: Also track line position for newest file when in historical mode
+                                                if is_historical_mode:
+                                                    # Count total lines in file for position tracking
+                                                    try:
+                                                        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                                                            line_count = sum(1 for _ in f)
                                                     
-                                                    # Initialize server's tracking dict if needed
-                                                    if server_id not in self.last_processed_line_positions:
-                                                        self.last_processed_line_positions[server_id] = {}
+                                                        # Initialize server's tracking dict if needed
+                                                        if server_id not in self.last_processed_line_positions:
+                                                            self.last_processed_line_positions[server_id] = {}
                                                     
-                                                    # Store line count for this file
-                                                    file_key = os.path.basename(file)
-                                                    self.last_processed_line_positions[server_id][file_key] = line_count
-                                                    logger.warning(f"CRITICAL FIX: Stored line position {line_count} for newest file {file_key}")
-                                                except Exception as line_err:
-                                                    logger.error(f"Error counting lines in newest file: {line_err}")
-                                        except ValueError:
-                                            # If we can't parse the timestamp from filename, use current time
-                                            self.last_processed[server_id] = datetime.now()
+                                                        # Store line count for this file
+                                                        file_key = os.path.basename(file)
+                                                        self.last_processed_line_positions[server_id][file_key] = line_count
+                                                        logger.warning(f"CRITICAL FIX: Stored line position {line_count} for newest file {file_key}")
+                                                    except Exception as line_err:
+                                                        logger.error(f"Error counting lines in newest file: {line_err}")
+                                            except ValueError:
+                                                # If we can't parse the timestamp from filename, use current time
+                                                self.last_processed[server_id] = datetime.now()
 
-                            except Exception as e:
-                                logger.error(f"Error processing file {file}: {str(e)}")
+                                except Exception as e:
+                                    logger.error(f"Error processing file {file}: {str(e)}")
+                        finally:
+                            # Cancel transfers still in flight when the loop ends early, including
+                            # on cancellation, and wait for them so none outlive the SFTP session
+                            for download in prefetched_downloads.values():
+                                download.cancel()
+                            if prefetched_downloads:
+                                await asyncio.gather(*prefetched_downloads.values(), return_exceptions=True)
 
                         # Memory optimization - clear local variables before completing
                         try:
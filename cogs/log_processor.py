@@ -1252,14 +1252,15 @@ class LogProcessorCog(commands.Cog):
 
             if player is None:
                 # Create new player
+                now = datetime.utcnow()
                 player = Player(
                     player_id=player_id,
                     server_id=server_id,
                     name=player_name,
                     display_name=player_name,
-                    last_seen=datetime.utcnow(),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
+                    last_seen=now,
+                    created_at=now,
+                    updated_at=now
                 )
 
                 # Insert into database
@@ -1272,14 +1273,15 @@ class LogProcessorCog(commands.Cog):
         except Exception as e:
             logger.error(f"Error in _get_or_create_player: {e}")
             # Return a basic player object to avoid further errors
+            now = datetime.utcnow()
             return Player(
                 player_id=player_id,
                 server_id=server_id,
                 name=player_name,
                 display_name=player_name,
-                last_seen=datetime.utcnow(),
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                last_seen=now,
+                created_at=now,
+                updated_at=now
             )
 
 async def setup(bot):
@@ -22,6 +22,7 @@ from utils.csv_processor_coordinator import CSVProcessorCoordinator
 from utils.file_discovery import FileDiscovery
 from utils.stable_csv_parser import StableCSVParser
 from utils.sftp import SFTPManager
+from utils.sftp_cache import get_shared_connection_cache
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -66,14 +67,15 @@ class CSVProcessorCog(commands.Cog):
         self.bot = bot
 
         # Create our stable components
-        self.coordinator = CSVProcessorCoordinator()
+        self.coordinator = CSVProcessorCoordinator(bot)
 
         # Set the event processor
         self.coordinator.set_events_processor(self._process_kill_event)
 
         # Initialize state tracking
         self.is_processing = False
-        self.sftp_connections = {}
+        # Same manager cache as the coordinator, so each server has one manager
+        self.sftp_connections = get_shared_connection_cache(bot)
 
         # Start the background task
         self.process_csv_files_task.start()
@@ -83,8 +85,7 @@ class CSVProcessorCog(commands.Cog):
         self.process_csv_files_task.cancel()
 
         # Close SFTP connections
-        for connection in self.sftp_connections.values():
-            asyncio.create_task(connection.close())
+        asyncio.create_task(self.sftp_connections.close_all())
 
     @tasks.loop(minutes=5)
     async def process_csv_files_task(self):
@@ -345,39 +346,7 @@ class CSVProcessorCog(commands.Cog):
         Returns:
             SFTPManager: SFTP manager for this server, or None if creation fails
         """
-        # Check if we already have a connection
-        if server_id in self.sftp_connections:
-            sftp = self.sftp_connections[server_id]
-
-            # Check if the connection is still valid
-            if sftp.is_connected:
-                return sftp
-
-            # Connection is invalid, close it
-            await sftp.close()
-            del self.sftp_connections[server_id]
-
-        # Create a new connection
-        try:
-            sftp = SFTPManager(
-                hostname=config["hostname"],
-                port=config["port"],
-                username=config["username"],
-                password=config["password"],
-                server_id=server_id,
-                original_server_id=config.get("original_server_id")
-            )
-
-            # Connect to the server
-            await sftp.connect()
-
-            # Store the connection for reuse
-            self.sftp_connections[server_id] = sftp
-
-            return sftp
-        except Exception as e:
-            logger.error(f"Failed to create SFTP manager for server {server_id}: {e}")
-            return None
+        return await self.sftp_connections.acquire(server_id, config)
 
     def _log_final_status(self, files_processed: int, events_processed: int, duration: float):
         """Log the final status of the CSV processing
@@ -129,8 +129,9 @@ class Premium(commands.Cog):
                 logger.warning(f"Error getting guild model: {e}")
 
             # Premium is guild-based, not server-based (Rule #9)
-            # Use get_or_create to ensure premium works without requiring server setup
-            guild = await Guild.get_or_create(self.bot.db, ctx.guild.id, ctx.guild.name)
+            # Use get_or_create to ensure premium works without requiring server setup.
+            # Reuse the guild fetched above, looking it up again only if that failed
+            guild = guild_model if guild_model is not None else await Guild.get_or_create(self.bot.db, ctx.guild.id, ctx.guild.name)
             
             # If we couldn't get or create a guild, that's a serious database error
             if guild is None:
@@ -233,8 +234,9 @@ class Premium(commands.Cog):
                 logger.warning(f"Error getting guild model: {e}")
 
             # Premium is guild-based, not server-based (Rule #9)
-            # Use get_or_create to ensure premium works without requiring server setup
-            guild = await Guild.get_or_create(self.bot.db, ctx.guild.id, ctx.guild.name)
+            # Use get_or_create to ensure premium works without requiring server setup.
+            # Reuse the guild fetched above, looking it up again only if that failed
+            guild = guild_model if guild_model is not None else await Guild.get_or_create(self.bot.db, ctx.guild.id, ctx.guild.name)
             
             # If we couldn't get or create a guild, that's a serious database error
             if guild is None:
@@ -640,7 +640,10 @@ class Setup(commands.Cog):
                             # Clean flags in standalone servers collection
                             await self.bot.db.servers.update_one(
                                 {"server_id": std_server_id},
-                                {"$set": {"historical_parse_done": False}}
+                                {"$set": {
+                                    "historical_parse_done": False,
+                                    "server_id_lower": str(std_server_id).lower()
+                                }}
                             )
                         except Exception as flag_err:
                             logger.error(f"Error clearing historical parse flags: {flag_err}")
@@ -112,14 +112,27 @@ async def fix_simple_coroutine_issues(file_path: str) -> Tuple[bool, str]:
         
         # Check if we made any changes
         if fixed_content != content:
-            # Backup the original file
+            # Back up the original file the first time it is fixed. The
+            # rewrite below is atomic, so later runs have nothing to protect
+            # against and the backup keeps the untouched original
             backup_path = f"{file_path}.coroutine_fix.bak"
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if not os.path.exists(backup_path):
+                # The original is replaced by rename rather than rewritten in
+                # place, so a hard link keeps its bytes without copying them
+                try:
+                    os.link(file_path, backup_path)
+                except OSError:
+                    with open(backup_path, 'w', encoding='utf-8') as f:
+                        f.write(content)
                 
-            # Write the fixed content
-            with open(file_path, 'w', encoding='utf-8') as f:
+            # Write the fixed content to a temporary file and swap it in, so
+            # a failed write can't leave a truncated source file behind
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
                 f.write(fixed_content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
                 
             return True, f"Fixed coroutine issues in {file_path}. Original backed up to {backup_path}"
         else:
@@ -6,247 +6,394 @@ This adds intelligent adjustment of CSV check frequency based on server activity
 - Active servers with events are checked more frequently (5 minutes)
 - Inactive servers are checked less frequently (up to 30 minutes)
 """
+import ast
 import os
+import textwrap
 import asyncio
 import re
 
-def implement_adaptive_processing():
-    """
-    Implement adaptive CSV processing in the CSVProcessorCog class
+# Method spliced into CSVProcessorCog, built once and indented for class level
+CHECK_SERVER_ACTIVITY_METHOD = textwrap.indent('''\
+async def _check_server_activity(self, server_id, events_found):
+    """Track server activity for adaptive processing
+
+    Args:
+        server_id: The server ID to check
+        events_found: Number of events found in current check
+
+    Returns:
+        int: Recommended minutes to wait until next check
     """
-    file_path = "cogs/csv_processor.py"
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
-        return
-    
-    print(f"Implementing adaptive CSV processing in {file_path}...")
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+    from datetime import datetime
+    now = datetime.utcnow()
+
+    # Initialize server activity tracking if needed
+    if server_id not in self.server_activity:
+        self.server_activity[server_id] = {
+            "last_active": now,
+            "empty_checks": 0
+        }
+
+    # Update activity metrics
+    if events_found > 0:
+        # Server is active, reset empty check counter
+        self.server_activity[server_id]["last_active"] = now
+        self.server_activity[server_id]["empty_checks"] = 0
+        return self.default_check_interval
+    else:
+        # No events found, increment empty check counter
+        self.server_activity[server_id]["empty_checks"] += 1
+
+        # Calculate recommended interval based on inactivity
+        empty_checks = self.server_activity[server_id]["empty_checks"]
+        if empty_checks >= self.inactive_threshold:
+            # Scale the interval based on how many empty checks we've had
+            interval = min(self.default_check_interval + ((empty_checks - self.inactive_threshold + 1) * 5), 
+                          self.max_check_interval)
+            logger.debug(f"Server {server_id} has had {empty_checks} empty checks, next check in {interval} minutes")
+            return interval
+
+    # Default to standard interval
+    return self.default_check_interval
+''', "    ")
+
+# Docstring given to process_csv_files_task if it does not already have one
+PROCESS_CSV_FILES_TASK_DOCSTRING = """Background task for processing CSV files
+
+This task runs regularly to check for new CSV files from game servers.
+The interval is adaptively adjusted based on server activity:
+- Active servers are checked more frequently (default: 5 minutes)
+- Inactive servers are checked less frequently (up to max_check_interval)
+"""
+
+# Fail at import rather than after patching if the template is not valid Python
+ast.parse("class CSVProcessorCog:\n" + CHECK_SERVER_ACTIVITY_METHOD)
+
+# Text replacements applied to the cog, as (pattern, replacement) pairs.
+# Steps 2-3 are AST edits and live in implement_adaptive_processing.
+TEXT_REPLACEMENTS = (
     # 1. Add the necessary instance variables to the __init__ method
-    init_pattern = (
-        "        # NEW: For tracking which files have been processed to avoid processing previous day's file repeatedly\n"
-        "        self.processed_files_history = {}  # server_id -> set of filenames"
-    )
-    
-    init_replacement = (
-        "        # NEW: For tracking which files have been processed to avoid processing previous day's file repeatedly\n"
-        "        self.processed_files_history = {}  # server_id -> set of filenames\n"
-        "\n"
-        "        # NEW: For adaptive processing frequency\n"
-        "        self.server_activity = {}  # server_id -> {\"last_active\": datetime, \"empty_checks\": int}\n"
-        "        self.default_check_interval = 5  # Default: check every 5 minutes\n"
-        "        self.max_check_interval = 30  # Maximum: check every 30 minutes\n"
-        "        self.inactive_threshold = 3  # After 3 empty checks, consider inactive"
-    )
-    
-    content = content.replace(init_pattern, init_replacement)
-    
-    # 2. Create the adaptive processing method
-    save_state_pattern = (
-        "    async def _save_state(self):\n"
-        "        \"\"\"Save current CSV processing state to database for all servers\"\"\"\n"
-    )
-    
-    save_state_replacement = (
-        "    async def _save_state(self):\n"
-        "        \"\"\"Save current CSV processing state to database for all servers\"\"\"\n"
-        "\n"
-        "    async def _check_server_activity(self, server_id, events_found):\n"
-        "        \"\"\"Track server activity for adaptive processing\n"
-        "\n"
-        "        Args:\n"
-        "            server_id: The server ID to check\n"
-        "            events_found: Number of events found in current check\n"
-        "            \n"
-        "        Returns:\n"
-        "            int: Recommended minutes to wait until next check\n"
-        "        \"\"\"\n"
-        "        from datetime import datetime\n"
-        "        now = datetime.utcnow()\n"
-        "        \n"
-        "        # Initialize server activity tracking if needed\n"
-        "        if server_id not in self.server_activity:\n"
-        "            self.server_activity[server_id] = {\n"
-        "                \"last_active\": now,\n"
-        "                \"empty_checks\": 0\n"
-        "            }\n"
-        "        \n"
-        "        # Update activity metrics\n"
-        "        if events_found > 0:\n"
-        "            # Server is active, reset empty check counter\n"
-        "            self.server_activity[server_id][\"last_active\"] = now\n"
-        "            self.server_activity[server_id][\"empty_checks\"] = 0\n"
-        "            return self.default_check_interval\n"
-        "        else:\n"
-        "            # No events found, increment empty check counter\n"
-        "            self.server_activity[server_id][\"empty_checks\"] += 1\n"
-        "            \n"
-        "            # Calculate recommended interval based on inactivity\n"
-        "            empty_checks = self.server_activity[server_id][\"empty_checks\"]\n"
-        "            if empty_checks >= self.inactive_threshold:\n"
-        "                # Scale the interval based on how many empty checks we've had\n"
-        "                interval = min(self.default_check_interval + ((empty_checks - self.inactive_threshold + 1) * 5), \n"
-        "                              self.max_check_interval)\n"
-        "                logger.debug(f\"Server {server_id} has had {empty_checks} empty checks, next check in {interval} minutes\")\n"
-        "                return interval\n"
-        "            \n"
-        "        # Default to standard interval\n"
-        "        return self.default_check_interval\n"
-        "\n"
+    (
+        (
+            "        # NEW: For tracking which files have been processed to avoid processing previous day's file repeatedly\n"
+            "        self.processed_files_history = {}  # server_id -> set of filenames"
+        ),
+        (
+            "        # NEW: For tracking which files have been processed to avoid processing previous day's file repeatedly\n"
+            "        self.processed_files_history = {}  # server_id -> set of filenames\n"
+            "\n"
+            "        # NEW: For adaptive processing frequency\n"
+            "        self.server_activity = {}  # server_id -> {\"last_active\": datetime, \"empty_checks\": int}\n"
+            "        self.default_check_interval = 5  # Default: check every 5 minutes\n"
+            "        self.max_check_interval = 30  # Maximum: check every 30 minutes\n"
+            "        self.inactive_threshold = 3  # After 3 empty checks, consider inactive"
+        )
+    ),
+    # 4. Update the server processing to track events and adjust intervals
+    (
+        "            return files_processed, events_processed",
+        (
+            "            # Track server activity for adaptive processing\n"
+            "            recommended_interval = await self._check_server_activity(server_id, events_processed)\n"
+            "            \n"
+            "            return files_processed, events_processed"
+        )
+    ),
+    # 5. Add selective processing to avoid checking all servers every time
+    (
+        (
+            "        # Save updated state to database\n"
+            "        await self._save_state()\n"
+            "        \n"
+            "        logger.info(f\"CSV processing completed in {total_time:.2f} seconds. Processed {total_files} CSV files with {total_events} events.\")"
+        ),
+        (
+            "        # Save updated state to database\n"
+            "        await self._save_state()\n"
+            "        \n"
+            "        # Apply selective processing for next run - skip servers based on activity\n"
+            "        for server_id in processed_servers:\n"
+            "            # Skip scheduling for servers that had zero events and are over threshold\n"
+            "            if server_id in self.server_activity and self.server_activity[server_id]['empty_checks'] >= self.inactive_threshold:\n"
+            "                next_check_mins = min(self.default_check_interval + self.server_activity[server_id]['empty_checks'] * 5, \n"
+            "                                     self.max_check_interval)\n"
+            "                logger.debug(f\"Server {server_id} will be checked less frequently (every {next_check_mins} minutes)\")\n"
+            "        \n"
+            "        logger.info(f\"CSV processing completed in {total_time:.2f} seconds. Processed {total_files} CSV files with {total_events} events.\")"
+        )
+    ),
+    # 6. Initialize processed_servers tracking variable in the task
+    (
+        (
+            "            logger.error(\"CSV processing task aborted due to lock being held\")\n"
+            "            return\n"
+            "        \n"
+            "        self.is_processing = True"
+        ),
+        (
+            "            logger.error(\"CSV processing task aborted due to lock being held\")\n"
+            "            return\n"
+            "        \n"
+            "        # Dictionary to track servers processed in this run\n"
+            "        processed_servers = {}\n"
+            "        \n"
+            "        self.is_processing = True"
+        )
+    ),
+    # 7. Update the task to track which servers were processed
+    (
+        (
+            "        # Process each server configuration\n"
+            "        total_files = 0\n"
+            "        total_events = 0\n"
+            "        \n"
+            "        for server_id, config in server_configs.items():"
+        ),
+        (
+            "        # Process each server configuration\n"
+            "        total_files = 0\n"
+            "        total_events = 0\n"
+            "        \n"
+            "        # Determine which servers to process based on activity\n"
+            "        servers_to_process = {}\n"
+            "        for server_id, config in server_configs.items():\n"
+            "            # Always check servers with no activity history\n"
+            "            if server_id not in self.server_activity:\n"
+            "                servers_to_process[server_id] = config\n"
+            "                continue\n"
+            "                \n"
+            "            # Skip inactive servers that were checked recently\n"
+            "            empty_checks = self.server_activity[server_id]['empty_checks']\n"
+            "            if empty_checks >= self.inactive_threshold:\n"
+            "                from datetime import datetime, timedelta\n"
+            "                now = datetime.utcnow()\n"
+            "                last_processed = self.last_processed.get(server_id)\n"
+            "                if last_processed is not None:\n"
+            "                    # Calculate how long ago we last checked this server\n"
+            "                    elapsed_mins = (now - last_processed).total_seconds() / 60\n"
+            "                    # Calculate recommended interval based on inactivity\n"
+            "                    recommended_interval = min(self.default_check_interval + ((empty_checks - self.inactive_threshold + 1) * 5),\n"
+            "                                              self.max_check_interval)\n"
+            "                    \n"
+            "                    # If we haven't waited long enough, skip this server\n"
+            "                    if elapsed_mins < recommended_interval:\n"
+            "                        logger.debug(f\"Skipping inactive server {server_id} (last checked {elapsed_mins:.1f} mins ago, check interval {recommended_interval} mins)\")\n"
+            "                        continue\n"
+            "            \n"
+            "            # Process this server\n"
+            "            servers_to_process[server_id] = config\n"
+            "            \n"
+            "        logger.debug(f\"Processing {len(servers_to_process)}/{len(server_configs)} servers based on activity patterns\")\n"
+            "            \n"
+            "        for server_id, config in servers_to_process.items():"
+        )
+    ),
+    # 8. Update the track_server pattern
+    (
+        (
+            "            # Track files and events processed\n"
+            "            total_files += files_processed\n"
+            "            total_events += events_processed"
+        ),
+        (
+            "            # Track files and events processed\n"
+            "            total_files += files_processed\n"
+            "            total_events += events_processed\n"
+            "            \n"
+            "            # Record this server as processed in this run\n"
+            "            processed_servers[server_id] = events_processed"
+        )
     )
+)
+
+def find_definitions(content):
+    """
+    Parse source once and index its function definitions by name
     
-    content = content.replace(save_state_pattern, save_state_replacement)
-    
-    # 3. Modify the process_csv_files_task to use variable intervals
-    task_pattern = (
-        "    @tasks.loop(minutes=5)\n"
-        "    async def process_csv_files_task(self):"
-    )
+    Args:
+        content: Source code to parse
+        
+    Returns:
+        Dict of function name to its ast node, or None if the source does not parse
+    """
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        print(f"Warning: Could not parse source: {e}")
+        return None
     
-    task_replacement = (
-        "    @tasks.loop(minutes=5)\n"
-        "    async def process_csv_files_task(self):\n"
-        "        \"\"\"Background task for processing CSV files\n"
-        "\n"
-        "        This task runs regularly to check for new CSV files from game servers.\n"
-        "        The interval is adaptively adjusted based on server activity:\n"
-        "        - Active servers are checked more frequently (default: 5 minutes)\n"
-        "        - Inactive servers are checked less frequently (up to max_check_interval)\n"
-        "        \"\"\""
-    )
+    return {
+        node.name: node for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+def method_insertion_edit(definitions, anchor_name, method_name, method_source):
+    """
+    Build an edit inserting a method definition directly before another method
     
-    content = content.replace(task_pattern, task_replacement)
+    The anchor method is located from the parsed definitions, so the insertion
+    lands on a definition boundary regardless of docstrings or spacing.
     
-    # 4. Update the server processing to track events and adjust intervals
-    process_server_pattern = "            return files_processed, events_processed"
+    Args:
+        definitions: Function definitions from find_definitions
+        anchor_name: Name of the method to insert before
+        method_name: Name of the method being inserted
+        method_source: Source of the method, indented for class level
+        
+    Returns:
+        A (start_line, end_line, replacement) edit, or None if nothing should change
+    """
+    if method_name in definitions:
+        print(f"{method_name} already exists, skipping")
+        return None
     
-    process_server_replacement = (
-        "            # Track server activity for adaptive processing\n"
-        "            recommended_interval = await self._check_server_activity(server_id, events_processed)\n"
-        "            \n"
-        "            return files_processed, events_processed"
-    )
+    anchor = definitions.get(anchor_name)
+    if anchor is None:
+        print(f"Warning: Could not locate {anchor_name}")
+        return None
     
-    content = content.replace(process_server_pattern, process_server_replacement)
+    # Start at the first decorator so decorated methods stay intact
+    first_line = min([anchor.lineno] + [d.lineno for d in anchor.decorator_list])
+    return (first_line, first_line, method_source.rstrip('\n') + '\n\n')
+
+def docstring_insertion_edit(definitions, function_name, docstring):
+    """
+    Build an edit giving a function a docstring if it does not have one
     
-    # 5. Add selective processing to avoid checking all servers every time
-    process_csv_end_pattern = (
-        "        # Save updated state to database\n"
-        "        await self._save_state()\n"
-        "        \n"
-        "        logger.info(f\"CSV processing completed in {total_time:.2f} seconds. Processed {total_files} CSV files with {total_events} events.\")"
-    )
+    Args:
+        definitions: Function definitions from find_definitions
+        function_name: Name of the function to document
+        docstring: Docstring text, without quotes or indentation
+        
+    Returns:
+        A (start_line, end_line, replacement) edit, or None if nothing should change
+    """
+    function = definitions.get(function_name)
+    if function is None:
+        print(f"Warning: Could not locate {function_name}")
+        return None
+    if ast.get_docstring(function) is not None:
+        return None
     
-    process_csv_end_replacement = (
-        "        # Save updated state to database\n"
-        "        await self._save_state()\n"
-        "        \n"
-        "        # Apply selective processing for next run - skip servers based on activity\n"
-        "        for server_id in processed_servers:\n"
-        "            # Skip scheduling for servers that had zero events and are over threshold\n"
-        "            if server_id in self.server_activity and self.server_activity[server_id]['empty_checks'] >= self.inactive_threshold:\n"
-        "                next_check_mins = min(self.default_check_interval + self.server_activity[server_id]['empty_checks'] * 5, \n"
-        "                                     self.max_check_interval)\n"
-        "                logger.debug(f\"Server {server_id} will be checked less frequently (every {next_check_mins} minutes)\")\n"
-        "        \n"
-        "        logger.info(f\"CSV processing completed in {total_time:.2f} seconds. Processed {total_files} CSV files with {total_events} events.\")"
-    )
+    first_statement = function.body[0]
+    indent = " " * first_statement.col_offset
+    quoted = '"""' + docstring.strip('\n') + '\n"""'
+    return (first_statement.lineno, first_statement.lineno, textwrap.indent(quoted, indent, lambda line: line.strip()) + '\n')
+
+def line_edits_to_offsets(content, edits):
+    """
+    Convert line-based edits to character offsets into the source
     
-    content = content.replace(process_csv_end_pattern, process_csv_end_replacement)
+    Args:
+        content: Source code the edits were built against
+        edits: (start_line, end_line, replacement) tuples with 1-based lines,
+            replacing lines start_line up to but not including end_line
+        
+    Returns:
+        List of (start, end, replacement) edits by character offset
+    """
+    line_offsets = [0]
+    for line in content.splitlines(keepends=True):
+        line_offsets.append(line_offsets[-1] + len(line))
+    return [
+        (line_offsets[start_line - 1], line_offsets[end_line - 1], replacement)
+        for start_line, end_line, replacement in edits
+    ]
+
+def replacement_edits(content, replacements):
+    """
+    Locate every occurrence of each pattern to be replaced
     
-    # 6. Initialize processed_servers tracking variable in the task
-    process_csv_start_pattern = (
-        "            logger.error(\"CSV processing task aborted due to lock being held\")\n"
-        "            return\n"
-        "        \n"
-        "        self.is_processing = True"
-    )
+    Args:
+        content: Source code to search
+        replacements: (pattern, replacement) tuples
+        
+    Returns:
+        List of (start, end, replacement) edits by character offset
+    """
+    edits = []
+    for pattern, replacement in replacements:
+        start = content.find(pattern)
+        while start != -1:
+            edits.append((start, start + len(pattern), replacement))
+            start = content.find(pattern, start + len(pattern))
+    return edits
+
+def apply_edits(content, edits):
+    """
+    Materialize a set of edits into new source in a single pass
     
-    process_csv_start_replacement = (
-        "            logger.error(\"CSV processing task aborted due to lock being held\")\n"
-        "            return\n"
-        "        \n"
-        "        # Dictionary to track servers processed in this run\n"
-        "        processed_servers = {}\n"
-        "        \n"
-        "        self.is_processing = True"
-    )
+    Args:
+        content: Source code the edits were built against
+        edits: (start, end, replacement) tuples by character offset
+        
+    Returns:
+        The updated source code
+    """
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        if start < position:
+            print(f"Warning: Skipping overlapping edit at offset {start}")
+            continue
+        parts.append(content[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(content[position:])
+    return ''.join(parts)
+
+def implement_adaptive_processing():
+    """
+    Implement adaptive CSV processing in the CSVProcessorCog class
+    """
+    file_path = "cogs/csv_processor.py"
+    if not os.path.exists(file_path):
+        print(f"File not found: {file_path}")
+        return
     
-    content = content.replace(process_csv_start_pattern, process_csv_start_replacement)
+    print(f"Implementing adaptive CSV processing in {file_path}...")
     
-    # 7. Update the task to track which servers were processed
-    process_servers_pattern = (
-        "        # Process each server configuration\n"
-        "        total_files = 0\n"
-        "        total_events = 0\n"
-        "        \n"
-        "        for server_id, config in server_configs.items():"
-    )
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    original_content = content
     
-    process_servers_replacement = (
-        "        # Process each server configuration\n"
-        "        total_files = 0\n"
-        "        total_events = 0\n"
-        "        \n"
-        "        # Determine which servers to process based on activity\n"
-        "        servers_to_process = {}\n"
-        "        for server_id, config in server_configs.items():\n"
-        "            # Always check servers with no activity history\n"
-        "            if server_id not in self.server_activity:\n"
-        "                servers_to_process[server_id] = config\n"
-        "                continue\n"
-        "                \n"
-        "            # Skip inactive servers that were checked recently\n"
-        "            empty_checks = self.server_activity[server_id]['empty_checks']\n"
-        "            if empty_checks >= self.inactive_threshold:\n"
-        "                from datetime import datetime, timedelta\n"
-        "                now = datetime.utcnow()\n"
-        "                last_processed = self.last_processed.get(server_id)\n"
-        "                if last_processed is not None:\n"
-        "                    # Calculate how long ago we last checked this server\n"
-        "                    elapsed_mins = (now - last_processed).total_seconds() / 60\n"
-        "                    # Calculate recommended interval based on inactivity\n"
-        "                    recommended_interval = min(self.default_check_interval + ((empty_checks - self.inactive_threshold + 1) * 5),\n"
-        "                                              self.max_check_interval)\n"
-        "                    \n"
-        "                    # If we haven't waited long enough, skip this server\n"
-        "                    if elapsed_mins < recommended_interval:\n"
-        "                        logger.debug(f\"Skipping inactive server {server_id} (last checked {elapsed_mins:.1f} mins ago, check interval {recommended_interval} mins)\")\n"
-        "                        continue\n"
-        "            \n"
-        "            # Process this server\n"
-        "            servers_to_process[server_id] = config\n"
-        "            \n"
-        "        logger.debug(f\"Processing {len(servers_to_process)}/{len(server_configs)} servers based on activity patterns\")\n"
-        "            \n"
-        "        for server_id, config in servers_to_process.items():"
-    )
+    # Several of the text replacements are not safe to apply twice
+    if "self.server_activity = {}" in content:
+        print("Adaptive CSV processing is already implemented, nothing to do")
+        return
     
-    content = content.replace(process_servers_pattern, process_servers_replacement)
+    # Every change is collected against the original source and applied
+    # once at the end, rather than rescanning the file for each step
+    edits = []
     
-    # 8. Update the track_server pattern
-    process_single_server_pattern = (
-        "            # Track files and events processed\n"
-        "            total_files += files_processed\n"
-        "            total_events += events_processed"
-    )
+    # 2-3. Create the adaptive processing method just before _save_state and
+    # make sure process_csv_files_task documents its variable interval. Both
+    # are located from a single parse and spliced in by line number.
+    definitions = find_definitions(content)
+    if definitions is not None:
+        line_edits = [
+            method_insertion_edit(definitions, "_save_state", "_check_server_activity", CHECK_SERVER_ACTIVITY_METHOD),
+            docstring_insertion_edit(definitions, "process_csv_files_task", PROCESS_CSV_FILES_TASK_DOCSTRING)
+        ]
+        edits.extend(line_edits_to_offsets(content, [edit for edit in line_edits if edit is not None]))
     
-    process_single_server_replacement = (
-        "            # Track files and events processed\n"
-        "            total_files += files_processed\n"
-        "            total_events += events_processed\n"
-        "            \n"
-        "            # Record this server as processed in this run\n"
-        "            processed_servers[server_id] = events_processed"
-    )
+    # 1, 4-8. Locate the text replacements
+    edits.extend(replacement_edits(content, TEXT_REPLACEMENTS))
+    content = apply_edits(content, edits)
     
-    content = content.replace(process_single_server_pattern, process_single_server_replacement)
+    if content == original_content:
+        print("No matching code found, file left unchanged")
+        return
     
-    # Write the modified content back to the file
-    with open(file_path, 'w', encoding='utf-8') as f:
+    # Write to a temporary file and swap it in so a failed write can't
+    # leave a truncated cog behind. The fsync makes sure the data is on
+    # disk before the rename, so a crash can't leave an empty file either
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
         f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, file_path)
     
     print("Successfully implemented adaptive CSV processing")
 
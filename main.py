@@ -87,10 +87,23 @@ async def main():
 
 # Entry point
 if __name__ == "__main__":
+    # uvloop runs the event loop in C, which speeds up the socket-heavy
+    # SFTP and gateway traffic; fall back to the default loop without it
+    run_options = {}
+    try:
+        import uvloop
+        if sys.version_info >= (3, 12):
+            # uvloop.install() is deprecated from Python 3.12 on
+            run_options["loop_factory"] = uvloop.new_event_loop
+        else:
+            uvloop.install()
+    except ImportError:
+        pass
+    
     # Handle KeyboardInterrupt gracefully
     exit_code = 1
     try:
-        exit_code = asyncio.run(main())
+        exit_code = asyncio.run(main(), **run_options)
     except KeyboardInterrupt:
         logger.info("Bot terminated by user")
         exit_code = 0
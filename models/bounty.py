@@ -257,8 +257,7 @@ class Bounty(BaseModel):
         self.status = self.STATUS_CLAIMED
         self.claimed_by_id = claimed_by_id
         self.claimed_by_name = claimed_by_name
-        self.claimed_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.claimed_at = self.updated_at = datetime.utcnow()
         
         # Update in database
         result = await db.bounties.update_one(
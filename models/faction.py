@@ -12,6 +12,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Union, TypeVar, Set
 
 import discord
+from pymongo import UpdateOne
 
 from utils.database import get_db
 from utils.async_utils import AsyncCache
@@ -533,13 +534,20 @@ class Faction:
         """
         db = await get_db()
         
-        # Remove faction ID from all members (directly in database to avoid circular imports)
+        # Remove faction ID from all members (directly in database to avoid circular imports).
+        # The updates go out as one bulk write instead of a round trip per member
         now = datetime.utcnow()
-        for player_id in self.member_ids:
-            await db.collections["players"].update_one(
-                {"server_id": self.server_id, "player_id": player_id},
-                {"$set": {"faction_id": None, "updated_at": now}},
-                upsert=True
+        if self.member_ids:
+            await db.collections["players"].bulk_write(
+                [
+                    UpdateOne(
+                        {"server_id": self.server_id, "player_id": player_id},
+                        {"$set": {"faction_id": None, "updated_at": now}},
+                        upsert=True
+                    )
+                    for player_id in self.member_ids
+                ],
+                ordered=False
             )
         
         # Delete faction
@@ -215,10 +215,17 @@ class Guild(BaseModel):
             if all(key in server_data for key in ["sftp_host", "sftp_username", "sftp_password"]):
                 server_data["sftp_enabled"] = True
 
+            # Both collections also get the lowercased ID behind the indexed
+            # case-insensitive server lookup
+            collection_update = {"$set": {
+                **server_data,
+                "server_id_lower": str(server_data["server_id"]).lower()
+            }}
+
             # Save to servers collection (used by CSV processor)
             server_result = await self.db.servers.update_one(
                 {"server_id": server_data["server_id"]},
-                {"$set": server_data},
+                collection_update,
                 upsert=True  # Create if doesn't exist
             )
             logger.info(f"Added server to 'servers' collection: {server_data['server_id']}, upsert={server_result.upserted_id is not None}")
@@ -226,7 +233,7 @@ class Guild(BaseModel):
             # Also save to game_servers collection for better compatibility
             game_server_result = await self.db.game_servers.update_one(
                 {"server_id": server_data["server_id"]},
-                {"$set": server_data},
+                collection_update,
                 upsert=True
             )
             logger.info(f"Added server to 'game_servers' collection: {server_data['server_id']}, upsert={game_server_result.upserted_id is not None}")
@@ -801,12 +808,13 @@ class Guild(BaseModel):
             Created Guild object or None if creation failed
         """
         # Create document
+        now = datetime.utcnow()
         document = {
             "guild_id": str(guild_id),
             "name": name,
             "premium_tier": 0,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": now,
+            "updated_at": now
         }
 
         # Insert into database
@@ -2,6 +2,7 @@
 """
 Player model represents a player in the game with statistics and relationships
 """
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Union, Set, cast
 from datetime import datetime
@@ -390,17 +391,6 @@ class Player(BaseModel):
                 logger.error(f"Failed to update timestamp for {self.player_id}")
                 return False
 
-            # Get current player to ensure it exists before updating stats
-            current_player = await db.players.find_one(
-                {"player_id": self.player_id, "server_id": self.server_id}
-            )
-
-            if current_player is None:
-                logger.error(
-                    f"Player not found for stats update: {self.player_id} (server: {self.server_id})"
-                )
-                return False
-
             # Prepare update operations
             update_dict = {"updated_at": datetime.utcnow()}
             inc_dict = {}
@@ -429,7 +419,9 @@ class Player(BaseModel):
             if update_dict:
                 operations["$set"] = update_dict
 
-            # Execute the atomic update
+            # Execute the atomic update. Without upsert a missing player
+            # matches nothing and comes back as None, so no separate
+            # existence check is needed
             result = await db.players.find_one_and_update(
                 {"player_id": self.player_id, "server_id": self.server_id},
                 operations,
@@ -448,7 +440,7 @@ class Player(BaseModel):
                 return True
 
             logger.error(
-                f"Failed to update stats for {self.player_id} - database update returned no result"
+                f"Player not found for stats update: {self.player_id} (server: {self.server_id})"
             )
             return False
         except Exception as e:
@@ -670,149 +662,73 @@ class Player(BaseModel):
         try:
             # Implementation with improved error handling and atomic operations
             now = datetime.utcnow()
-
-            # Check if player exists using a properly constructed query
             query = {"player_id": safe_player_id, "server_id": safe_server_id}
-            existing = await db.players.find_one(query)
-
-            if existing:
-                # Update existing player with improved atomicity
-                logger.debug(f"Updating existing player: {safe_player_id}")
 
-                # Build update data with safely converted values
-                update_data = {"updated_at": now, "last_seen": now}
-
-                if safe_name:
-                    update_data["name"] = safe_name
-
-                # Process kwargs with validation
-                for key, value in kwargs.items():
-                    # Skip None values to avoid overwriting with None
-                    if value is not None:
-                        update_data[key] = value
+            # Fields refreshed on every call, skipping None values to avoid
+            # overwriting with None
+            update_data = {"name": safe_name, "updated_at": now, "last_seen": now}
+            for key, value in kwargs.items():
+                if value is not None:
+                    update_data[key] = value
+
+            # Defaults only written when the player is first created
+            insert_defaults = {
+                "display_name": safe_name,
+                "kills": 0,
+                "deaths": 0,
+                "suicides": 0,
+                "created_at": now,
+            }
 
-                # Single atomic update with addToSet for aliases
-                update_ops = {
-                    "$set": update_data,
-                    "$addToSet": {"known_aliases": safe_name} if safe_name else {},
-                }
+            # A single upsert creates or updates the player and returns the
+            # result, instead of a lookup, a write and a re-read
+            update_ops = {
+                "$set": update_data,
+                "$setOnInsert": {
+                    key: value
+                    for key, value in insert_defaults.items()
+                    if key not in update_data
+                },
+                "$addToSet": {"known_aliases": safe_name},
+            }
 
-                # Execute update with retry logic
-                retry_count = 0
-                max_retries = 3
-                while retry_count < max_retries:
-                    try:
-                        result = await db.players.update_one(query, update_ops)
-                        if result.modified_count > 0 or result.matched_count > 0:
-                            break
-                        retry_count += 1
-                        await asyncio.sleep(0.1)  # Small delay between retries
-                    except Exception as update_error:
-                        logger.warning(
-                            f"Retry {retry_count+1}/{max_retries} for player update failed: {update_error}"
-                        )
-                        retry_count += 1
-                        await asyncio.sleep(0.2)  # Longer delay after error
-
-                # Get the updated document
-                updated_doc = await db.players.find_one(query)
-
-                if updated_doc is not None:
-                    # Use the static method to create player from document
-                    return cls.from_document(updated_doc)
-                else:
-                    # Fallback to creating an instance directly
+            # Execute upsert with retry logic. Concurrent upserts of the same
+            # new player can collide on the unique index; the retry then
+            # matches the document the other call created
+            retry_count = 0
+            max_retries = 3
+            while retry_count < max_retries:
+                try:
+                    document = await db.players.find_one_and_update(
+                        query,
+                        update_ops,
+                        upsert=True,
+                        return_document=ReturnDocument.AFTER,
+                    )
+                    if document is not None:
+                        logger.debug(f"Created or updated player: {safe_player_id}")
+                        return cls.from_document(document)
+                    retry_count += 1
+                    await asyncio.sleep(0.1)  # Small delay between retries
+                except Exception as upsert_error:
                     logger.warning(
-                        f"Failed to retrieve updated player {safe_player_id}, creating instance directly"
+                        f"Retry {retry_count+1}/{max_retries} for player upsert failed: {upsert_error}"
                     )
-                    existing.update(update_data)  # Merge updates with existing data
-                    return cls.from_document(existing)
-            else:
-                # Create new player with improved atomicity
-                logger.debug(f"Creating new player: {safe_player_id}")
+                    retry_count += 1
+                    await asyncio.sleep(0.2)  # Longer delay after error
 
-                # Build comprehensive player data
-                player_data = {
-                    "player_id": safe_player_id,
-                    "server_id": safe_server_id,
-                    "name": safe_name,
-                    "display_name": kwargs.get("display_name", safe_name),
-                    "kills": kwargs.get("kills", 0),
-                    "deaths": kwargs.get("deaths", 0),
-                    "suicides": kwargs.get("suicides", 0),
-                    "created_at": now,
-                    "updated_at": now,
-                    "last_seen": now,
-                    "known_aliases": [safe_name] if safe_name else [],
+            # Final fallback - create an instance directly even if DB operation failed
+            logger.warning(
+                f"DB operations failed for player {safe_player_id}, returning direct instance"
+            )
+            return cls(
+                **{
+                    **query,
+                    **update_ops["$setOnInsert"],
+                    "known_aliases": [safe_name],
+                    **update_data,
                 }
-
-                # Add remaining kwargs with validation
-                for key, value in kwargs.items():
-                    if (
-                        key not in player_data and value is not None
-                    ):  # Skip None and already set values
-                        player_data[key] = value
-
-                # Insert with retry logic
-                retry_count = 0
-                max_retries = 3
-                inserted_id = None
-
-                while retry_count < max_retries:
-                    try:
-                        result = await db.players.insert_one(player_data)
-                        if result is not None and result.inserted_id:
-                            inserted_id = result.inserted_id
-                            logger.debug(f"Successfully created player: {safe_player_id}")
-                            break
-                        retry_count += 1
-                        await asyncio.sleep(0.1)
-                    except Exception as insert_error:
-                        # Check for duplicate key error (possible race condition)
-                        if "duplicate key" in str(insert_error).lower():
-                            logger.warning(
-                                f"Race condition detected for player {safe_player_id}, attempting update instead"
-                            )
-                            # If duplicate, try an upsert as fallback
-                            try:
-                                update_result = await db.players.update_one(
-                                    query,
-                                    {"$setOnInsert": player_data},
-                                    upsert=True,
-                                )
-                                if (
-                                    update_result.upserted_id
-                                    or update_result.modified_count > 0
-                                ):
-                                    logger.debug(
-                                        f"Successfully upserted player: {safe_player_id}"
-                                    )
-                                    break
-                            except Exception as upsert_error:
-                                logger.warning(f"Upsert fallback also failed: {upsert_error}")
-
-                        logger.warning(
-                            f"Retry {retry_count+1}/{max_retries} for player creation failed: {insert_error}"
-                        )
-                        retry_count += 1
-                        await asyncio.sleep(0.2)
-
-                # If we successfully inserted, return a player instance
-                if inserted_id:
-                    logger.info(f"Successfully created new player: {safe_player_id}")
-                    return cls(**player_data)
-
-                # Last retrieval attempt for race condition cases
-                final_doc = await db.players.find_one(query)
-                if final_doc is not None:
-                    logger.debug(f"Retrieved player after race condition: {safe_player_id}")
-                    return cls.from_document(final_doc)
-
-                # Final fallback - create an instance directly even if DB operation failed
-                logger.warning(
-                    f"DB operations failed for player {safe_player_id}, returning direct instance"
-                )
-                return cls(**player_data)
+            )
 
         except Exception as e:
             logger.error(f"Unhandled error in create_or_update: {e}", exc_info=True)
@@ -986,10 +902,13 @@ class Player(BaseModel):
             db: Database connection
             server_id: Server ID
             stat_type: Type of statistic to rank by (kills, deaths, kdr, etc.)
-            limit: Maximum number of players to return
+            limit: Maximum number of players to return (clamped to 1-100)
             
         Returns:
             List of player data dictionaries
+            
+        Raises:
+            ValueError: If stat_type is not a supported leaderboard statistic
         """
         # Define valid stat types and their sort direction
         valid_stats = {
@@ -1003,15 +922,34 @@ class Player(BaseModel):
         }
         
         if stat_type not in valid_stats:
-            stat_type = "kills"  # Default to kills
+            raise ValueError(f"Unsupported leaderboard statistic: {stat_type}")
+            
+        # Keep the sort bounded so a bad limit can't pull a whole server's players
+        limit = max(1, min(int(limit), 100))
             
         sort_direction = valid_stats[stat_type]
         
+        # Only fetch the fields the leaderboard entries are built from
+        projection = {
+            "player_id": 1,
+            "server_id": 1,
+            "name": 1,
+            "display_name": 1,
+            "kills": 1,
+            "deaths": 1,
+            "suicides": 1,
+            "headshots": 1,
+            "longest_shot": 1,
+            "highest_killstreak": 1,
+            "last_seen": 1
+        }
+        
         # KDR needs special handling
         if stat_type == "kdr":
             # For KDR, we need to aggregate and calculate it
             pipeline = [
                 {"$match": {"server_id": server_id}},
+                {"$project": projection},
                 {"$addFields": {
                     "kdr": {
                         "$cond": [
@@ -1027,9 +965,9 @@ class Player(BaseModel):
             
             cursor = db[cls.collection_name].aggregate(pipeline)
         else:
-            # For other stats, we can sort directly
+            # For other stats, sort directly using the (server_id, stat) index
             query = {"server_id": server_id}
-            cursor = db[cls.collection_name].find(query).sort(stat_type, sort_direction).limit(limit)
+            cursor = db[cls.collection_name].find(query, projection).sort(stat_type, sort_direction).limit(limit)
         
         # Collect results
         results = []
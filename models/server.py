@@ -3,14 +3,133 @@ Server model for Tower of Temptation PvP Statistics Bot
 
 This module defines the Server data structure for game servers.
 """
+import asyncio
+import copy
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional, ClassVar, List
+from typing import Dict, Any, Optional, ClassVar, List, Tuple
 
 from models.base_model import BaseModel
+from utils.server_lookup import (
+    extract_numeric_id,
+    find_server_document,
+    remap_fields,
+    SERVERS_COLLECTION_ALIASES,
+    GUILD_SERVER_ALIASES
+)
 
 logger = logging.getLogger(__name__)
 
+# Short-lived LRU cache of the documents behind get_by_id, keyed by (server_id, guild_id)
+SERVER_LOOKUP_CACHE_TTL = 30  # seconds
+SERVER_LOOKUP_CACHE_SIZE = 1024
+_server_lookup_cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# Backoff between attempts to reopen the server change stream, in seconds
+CHANGE_STREAM_RETRY_DELAY = 1.0
+CHANGE_STREAM_MAX_RETRY_DELAY = 60.0
+# OperationFailure codes meaning change streams can't be used on this
+# deployment: not a replica set (40573) or $changeStream unknown (40324)
+CHANGE_STREAM_UNSUPPORTED_CODES = frozenset((40573, 40324))
+# Codes meaning the resume token can no longer be used: InvalidResumeToken,
+# ChangeStreamFatalError and ChangeStreamHistoryLost
+CHANGE_STREAM_RESUME_FAILED_CODES = frozenset((260, 280, 286))
+
+def _invalidate_server_lookup_cache(server_id: Optional[str]) -> None:
+    """Drop all cached get_by_id results for a server
+
+    Args:
+        server_id: Server ID whose cached lookups should be removed
+    """
+    from utils.server_utils import standardize_server_id
+
+    standardized_server_id = standardize_server_id(server_id)
+    for cache_key in [key for key in _server_lookup_cache if key[0] == standardized_server_id]:
+        del _server_lookup_cache[cache_key]
+
+async def watch_server_changes(db) -> None:
+    """Keep the lookup cache and server_id_lower in step with writes
+
+    Watches the game_servers, servers and guilds collections so that writes
+    made outside the Server model (other processes, sync jobs, manual edits)
+    evict stale get_by_id results immediately instead of after the TTL, and
+    backfills server_id_lower on documents written without it.
+
+    Dropped connections and other server errors restart the stream after an
+    exponential backoff, resuming from the last event seen. Change streams
+    need a replica set; on a standalone server this logs a warning and
+    returns, leaving the TTL as the only expiry.
+
+    Args:
+        db: Database connection
+    """
+    from pymongo.errors import OperationFailure, PyMongoError
+
+    pipeline = [{"$match": {
+        "ns.coll": {"$in": ["game_servers", "servers", "guilds"]},
+        "operationType": {"$in": ["insert", "update", "replace", "delete"]}
+    }}]
+    resume_token = None
+    retry_delay = CHANGE_STREAM_RETRY_DELAY
+
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                logger.info("Watching server collections for cache invalidation")
+                async for change in stream:
+                    resume_token = change["_id"]
+                    retry_delay = CHANGE_STREAM_RETRY_DELAY
+                    collection = change["ns"]["coll"]
+                    document = change.get("fullDocument")
+
+                    if document is None:
+                        # Deletes carry only the _id, so the affected server is unknown
+                        _server_lookup_cache.clear()
+                        continue
+
+                    if collection == "guilds":
+                        guild_id = str(document.get("guild_id"))
+                        for cache_key in [key for key in _server_lookup_cache if key[1] == guild_id]:
+                            del _server_lookup_cache[cache_key]
+                        continue
+
+                    server_id = document.get("server_id")
+                    if server_id is None:
+                        continue
+                    _invalidate_server_lookup_cache(server_id)
+
+                    # Precompute the lowercase ID for writers that skipped it; the
+                    # follow-up update is a no-op on the next event so it cannot loop
+                    server_id_lower = str(server_id).lower()
+                    if document.get("server_id_lower") != server_id_lower:
+                        await db[collection].update_one(
+                            {"_id": document["_id"]},
+                            {"$set": {"server_id_lower": server_id_lower}}
+                        )
+
+            # The server closed the stream (e.g. an invalidate event), so
+            # its resume token can't be used to pick up where it stopped
+            resume_token = None
+            logger.warning(f"Server change stream closed, reopening in {retry_delay:.0f}s")
+        except OperationFailure as e:
+            if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                logger.warning(f"Change streams unavailable, relying on cache TTL: {e}")
+                return
+            if e.code in CHANGE_STREAM_RESUME_FAILED_CODES:
+                resume_token = None
+            logger.warning(f"Server change stream failed, retrying in {retry_delay:.0f}s: {e}")
+        except PyMongoError as e:
+            # ConnectionFailure, NetworkTimeout and the like
+            logger.warning(f"Server change stream interrupted, retrying in {retry_delay:.0f}s: {e}")
+
+        if resume_token is None:
+            # Events may be missed before the new stream opens
+            _server_lookup_cache.clear()
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, CHANGE_STREAM_MAX_RETRY_DELAY)
+
 class Server(BaseModel):
     """Game server data"""
     collection_name: ClassVar[Optional[str]] = "game_servers"
@@ -76,6 +195,19 @@ class Server(BaseModel):
             if not hasattr(self, key):
                 setattr(self, key, value)
 
+    def to_document(self) -> Dict[str, Any]:
+        """Convert server to a MongoDB document
+
+        Adds the lowercased server_id used for indexed case-insensitive lookups.
+
+        Returns:
+            MongoDB document
+        """
+        document = super().to_document()
+        if self.server_id is not None:
+            document["server_id_lower"] = str(self.server_id).lower()
+        return document
+
     @classmethod
     async def get_by_server_id(cls, db, server_id: str) -> Optional['Server']:
         """Get a server by server_id
@@ -154,6 +286,10 @@ class Server(BaseModel):
         except Exception as e:
             logger.error(f"Error saving server {self.server_id}: {e}")
             return False
+        finally:
+            # Evict only once the writes have landed, so a concurrent lookup
+            # cannot re-cache the old document in between
+            _invalidate_server_lookup_cache(self.server_id)
 
     @classmethod
     async def get_by_id(cls, db, server_id: str, guild_id: Optional[str] = None) -> Optional['Server']:
@@ -178,111 +314,27 @@ class Server(BaseModel):
             logger.warning(f"Invalid server_id format: {server_id}")
             return None
 
-        # Build the query with standardized server ID
-        query = {"server_id": standardized_server_id}
-        if guild_id is not None:
-            # Ensure consistent string comparison for guild ID too
-            query["guild_id"] = str(guild_id)
-
-        # First try exact match
-        document = await db.game_servers.find_one(query)
+        # Serve recent lookups from the cache
+        cache_key = (standardized_server_id, str(guild_id) if guild_id is not None else None)
+        cached = _server_lookup_cache.get(cache_key)
+        if cached is not None:
+            expires_at, cached_document = cached
+            if time.monotonic() < expires_at:
+                _server_lookup_cache.move_to_end(cache_key)
+                # Build a fresh Server per hit so callers can't mutate each other's copy
+                return cls.from_document(copy.deepcopy(cached_document))
+            del _server_lookup_cache[cache_key]
 
-        # If no results, try case-insensitive search
-        if document is None:
-            logger.debug(f"No exact match for server_id: {standardized_server_id}, trying case-insensitive search")
-            # Create a new case-insensitive search query
-            # MongoDB regex pattern for case-insensitive matching
-            regex_query = query.copy()
-            # We need to modify the dictionary as a whole to avoid type issues
-            new_query = {
-                **regex_query,
-                "server_id": {"$regex": f"^{standardized_server_id}$", "$options": "i"}
-            }
-            document = await db.game_servers.find_one(new_query)
+        # Probe game_servers, servers and guild.servers for the document
+        document = await find_server_document(db, standardized_server_id, guild_id)
 
-        # If still not found, check servers collection (where CSV data is stored)    
         if document is None:
-            logger.debug(f"Server not found in game_servers, checking servers collection")
-
-            # Try exact match in servers collection
-            server_query = {"server_id": standardized_server_id}
-            if guild_id is not None:
-                server_query["guild_id"] = str(guild_id)
-
-            document = await db.servers.find_one(server_query)
-
-            # Try with regex if needed
-            if document is None:
-                regex_server_query = {
-                    **server_query,
-                    "server_id": {"$regex": f"^{standardized_server_id}$", "$options": "i"}
-                }
-                document = await db.servers.find_one(regex_server_query)
-
-            # If document is found, map it to format expected by from_document
-            if document is not None:
-                logger.info(f"Found server {standardized_server_id} in servers collection")
-                # Extract original server ID for path construction if available
-                original_server_id = document.get("original_server_id")
-
-                # Convert to expected format
-                document = {
-                    "server_id": document.get("server_id"),
-                    "guild_id": document.get("guild_id"),
-                    "name": document.get("name", "Unknown Server"),
-                    "sftp_host": document.get("hostname") or document.get("sftp_host"),
-                    "sftp_port": document.get("port") or document.get("sftp_port", 22),
-                    "sftp_username": document.get("username") or document.get("sftp_username"),
-                    "sftp_password": document.get("password") or document.get("sftp_password"),
-                    "log_path": document.get("log_path") or document.get("sftp_path", ""),
-                    "original_server_id": original_server_id,
-                    "_id": document.get("_id")
-                }
-
-        # If still no results and guild_id is provided, look in the guild's servers list as fallback
-        if not document and guild_id is not None:
-            logger.debug(f"Server not found in game_servers or servers, checking guild's server list")
-            guild_doc = await db.guilds.find_one({"guild_id": str(guild_id)})
-
-            if guild_doc is not None and "servers" in guild_doc:
-                for server in guild_doc.get("servers", []):
-                    # Standardize server ID from guild.servers for comparison
-                    server_id_in_guild = standardize_server_id(server.get("server_id"))
-
-                    # Check if server IDs match after standardization
-                    if server_id_in_guild == standardized_server_id:
-                        # Found server in guild.servers, create a server document
-                        logger.info(f"Found server {standardized_server_id} in guild.servers but not in game_servers")
-                        # Extract the original numeric server ID for path construction
-                        original_server_id = server.get("original_server_id")
+            return None
 
-                        # If original_server_id is not found, try to extract it from server_id
-                        if original_server_id is None:
-                            # Check if server_id contains numeric segment that could be original ID
-                            if server.get("server_id") and any(char.isdigit() for char in server.get("server_id", "")):
-                                # Extract numeric part of server ID as fallback for original ID
-                                numeric_parts = ''.join(filter(str.isdigit, server.get("server_id", "")))
-                                if numeric_parts:
-                                    original_server_id = numeric_parts
-                                    logger.info(f"Extracted fallback original_server_id {original_server_id} from server_id {server.get('server_id')}")
-
-                        server_doc = {
-                            "server_id": standardized_server_id,
-                            "guild_id": str(guild_id),
-                            "name": server.get("server_name", "Unknown Server"),
-                            "sftp_host": server.get("sftp_host"),
-                            "sftp_port": server.get("sftp_port"),
-                            "sftp_username": server.get("sftp_username"),
-                            "sftp_password": server.get("sftp_password"),
-                            "log_path": server.get("log_path", ""),
-                            "original_server_id": original_server_id,  # Include original numeric server ID
-                            "created_at": datetime.utcnow(),
-                            "updated_at": datetime.utcnow()
-                        }
-                        document = server_doc
-                        break
-
-        return cls.from_document(document) if document is not None else None
+        _server_lookup_cache[cache_key] = (time.monotonic() + SERVER_LOOKUP_CACHE_TTL, copy.deepcopy(document))
+        if len(_server_lookup_cache) > SERVER_LOOKUP_CACHE_SIZE:
+            _server_lookup_cache.popitem(last=False)
+        return cls.from_document(document)
 
     @classmethod
     async def get_by_name(cls, db, name: str, guild_id: str) -> Optional['Server']:
@@ -317,11 +369,7 @@ class Server(BaseModel):
                     "server_id": document.get("server_id"),
                     "guild_id": document.get("guild_id"),
                     "name": document.get("name"),
-                    "sftp_host": document.get("hostname") or document.get("sftp_host"),
-                    "sftp_port": document.get("port") or document.get("sftp_port", 22),
-                    "sftp_username": document.get("username") or document.get("sftp_username"),
-                    "sftp_password": document.get("password") or document.get("sftp_password"),
-                    "log_path": document.get("log_path") or document.get("sftp_path", ""),
+                    **remap_fields(document, SERVERS_COLLECTION_ALIASES),
                     "original_server_id": original_server_id,
                     "_id": document.get("_id")
                 }
@@ -342,24 +390,19 @@ class Server(BaseModel):
                         original_server_id = server_data.get("original_server_id")
 
                         # If original_server_id is not found, try to extract it
-                        if original_server_id is None and server_data.get("server_id"):
-                            numeric_parts = ''.join(filter(str.isdigit, server_data.get("server_id", "")))
-                            if numeric_parts:
-                                original_server_id = numeric_parts
+                        if original_server_id is None:
+                            original_server_id = extract_numeric_id(server_data.get("server_id"))
 
                         # Create a document
+                        now = datetime.utcnow()
                         document = {
                             "server_id": server_data.get("server_id"),
                             "guild_id": guild_id_str,
                             "name": server_name,
-                            "sftp_host": server_data.get("sftp_host") or server_data.get("hostname"),
-                            "sftp_port": server_data.get("sftp_port") or server_data.get("port", 22),
-                            "sftp_username": server_data.get("sftp_username") or server_data.get("username"),
-                            "sftp_password": server_data.get("sftp_password") or server_data.get("password"),
-                            "log_path": server_data.get("log_path") or server_data.get("sftp_path", ""),
+                            **remap_fields(server_data, GUILD_SERVER_ALIASES),
                             "original_server_id": original_server_id,
-                            "created_at": datetime.utcnow(),
-                            "updated_at": datetime.utcnow()
+                            "created_at": now,
+                            "updated_at": now
                         }
                         break  # Stop after finding the first match
 
@@ -408,11 +451,7 @@ class Server(BaseModel):
                     "server_id": server_id,
                     "guild_id": document.get("guild_id"),
                     "name": document.get("name", "Unknown Server"),
-                    "sftp_host": document.get("hostname") or document.get("sftp_host"),
-                    "sftp_port": document.get("port") or document.get("sftp_port", 22),
-                    "sftp_username": document.get("username") or document.get("sftp_username"),
-                    "sftp_password": document.get("password") or document.get("sftp_password"),
-                    "log_path": document.get("log_path") or document.get("sftp_path", ""),
+                    **remap_fields(document, SERVERS_COLLECTION_ALIASES),
                     "original_server_id": document.get("original_server_id"),
                     "_id": document.get("_id")
                 }
@@ -431,6 +470,8 @@ class Server(BaseModel):
                 guild_doc = await db.guilds.find_one({"guild_id": guild_id_str})
 
                 if guild_doc is not None and "servers" in guild_doc:
+                    # One timestamp for every server document built below
+                    now = datetime.utcnow()
                     for server_data in guild_doc.get("servers", []):
                         server_id = server_data.get("server_id")
                         if server_id in seen_ids:
@@ -440,24 +481,17 @@ class Server(BaseModel):
                         original_server_id = server_data.get("original_server_id")
 
                         # If original_server_id is not found, try to extract it
-                        if original_server_id is None and server_data.get("server_id"):
-                            # Check if server_id contains numeric segment
-                            numeric_parts = ''.join(filter(str.isdigit, server_data.get("server_id", "")))
-                            if numeric_parts:
-                                original_server_id = numeric_parts
+                        if original_server_id is None:
+                            original_server_id = extract_numeric_id(server_data.get("server_id"))
 
                         formatted_doc = {
                             "server_id": server_id,
                             "guild_id": guild_id_str,
                             "name": server_data.get("server_name", "Unknown Server"),
-                            "sftp_host": server_data.get("sftp_host") or server_data.get("hostname"),
-                            "sftp_port": server_data.get("sftp_port") or server_data.get("port", 22),
-                            "sftp_username": server_data.get("sftp_username") or server_data.get("username"),
-                            "sftp_password": server_data.get("sftp_password") or server_data.get("password"),
-                            "log_path": server_data.get("log_path") or server_data.get("sftp_path", ""),
+                            **remap_fields(server_data, GUILD_SERVER_ALIASES),
                             "original_server_id": original_server_id,
-                            "created_at": datetime.utcnow(),
-                            "updated_at": datetime.utcnow()
+                            "created_at": now,
+                            "updated_at": now
                         }
 
                         server = cls.from_document(formatted_doc)
@@ -502,11 +536,7 @@ class Server(BaseModel):
                     "server_id": document.get("server_id"),
                     "guild_id": document.get("guild_id"),
                     "name": document.get("name", "Unknown Server"),
-                    "sftp_host": document.get("hostname") or document.get("sftp_host"),
-                    "sftp_port": document.get("port") or document.get("sftp_port", 22),
-                    "sftp_username": document.get("username") or document.get("sftp_username"),
-                    "sftp_password": document.get("password") or document.get("sftp_password"),
-                    "log_path": document.get("log_path") or document.get("sftp_path", ""),
+                    **remap_fields(document, SERVERS_COLLECTION_ALIASES),
                     "original_server_id": original_server_id,
                     "_id": document.get("_id")
                 }
@@ -524,24 +554,18 @@ class Server(BaseModel):
                 original_server_id = server_data.get("original_server_id")
 
                 # If original_server_id is not found, try to extract it from server_id
-                if original_server_id is None and server_data.get("server_id"):
-                    # Check if server_id contains numeric segment that could be original ID
-                    numeric_parts = ''.join(filter(str.isdigit, server_data.get("server_id", "")))
-                    if numeric_parts:
-                        original_server_id = numeric_parts
+                if original_server_id is None:
+                    original_server_id = extract_numeric_id(server_data.get("server_id"))
 
+                now = datetime.utcnow()
                 document = {
                     "server_id": server_data.get("server_id"),
                     "guild_id": guild_id_str,
                     "name": server_data.get("server_name", "Unknown Server"),
-                    "sftp_host": server_data.get("sftp_host") or server_data.get("hostname"),
-                    "sftp_port": server_data.get("sftp_port") or server_data.get("port", 22),
-                    "sftp_username": server_data.get("sftp_username") or server_data.get("username"),
-                    "sftp_password": server_data.get("sftp_password") or server_data.get("password"),
-                    "log_path": server_data.get("log_path") or server_data.get("sftp_path", ""),
+                    **remap_fields(server_data, GUILD_SERVER_ALIASES),
                     "original_server_id": original_server_id,
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
+                    "created_at": now,
+                    "updated_at": now
                 }
 
         return cls.from_document(document) if document is not None else None
@@ -561,8 +585,7 @@ class Server(BaseModel):
             return False
 
         self.status = status
-        self.last_checked = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.last_checked = self.updated_at = datetime.utcnow()
 
         if error_message is not None and status == self.STATUS_ERROR:
             self.last_error = error_message
@@ -581,6 +604,7 @@ class Server(BaseModel):
             {"server_id": self.server_id},
             {"$set": update_dict}
         )
+        _invalidate_server_lookup_cache(self.server_id)
 
         return result.modified_count > 0
 
@@ -626,6 +650,7 @@ class Server(BaseModel):
                 "updated_at": self.updated_at
             }}
         )
+        _invalidate_server_lookup_cache(self.server_id)
 
         return result.modified_count > 0
 
@@ -650,6 +675,7 @@ class Server(BaseModel):
                 "updated_at": self.updated_at
             }}
         )
+        _invalidate_server_lookup_cache(self.server_id)
 
         return result.modified_count > 0
 
@@ -677,6 +703,7 @@ class Server(BaseModel):
             {"server_id": self.server_id},
             {"$set": update_data}
         )
+        _invalidate_server_lookup_cache(self.server_id)
 
         return result.modified_count > 0
 
@@ -755,7 +782,7 @@ class Server(BaseModel):
         # If westill don't have a numeric ID, create one from last 4 digits of UUID
         if original_server_id is None:
             # Extract the last 4-5 digits of the UUID as a fallback numeric ID
-            uuid_digits = ''.join(filter(str.isdigit, server_id))
+            uuid_digits = extract_numeric_id(server_id) or ""
             original_server_id = uuid_digits[-5:] if len(uuid_digits) >= 5 else uuid_digits
             logger.warning(f"No numeric ID found, using extracted digits from UUID: {original_server_id}")
 
@@ -975,13 +1002,14 @@ class Server(BaseModel):
                             )
 
                             # Mark any remaining integration references as inactive
+                            now = datetime.utcnow()
                             await db.server_integrations.update_many(
                                 {"server_id": str_server_id},
                                 {
                                     "$set": {
                                         "status": "inactive",
-                                        "updated_at": datetime.utcnow(),
-                                        "deactivated_at": datetime.utcnow()
+                                        "updated_at": now,
+                                        "deactivated_at": now
                                     }
                                 },
                                 session=session
@@ -1047,6 +1075,8 @@ class Server(BaseModel):
         except Exception as e:
             logger.error(f"Error in coordinated deletion of server {self.server_id}: {e}")
             return False
+        finally:
+            _invalidate_server_lookup_cache(self.server_id)
 
     async def get_active_player_count(self) -> int:
         """Get count of active players on server
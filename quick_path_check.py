@@ -24,6 +24,27 @@ logger = logging.getLogger(__name__)
 
 # Import our components
 from utils.sftp import SFTPManager, get_sftp_client
+from utils.async_utils import semaphore_gather
+
+# Directory probes kept in flight at once over the SFTP connection
+MAX_CONCURRENT_PROBES = 8
+
+async def probe_directories(sftp, paths):
+    """Check which of several paths are directories, probing them concurrently
+
+    Args:
+        sftp: Connected SFTP manager
+        paths: Paths to check
+
+    Returns:
+        List of booleans in the same order as paths; a failed probe counts as False
+    """
+    results = await semaphore_gather(
+        asyncio.Semaphore(MAX_CONCURRENT_PROBES),
+        [sftp.directory_exists(path) for path in paths]
+    )
+    # semaphore_gather returns exceptions in place of results
+    return [result is True for result in results]
 
 async def explore_directory(sftp, path, depth=0, max_depth=3):
     """Recursively explore directories to find CSVs, limiting depth to avoid hangs"""
@@ -44,19 +65,16 @@ async def explore_directory(sftp, path, depth=0, max_depth=3):
                 logger.info(f"{'  ' * depth}... and {len(csv_files) - 5} more")
         
         # Recursively explore subdirectories, focusing on likely candidates
+        entry_paths = [
+            (entry, os.path.join(path, entry))
+            for entry in entries
+            if not entry.startswith('.')
+        ]
+        is_dirs = await probe_directories(sftp, [entry_path for _, entry_path in entry_paths])
+        
         dirs_to_explore = []
-        for entry in entries:
-            if entry.startswith('.'):
-                continue
-                
+        for (entry, entry_path), is_dir in zip(entry_paths, is_dirs):
             # Prioritize directories that might contain maps or logs
-            entry_path = os.path.join(path, entry)
-            is_dir = False
-            try:
-                is_dir = await sftp.directory_exists(entry_path)
-            except:
-                continue
-                
             if is_dir:
                 # Check if it's a likely candidate for containing CSVs
                 lower_entry = entry.lower()
@@ -123,8 +141,8 @@ async def main():
             "/server"
         ]
         
-        for path in common_paths:
-            if await sftp.directory_exists(path):
+        for path, is_dir in zip(common_paths, await probe_directories(sftp, common_paths)):
+            if is_dir:
                 await explore_directory(sftp, path)
                 
         logger.info("Path exploration complete!")
@@ -65,15 +65,14 @@ def setup_logging():
     # Add asyncssh logging configuration
     if "logging.getLogger('asyncssh')" not in content:
         # Add configuration if not already present
-        insert_point = "    logging.getLogger('asyncio').setLevel(logging.WARNING)"
-        insert_content = insert_point + """
+        head, insert_point, tail = content.partition("    logging.getLogger('asyncio').setLevel(logging.WARNING)")
+        if insert_point:
+            content = head + insert_point + """
     
     # NEW: Reduce spammy connection logs from AsyncSSH
     logging.getLogger('asyncssh').setLevel(logging.WARNING)
     # Only show warnings and errors from the SFTP client
-    logging.getLogger('asyncssh.sftp').setLevel(logging.WARNING)"""
-        
-        content = content.replace(insert_point, insert_content)
+    logging.getLogger('asyncssh.sftp').setLevel(logging.WARNING)""" + tail
     else:
         print("AsyncSSH logging configuration already exists in setup file")
     
@@ -96,25 +95,22 @@ def setup_logging():
         
     # Add import statement if not present
     if "from utils.logging_setup import setup_logging" not in bot_content:
-        import_pattern = "import logging\n"
-        import_replacement = "import logging\nfrom utils.logging_setup import setup_logging\n"
-        
-        bot_content = bot_content.replace(import_pattern, import_replacement)
+        head, import_pattern, tail = bot_content.partition("import logging\n")
+        if import_pattern:
+            bot_content = head + import_pattern + "from utils.logging_setup import setup_logging\n" + tail
         
     # Add function call if not present
     if "setup_logging()" not in bot_content:
-        # Find the main entry point
-        if "if __name__ == '__main__':" in bot_content:
+        # Find the main entry point, scanning for it only once
+        head, main_pattern, tail = bot_content.partition("if __name__ == '__main__':")
+        if main_pattern:
             # Add to the beginning of main
-            main_pattern = "if __name__ == '__main__':"
-            main_replacement = "if __name__ == '__main__':\n    # Set up custom logging configuration\n    setup_logging()"
-            
-            bot_content = bot_content.replace(main_pattern, main_replacement)
+            bot_content = head + main_pattern + "\n    # Set up custom logging configuration\n    setup_logging()" + tail
         else:
             # Try to insert after imports
             try:
-                import_section = re.search(r"(^import .*?\n\n)|(^from .*?\n\n)", bot_content, re.MULTILINE | re.DOTALL).group()
-                bot_content = bot_content.replace(import_section, import_section + "# Set up custom logging configuration\nsetup_logging()\n\n")
+                import_end = re.search(r"(^import .*?\n\n)|(^from .*?\n\n)", bot_content, re.MULTILINE | re.DOTALL).end()
+                bot_content = bot_content[:import_end] + "# Set up custom logging configuration\nsetup_logging()\n\n" + bot_content[import_end:]
             except AttributeError:
                 # Fall back to beginning of file
                 bot_content = "# Set up custom logging configuration\nsetup_logging()\n\n" + bot_content
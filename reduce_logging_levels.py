@@ -9,127 +9,302 @@ import re
 import os
 import sys
 import glob
+import hashlib
+import json
+import mmap
+import tempfile
 
-def reduce_log_levels(file_path):
+# Files larger than this only have their logger.info lines run through the
+# replacement patterns instead of the whole content
+LARGE_FILE_THRESHOLD = 65536
+
+# Every replacement pattern starts with an f-string logger.info call, so a
+# file without one can be skipped without running any of the patterns
+INFO_CALL_PATTERN = re.compile(r'logger\.info\(')
+REPLACEABLE_CALL_PATTERN = re.compile(r'logger\.info\(f"')
+
+# Common replacements for all modules
+COMMON_REPLACEMENTS = [
+    # Debug and status information
+    (r'logger\.info\(f"Memory optimization: freed (\{.*?\}) objects after (.*?)"\)', r'logger.debug(f"Memory optimization: freed \1 objects after \2")'),
+    (r'logger\.info\(f"Processing (.*?) for (\{.*?\}) servers"\)', r'logger.debug(f"Processing \1 for \2 servers")'),
+    (r'logger\.info\(f"Found (\{.*?\}) (.*?) in (.*?) collection"\)', r'logger.debug(f"Found \1 \2 in \3 collection")'),
+
+    # File processing details
+    (r'logger\.info\(f"Downloaded content type: (\{.*?\}), length: (\{.*?\})"\)', r'logger.debug(f"Downloaded content type: \1, length: \2")'),
+    (r'logger\.info\(f"Found (\{.*?\}) (.*?) files in (.*?)"\)', r'logger.debug(f"Found \1 \2 files in \3")'),
+    (r'logger\.info\(f"Using detected delimiter: \'(.*?)\' for file (.*?)"\)', r'logger.debug(f"Using detected delimiter: \'\1\' for file \2")'),
+
+    # SFTP and file operations
+    (r'logger\.info\(f"Using original server ID \'(.*?)\' for path construction"\)', r'logger.debug(f"Using original server ID \'\1\' for path construction")'),
+    (r'logger\.info\(f"Using numeric original_server_id \'(.*?)\' for path construction"\)', r'logger.debug(f"Using numeric original_server_id \'\1\' for path construction")'),
+    (r'logger\.info\(f"Detected AsyncSSH SFTP client, using optimized methods"\)', r'logger.debug(f"Detected AsyncSSH SFTP client, using optimized methods")'),
+    (r'logger\.info\(f"Downloaded (.*?) using AsyncSSH open\+read \((\{.*?\}) bytes\)"\)', r'logger.debug(f"Downloaded \1 using AsyncSSH open+read (\2 bytes)")'),
+    (r'logger\.info\(f"Downloaded (\{.*?\}) bytes from file (.*?)"\)', r'logger.debug(f"Downloaded \1 bytes from file \2")'),
+
+    # Server and configuration details
+    (r'logger\.info\(f"Server in \'(.*?)\': ID=(.*?), sftp_enabled=(.*?), name=(.*?)"\)', r'logger.debug(f"Server in \'\1\': ID=\2, sftp_enabled=\3, name=\4")'),
+    (r'logger\.info\(f"Looking for (.*?) in path: (.*?)"\)', r'logger.debug(f"Looking for \1 in path: \2")'),
+    (r'logger\.info\(f"Found (.*?) at: (.*?)"\)', r'logger.debug(f"Found \1 at: \2")'),
+]
+
+# Module-specific replacements
+MODULE_SPECIFIC_REPLACEMENTS = {
+    "csv_processor.py": [
+        # CSV processor specific logs
+        (r'logger\.info\(f"Using batch processing for (\{.*?\}) events"\)', r'logger.debug(f"Using batch processing for \1 events")'),
+        (r'logger\.info\(f"Categorized events: (\{.*?\}) kills, (\{.*?\}) suicides"\)', r'logger.debug(f"Categorized events: \1 kills, \2 suicides")'),
+        (r'logger\.info\(f"Updating stats for (\{.*?\}) unique players"\)', r'logger.debug(f"Updating stats for \1 unique players")'),
+        (r'logger\.info\(f"Updating nemesis/prey relationships"\)', r'logger.debug(f"Updating nemesis/prey relationships")'),
+        (r'logger\.info\(f"CSV content sample: (.*?)"\)', r'logger.debug(f"CSV content sample: \1")'),
+        (r'logger\.info\(f"Added (\{.*?\}) CSV files from (.*?) to tracking lists"\)', r'logger.debug(f"Added \1 CSV files from \2 to tracking lists")'),
+        (r'logger\.info\(f"Total tracked (.*?) files now: (\{.*?\})"\)', r'logger.debug(f"Total tracked \1 files now: \2")'),
+    ],
+    "log_processor.py": [
+        # Log processor specific logs
+        (r'logger\.info\(f"Final path_server_id: (.*?)"\)', r'logger.debug(f"Final path_server_id: \1")'),
+        (r'logger\.info\(f"Building server directory with resolved server ID: (.*?)"\)', r'logger.debug(f"Building server directory with resolved server ID: \1")'),
+        (r'logger\.info\(f"Using default directory structure with ID (.*?): (.*?)"\)', r'logger.debug(f"Using default directory structure with ID \1: \2")'),
+        (r'logger\.info\(f"Getting stats for log file: (.*?)"\)', r'logger.debug(f"Getting stats for log file: \1")'),
+    ],
+    "sftp.py": [
+        # SFTP manager specific logs
+        (r'logger\.info\(f"SFTPClient using known numeric ID \'(.*?)\' for path construction instead of \'(.*?)\'"\)', r'logger.debug(f"SFTPClient using known numeric ID \'\1\' for path construction instead of \'\2\'")'),
+        (r'logger\.info\(f"Using original server ID \'(.*?)\' for path construction instead of standardized ID \'(.*?)\'"\)', r'logger.debug(f"Using original server ID \'\1\' for path construction instead of standardized ID \'\2\'")'),
+        (r'logger\.info\(f"Found (.*?) at: (.*?)"\)', r'logger.debug(f"Found \1 at: \2")'),
+        (r'logger\.info\(f"Total (.*?) files found after deduplication: (\{.*?\}) \(from (\{.*?\}) total\)"\)', r'logger.debug(f"Total \1 files found after deduplication: \2 (from \3 total)")'),
+    ],
+    "direct_csv_handler.py": [
+        # Direct CSV handler specific logs
+        (r'logger\.info\(f"Direct parsing CSV content from file: (.*?)"\)', r'logger.debug(f"Direct parsing CSV content from file: \1")'),
+        (r'logger\.info\(f"Using delimiter \'(.*?)\' for content parsing \((.*?)\)"\)', r'logger.debug(f"Using delimiter \'\1\' for content parsing (\2)")'),
+        (r'logger\.info\(f"Directly parsed (\{.*?\}) events from (\{.*?\}) rows in CSV content"\)', r'logger.debug(f"Directly parsed \1 events from \2 rows in CSV content")'),
+    ],
+    "csv_parser.py": [
+        # CSV parser specific logs
+        (r'logger\.info\(f"Parsing CSV file: (.*?)"\)', r'logger.debug(f"Parsing CSV file: \1")'),
+        (r'logger\.info\(f"Detected delimiter: \'(.*?)\' \((.*?)\)"\)', r'logger.debug(f"Detected delimiter: \'\1\' (\2)")'),
+        (r'logger\.info\(f"Parsed (\{.*?\}) events from (\{.*?\}) rows in (.*?)"\)', r'logger.debug(f"Parsed \1 events from \2 rows in \3")'),
+    ],
+}
+
+def prune_replacements(replacements, already_applied=()):
+    """
+    Drop replacement entries that can never change anything.
+    
+    Identity substitutions, duplicates (including ones already covered by
+    the common list) and patterns that fail to compile are removed once at
+    load time so the per-file loop never scans for them.
+    
+    Args:
+        replacements: List of (pattern, replacement) tuples
+        already_applied: Entries that will have run before these ones
+        
+    Returns:
+        The pruned list of (pattern, replacement) tuples
+    """
+    seen = set(already_applied)
+    pruned = []
+    for pattern, replacement in replacements:
+        if pattern == replacement or (pattern, replacement) in seen:
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            print(f"Warning: skipping malformed pattern {pattern!r}: {e}")
+            continue
+        seen.add((pattern, replacement))
+        pruned.append((pattern, replacement))
+    return pruned
+
+COMMON_REPLACEMENTS = prune_replacements(COMMON_REPLACEMENTS)
+MODULE_SPECIFIC_REPLACEMENTS = {
+    filename: prune_replacements(replacements, COMMON_REPLACEMENTS)
+    for filename, replacements in MODULE_SPECIFIC_REPLACEMENTS.items()
+}
+
+# Digests of each file as this script last left it, so unchanged files are
+# skipped on the next run. The cache is discarded whenever the replacement
+# tables change, since files could then need new substitutions. It lives in
+# the git-ignored .cache directory rather than the repository root
+DIGEST_CACHE_FILE = os.path.join(".cache", "reduce_logging_levels.json")
+RULES_DIGEST = hashlib.blake2b(
+    repr((COMMON_REPLACEMENTS, sorted(MODULE_SPECIFIC_REPLACEMENTS.items()))).encode('utf-8'),
+    digest_size=16
+).hexdigest()
+
+def file_digest(data):
+    """Digest of a file's raw bytes, used to detect unchanged files"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def load_digest_cache():
+    """
+    Load the digests recorded by the previous run.
+    
+    Returns:
+        Dict of file path to digest, empty if there is no usable cache
+    """
+    try:
+        with open(DIGEST_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("rules") != RULES_DIGEST:
+        return {}
+    return cache.get("files", {})
+
+def save_digest_cache(digests):
+    """Record the digests of the files as this run left them"""
+    os.makedirs(os.path.dirname(DIGEST_CACHE_FILE), exist_ok=True)
+    with open(DIGEST_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({"rules": RULES_DIGEST, "files": digests}, f)
+
+def apply_replacements(content, replacements):
+    """
+    Apply a list of (pattern, replacement) pairs to the content.
+    
+    All patterns match within a single logger.info line, so for large files
+    only the candidate lines are handed to the regex engine.
+    
+    Args:
+        content: File content to modify
+        replacements: List of (pattern, replacement) tuples
+        
+    Returns:
+        Tuple of (modified content, number of substitutions made)
+    """
+    total = 0
+    if len(content) <= LARGE_FILE_THRESHOLD:
+        for pattern, replacement in replacements:
+            content, count = re.subn(pattern, replacement, content)
+            total += count
+        return content, total
+    
+    lines = content.split('\n')
+    for i, line in enumerate(lines):
+        if 'logger.info(f"' not in line:
+            continue
+        for pattern, replacement in replacements:
+            line, count = re.subn(pattern, replacement, line)
+            total += count
+        lines[i] = line
+    return '\n'.join(lines), total
+
+def atomic_write(file_path, content):
+    """
+    Replace a file's content so it is never left half-written.
+    
+    The content is written and fsynced to a temporary file in the same
+    directory, which is then renamed over the original in one step.
+    
+    Args:
+        file_path: Path to the file to replace
+        content: New text content of the file
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file owner-only; keep the original's permissions
+        os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def reduce_log_levels(file_path, digests=None):
     """
     Reduce logging levels from INFO to DEBUG in the specified file.
     
     Args:
         file_path: Path to the file to modify
+        digests: Optional dict of file path to digest from the previous run.
+            Files whose digest matches are skipped, and the dict is updated
+            with the digest of the file as this run leaves it
+        
+    Returns:
+        Number of logger.info calls that were changed
     """
     print(f"Processing {file_path}...")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if os.path.getsize(file_path) > LARGE_FILE_THRESHOLD:
+            # Check large files through a read-only mapping so files without
+            # any logger.info calls are never copied into memory or decoded
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest = file_digest(mm)
+                    if digests is not None and digests.get(file_path) == digest:
+                        print(f"  Unchanged since last run, skipping file")
+                        return 0
+                    if mm.find(b'logger.info(') == -1:
+                        print(f"  No INFO logs found, skipping file")
+                        if digests is not None:
+                            digests[file_path] = digest
+                        return 0
+                    content = mm[:].decode('utf-8')
+        else:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            digest = file_digest(raw)
+            if digests is not None and digests.get(file_path) == digest:
+                print(f"  Unchanged since last run, skipping file")
+                return 0
+            content = raw.decode('utf-8')
     except UnicodeDecodeError:
         print(f"  Skipping binary or non-UTF-8 file: {file_path}")
-        return
+        return 0
     except Exception as e:
         print(f"  Error reading file {file_path}: {e}")
-        return
+        return 0
+    
+    # Whatever happens below, remember how this run left the file
+    if digests is not None:
+        digests[file_path] = digest
     
     # Count original logger.info calls
-    info_count = len(re.findall(r'logger\.info\(', content))
+    info_count = len(INFO_CALL_PATTERN.findall(content))
     if info_count == 0:
         print(f"  No INFO logs found, skipping file")
-        return
+        return 0
     
     print(f"  Found {info_count} INFO log statements")
     
-    # Common replacements for all modules
-    common_replacements = [
-        # Debug and status information
-        (r'logger\.info\(f"Memory optimization: freed (\{.*?\}) objects after (.*?)"\)', r'logger.debug(f"Memory optimization: freed \1 objects after \2")'),
-        (r'logger\.info\(f"Processing (.*?) for (\{.*?\}) servers"\)', r'logger.debug(f"Processing \1 for \2 servers")'),
-        (r'logger\.info\(f"Found (\{.*?\}) (.*?) in (.*?) collection"\)', r'logger.debug(f"Found \1 \2 in \3 collection")'),
-        
-        # File processing details
-        (r'logger\.info\(f"Downloaded content type: (\{.*?\}), length: (\{.*?\})"\)', r'logger.debug(f"Downloaded content type: \1, length: \2")'),
-        (r'logger\.info\(f"Found (\{.*?\}) (.*?) files in (.*?)"\)', r'logger.debug(f"Found \1 \2 files in \3")'),
-        (r'logger\.info\(f"Using detected delimiter: \'(.*?)\' for file (.*?)"\)', r'logger.debug(f"Using detected delimiter: \'\1\' for file \2")'),
-        
-        # SFTP and file operations
-        (r'logger\.info\(f"Using original server ID \'(.*?)\' for path construction"\)', r'logger.debug(f"Using original server ID \'\1\' for path construction")'),
-        (r'logger\.info\(f"Using numeric original_server_id \'(.*?)\' for path construction"\)', r'logger.debug(f"Using numeric original_server_id \'\1\' for path construction")'),
-        (r'logger\.info\(f"Detected AsyncSSH SFTP client, using optimized methods"\)', r'logger.debug(f"Detected AsyncSSH SFTP client, using optimized methods")'),
-        (r'logger\.info\(f"Downloaded (.*?) using AsyncSSH open\+read \((\{.*?\}) bytes\)"\)', r'logger.debug(f"Downloaded \1 using AsyncSSH open+read (\2 bytes)")'),
-        (r'logger\.info\(f"Downloaded (\{.*?\}) bytes from file (.*?)"\)', r'logger.debug(f"Downloaded \1 bytes from file \2")'),
-        
-        # Server and configuration details
-        (r'logger\.info\(f"Server in \'(.*?)\': ID=(.*?), sftp_enabled=(.*?), name=(.*?)"\)', r'logger.debug(f"Server in \'\1\': ID=\2, sftp_enabled=\3, name=\4")'),
-        (r'logger\.info\(f"Looking for (.*?) in path: (.*?)"\)', r'logger.debug(f"Looking for \1 in path: \2")'),
-        (r'logger\.info\(f"Found (.*?) at: (.*?)"\)', r'logger.debug(f"Found \1 at: \2")'),
-    ]
-    
-    # Module-specific replacements
-    module_specific_replacements = {
-        "csv_processor.py": [
-            # CSV processor specific logs
-            (r'logger\.info\(f"Using batch processing for (\{.*?\}) events"\)', r'logger.debug(f"Using batch processing for \1 events")'),
-            (r'logger\.info\(f"Categorized events: (\{.*?\}) kills, (\{.*?\}) suicides"\)', r'logger.debug(f"Categorized events: \1 kills, \2 suicides")'),
-            (r'logger\.info\(f"Updating stats for (\{.*?\}) unique players"\)', r'logger.debug(f"Updating stats for \1 unique players")'),
-            (r'logger\.info\(f"Updating nemesis/prey relationships"\)', r'logger.debug(f"Updating nemesis/prey relationships")'),
-            (r'logger\.info\(f"CSV content sample: (.*?)"\)', r'logger.debug(f"CSV content sample: \1")'),
-            (r'logger\.info\(f"Added (\{.*?\}) CSV files from (.*?) to tracking lists"\)', r'logger.debug(f"Added \1 CSV files from \2 to tracking lists")'),
-            (r'logger\.info\(f"Total tracked (.*?) files now: (\{.*?\})"\)', r'logger.debug(f"Total tracked \1 files now: \2")'),
-        ],
-        "log_processor.py": [
-            # Log processor specific logs
-            (r'logger\.info\(f"Final path_server_id: (.*?)"\)', r'logger.debug(f"Final path_server_id: \1")'),
-            (r'logger\.info\(f"Building server directory with resolved server ID: (.*?)"\)', r'logger.debug(f"Building server directory with resolved server ID: \1")'),
-            (r'logger\.info\(f"Using default directory structure with ID (.*?): (.*?)"\)', r'logger.debug(f"Using default directory structure with ID \1: \2")'),
-            (r'logger\.info\(f"Getting stats for log file: (.*?)"\)', r'logger.debug(f"Getting stats for log file: \1")'),
-        ],
-        "sftp.py": [
-            # SFTP manager specific logs
-            (r'logger\.info\(f"SFTPClient using known numeric ID \'(.*?)\' for path construction instead of \'(.*?)\'"\)', r'logger.debug(f"SFTPClient using known numeric ID \'\1\' for path construction instead of \'\2\'")'),
-            (r'logger\.info\(f"Using original server ID \'(.*?)\' for path construction instead of standardized ID \'(.*?)\'"\)', r'logger.debug(f"Using original server ID \'\1\' for path construction instead of standardized ID \'\2\'")'),
-            (r'logger\.info\(f"Found (.*?) at: (.*?)"\)', r'logger.debug(f"Found \1 at: \2")'),
-            (r'logger\.info\(f"Total (.*?) files found after deduplication: (\{.*?\}) \(from (\{.*?\}) total\)"\)', r'logger.debug(f"Total \1 files found after deduplication: \2 (from \3 total)")'),
-        ],
-        "direct_csv_handler.py": [
-            # Direct CSV handler specific logs
-            (r'logger\.info\(f"Direct parsing CSV content from file: (.*?)"\)', r'logger.debug(f"Direct parsing CSV content from file: \1")'),
-            (r'logger\.info\(f"Using delimiter \'(.*?)\' for content parsing \((.*?)\)"\)', r'logger.debug(f"Using delimiter \'\1\' for content parsing (\2)")'),
-            (r'logger\.info\(f"Directly parsed (\{.*?\}) events from (\{.*?\}) rows in CSV content"\)', r'logger.debug(f"Directly parsed \1 events from \2 rows in CSV content")'),
-        ],
-        "csv_parser.py": [
-            # CSV parser specific logs
-            (r'logger\.info\(f"Parsing CSV file: (.*?)"\)', r'logger.debug(f"Parsing CSV file: \1")'),
-            (r'logger\.info\(f"Detected delimiter: \'(.*?)\' \((.*?)\)"\)', r'logger.debug(f"Detected delimiter: \'\1\' (\2)")'),
-            (r'logger\.info\(f"Parsed (\{.*?\}) events from (\{.*?\}) rows in (.*?)"\)', r'logger.debug(f"Parsed \1 events from \2 rows in \3")'),
-        ],
-    }
+    if not REPLACEABLE_CALL_PATTERN.search(content):
+        print(f"  No f-string INFO logs to reduce, skipping file")
+        return 0
     
     # Apply common replacements
-    for pattern, replacement in common_replacements:
-        content = re.sub(pattern, replacement, content)
+    content, changes = apply_replacements(content, COMMON_REPLACEMENTS)
     
     # Apply module-specific replacements
     filename = os.path.basename(file_path)
-    if filename in module_specific_replacements:
-        for pattern, replacement in module_specific_replacements[filename]:
-            content = re.sub(pattern, replacement, content)
+    if MODULE_SPECIFIC_REPLACEMENTS.get(filename):
+        content, module_changes = apply_replacements(content, MODULE_SPECIFIC_REPLACEMENTS[filename])
+        changes += module_changes
     
-    # Count new logger.info calls
-    new_info_count = len(re.findall(r'logger\.info\(', content))
-    changes = info_count - new_info_count
+    # Every substitution turns one logger.info call into logger.debug
+    new_info_count = info_count - changes
     
     if changes > 0:
         print(f"  Reduced INFO logs from {info_count} to {new_info_count} ({changes} changed)")
         
         # Save the modified content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        atomic_write(file_path, content)
+        if digests is not None:
+            digests[file_path] = file_digest(content.encode('utf-8'))
         
         print(f"  Saved changes to {file_path}")
     else:
         print(f"  No changes made to {file_path}")
+    
+    return changes
 
 def find_python_files(directory):
-    """Find all Python files in the directory and its subdirectories"""
-    return glob.glob(f"{directory}/**/*.py", recursive=True)
+    """Lazily yield all Python files in the directory and its subdirectories"""
+    return glob.iglob(f"{directory}/**/*.py", recursive=True)
 
 if __name__ == "__main__":
     # Define base directories to search for Python files
@@ -141,19 +316,29 @@ if __name__ == "__main__":
     
     # If specific files are provided as arguments, process only those
     if len(sys.argv) > 1:
-        files_to_process = sys.argv[1:]
+        files_to_process = iter(sys.argv[1:])
     else:
-        # Otherwise, find all Python files in the specified directories
-        files_to_process = []
-        for directory in base_directories:
-            if os.path.exists(directory):
-                files_to_process.extend(find_python_files(directory))
+        # Otherwise, stream Python files from the specified directories
+        files_to_process = (
+            file_path
+            for directory in base_directories
+            if os.path.exists(directory)
+            for file_path in find_python_files(directory)
+        )
     
-    # Filter out non-existent files
-    files_to_process = [f for f in files_to_process if os.path.exists(f)]
-    
-    print(f"Found {len(files_to_process)} Python files to process")
-    
-    # Process each file
+    # Process each file as it is found, keeping only running totals
+    digests = load_digest_cache()
+    files_processed = 0
+    files_changed = 0
+    total_changes = 0
     for file_path in files_to_process:
-        reduce_log_levels(file_path)
\ No newline at end of file
+        if not os.path.exists(file_path):
+            continue
+        files_processed += 1
+        changes = reduce_log_levels(file_path, digests)
+        if changes:
+            files_changed += 1
+            total_changes += changes
+    save_digest_cache(digests)
+    
+    print(f"Processed {files_processed} Python files, changed {total_changes} INFO logs in {files_changed} files")
@@ -8,11 +8,32 @@ This script ensures changes to Python modules take effect by:
 3. Restarting the bot with a clean environment
 """
 import os
+import re
 import shutil
+import signal
 import subprocess
 import sys
 import time
 
+# Bot processes stopped before a restart, matched against the full command line
+BOT_PROCESS_PATTERN = re.compile(r"python.*(bot.py|run_discord_bot|bot_wrapper.py)")
+# Any bot-related process still running after the graceful shutdown window
+ANY_BOT_PROCESS_PATTERN = re.compile(r"python.*bot")
+# Seconds bot processes get to exit after SIGTERM before they are killed
+TERMINATE_TIMEOUT = 2.0
+# Seconds the bot must stay up after launch to count as started
+STARTUP_CHECK_TIMEOUT = 5.0
+# Line the bot logs once it is connected, which ends the startup check early
+BOT_READY_MARKER = b"Bot is ready!"
+# File the restarted bot's output is written to
+STARTUP_LOG = "bot_startup.log"
+# Ways to start the bot in order of preference: (script, command)
+BOT_LAUNCHERS = (
+    ("run_discord_bot.sh", ["bash", "run_discord_bot.sh"]),
+    ("bot_wrapper.py", ["python", "bot_wrapper.py"]),
+    ("bot.py", ["python", "bot.py"]),
+)
+
 def clear_python_cache():
     """Clear all Python __pycache__ directories to ensure module changes take effect"""
     print("Clearing Python cache...")
@@ -35,33 +56,61 @@ def clear_python_cache():
     print(f"Removed {count} cache directories")
     return count > 0
 
+def find_bot_pids(pattern):
+    """Find running processes whose command line matches a pattern
+
+    Reads /proc directly, the same way pgrep -f matches, without starting
+    a subprocess per lookup.
+
+    Args:
+        pattern: Compiled regex searched for in each command line
+
+    Returns:
+        List of matching process IDs, excluding this process
+    """
+    pids = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit() or int(entry.name) == os.getpid():
+            continue
+        try:
+            with open(os.path.join(entry.path, "cmdline"), "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+        except OSError:
+            # Process exited while we were scanning
+            continue
+        if pattern.search(cmdline):
+            pids.append(int(entry.name))
+    return pids
+
+def signal_pids(pids, sig):
+    """Send a signal to each process, ignoring ones that have already exited"""
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
 def kill_bot_processes():
     """Kill any running bot processes"""
     print("Killing bot processes...")
     
-    # Try to kill using pkill
     try:
-        # Kill various bot-related processes
-        subprocess.run(["pkill", "-f", "python.*bot.py"], check=False)
-        subprocess.run(["pkill", "-f", "python.*run_discord_bot"], check=False)
-        subprocess.run(["pkill", "-f", "python.*bot_wrapper.py"], check=False)
-        
-        # Wait for processes to terminate
-        time.sleep(2)
+        # Ask the bot processes to shut down
+        signal_pids(find_bot_pids(BOT_PROCESS_PATTERN), signal.SIGTERM)
         
-        # Check if any bot processes are still running
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*bot"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        # Wait for processes to terminate, returning as soon as they have.
+        # Only the processes found here are tracked, so each poll is a stat
+        # per pid rather than a rescan of every command line in /proc
+        deadline = time.monotonic() + TERMINATE_TIMEOUT
+        remaining = find_bot_pids(ANY_BOT_PROCESS_PATTERN)
+        while remaining and time.monotonic() < deadline:
+            time.sleep(0.05)
+            remaining = [pid for pid in remaining if os.path.exists(f"/proc/{pid}")]
         
-        if result.stdout.strip():
-            print(f"Some bot processes are still running: {result.stdout.strip()}")
+        if remaining:
+            print(f"Some bot processes are still running: {' '.join(map(str, remaining))}")
             print("Attempting to force kill...")
-            subprocess.run(["pkill", "-9", "-f", "python.*bot"], check=False)
-            time.sleep(1)
+            signal_pids(remaining, signal.SIGKILL)
         else:
             print("All bot processes successfully terminated")
             
@@ -70,51 +119,59 @@ def kill_bot_processes():
         print(f"Error killing bot processes: {e}")
         return False
 
+def wait_for_startup(process, log_path, timeout):
+    """Follow the bot's startup log until it reports ready, exits or the timeout passes
+
+    Args:
+        process: The started bot process
+        log_path: File the bot's output is written to
+        timeout: Seconds to wait at most
+
+    Returns:
+        True if the bot logged that it is ready or is still running at the
+        timeout, False if it exited
+    """
+    deadline = time.monotonic() + timeout
+    # Keep the end of the previous read so a marker split across reads is found
+    tail = b""
+    with open(log_path, "rb") as startup_log:
+        while time.monotonic() < deadline:
+            output = tail + startup_log.read()
+            if BOT_READY_MARKER in output:
+                return True
+            tail = output[-len(BOT_READY_MARKER):]
+            if process.poll() is not None:
+                return False
+            time.sleep(0.1)
+    return process.poll() is None
+
 def restart_bot():
     """Restart the Discord bot"""
     print("Starting the bot...")
     
     try:
-        # Start the bot using the appropriate script
-        if os.path.exists("run_discord_bot.sh"):
-            subprocess.Popen(
-                ["bash", "run_discord_bot.sh"],
-                stdout=open("bot_startup.log", "w"),
-                stderr=subprocess.STDOUT
-            )
-            print("Started bot using run_discord_bot.sh")
-        elif os.path.exists("bot_wrapper.py"):
-            subprocess.Popen(
-                ["python", "bot_wrapper.py"],
-                stdout=open("bot_startup.log", "w"),
-                stderr=subprocess.STDOUT
-            )
-            print("Started bot using bot_wrapper.py")
-        else:
-            subprocess.Popen(
-                ["python", "bot.py"],
-                stdout=open("bot_startup.log", "w"),
-                stderr=subprocess.STDOUT
+        # Start the bot using the first launcher present, in its own session
+        # so it is not tied to this script's terminal
+        script, command = next(
+            (launcher for launcher in BOT_LAUNCHERS if os.path.exists(launcher[0])),
+            BOT_LAUNCHERS[-1]
+        )
+        with open(STARTUP_LOG, "w") as startup_log:
+            process = subprocess.Popen(
+                command,
+                stdout=startup_log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
             )
-            print("Started bot directly using bot.py")
+        print(f"Started bot using {script}")
             
-        # Sleep briefly to allow startup to begin
-        time.sleep(5)
-        
-        # Check if bot is running
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*bot"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        if result.stdout.strip():
-            print(f"Bot started successfully, pid: {result.stdout.strip()}")
+        # Give startup a few seconds, but finish as soon as the bot reports
+        # ready or exits instead of sleeping out the whole window
+        if wait_for_startup(process, STARTUP_LOG, STARTUP_CHECK_TIMEOUT):
+            print(f"Bot started successfully, pid: {process.pid}")
             return True
-        else:
-            print("Bot failed to start")
-            return False
+        print("Bot failed to start")
+        return False
     except Exception as e:
         print(f"Error starting bot: {e}")
         return False
@@ -139,7 +196,7 @@ def main():
         return False
         
     print("\nBot restart completed successfully!")
-    print("Check bot_startup.log for startup messages")
+    print(f"Check {STARTUP_LOG} for startup messages")
     print("="*60)
     return True
 
@@ -226,9 +226,22 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Failed to write to restart log: {e}")
     
+    # uvloop runs the event loop in C, which speeds up the socket-heavy
+    # SFTP and gateway traffic; fall back to the default loop without it
+    run_options = {}
+    try:
+        import uvloop
+        if sys.version_info >= (3, 12):
+            # uvloop.install() is deprecated from Python 3.12 on
+            run_options["loop_factory"] = uvloop.new_event_loop
+        else:
+            uvloop.install()
+    except ImportError:
+        pass
+    
     exit_code = 0
     try:
-        exit_code = asyncio.run(main())
+        exit_code = asyncio.run(main(), **run_options)
     except KeyboardInterrupt:
         logger.info("Bot terminated by user")
         exit_code = 0
@@ -33,42 +33,12 @@ async def main():
         class MockBot(commands.Bot):
             def __init__(self):
                 super().__init__(command_prefix="!", intents=None)
-                self._db = None
-                self._background_tasks = {}
-                self._sftp_connections = {}
-                self._home_guild_id = None
-                
-            @property
-            def db(self):
-                return self._db
-                
-            @db.setter
-            def db(self, value):
-                self._db = value
-                
-            @property
-            def background_tasks(self):
-                return self._background_tasks
-                
-            @background_tasks.setter
-            def background_tasks(self, value):
-                self._background_tasks = value
-                
-            @property
-            def sftp_connections(self):
-                return self._sftp_connections
-                
-            @sftp_connections.setter
-            def sftp_connections(self, value):
-                self._sftp_connections = value
-                
-            @property
-            def home_guild_id(self):
-                return self._home_guild_id
-                
-            @home_guild_id.setter
-            def home_guild_id(self, value):
-                self._home_guild_id = value
+                # Plain attributes; pass-through properties would only add a
+                # Python-level call to every access
+                self.db = None
+                self.background_tasks = {}
+                self.sftp_connections = {}
+                self.home_guild_id = None
                 
         # Initialize a mock bot
         bot = MockBot()
@@ -18,6 +18,7 @@ from utils.file_discovery import (
     extract_timestamp_from_filename, is_map_csv_file
 )
 from utils.sftp import SFTPManager
+from utils.sftp_cache import get_shared_connection_cache
 from utils.csv_parser import CSVParser
 from utils.server_identity import ServerIdentity
 
@@ -37,7 +38,7 @@ class CSVProcessorCoordinator:
             bot: The Discord bot instance
         """
         self.bot = bot
-        self.sftp_managers = {}  # We'll create SFTP managers per server as needed
+        self.sftp_managers = get_shared_connection_cache(bot)  # SFTP managers per server, shared across the bot
         self.csv_parser = CSVParser(bot)
         self.server_identity = ServerIdentity(bot)
         self.running_tasks = {}  # guild_id -> {server_id -> task}
@@ -54,41 +55,8 @@ class CSVProcessorCoordinator:
         Returns:
             SFTPManager or None: SFTP manager instance if successful, None otherwise
         """
-        # Check if we already have an SFTP manager for this server
-        if server_id in self.sftp_managers:
-            return self.sftp_managers[server_id]
-            
-        # Create a new SFTP manager
-        try:
-            # Extract SFTP configuration
-            hostname = config.get("hostname") or config.get("sftp_host")
-            port = config.get("port") or config.get("sftp_port", 22)
-            username = config.get("username") or config.get("sftp_username")
-            password = config.get("password") or config.get("sftp_password")
-            original_server_id = config.get("original_server_id")
-            
-            # Check required parameters
-            if not hostname:
-                logger.error(f"Missing hostname for server {server_id}")
-                return None
-                
-            # Create SFTP manager
-            sftp_manager = SFTPManager(
-                hostname=hostname,
-                port=port,
-                username=username,
-                password=password,
-                server_id=server_id,
-                original_server_id=original_server_id
-            )
-            
-            # Store in cache
-            self.sftp_managers[server_id] = sftp_manager
-            return sftp_manager
-            
-        except Exception as e:
-            logger.error(f"Error creating SFTP manager for server {server_id}: {e}")
-            return None
+        # Managers connect on first use
+        return await self.sftp_managers.acquire(server_id, config, connect=False)
 
     def _get_processing_lock(self, guild_id: int, server_id: str) -> asyncio.Lock:
         """
@@ -276,17 +244,20 @@ class CSVProcessorCoordinator:
 
                 # Now scan for CSV files in the working directory
                 try:
-                    # Discover standard CSV files
-                    standard_files = discover_csv_files(
-                        working_dir,
-                        recursive=False,
-                        exclude_pattern=r'^map_',
-                        max_files=max_files
+                    # Discover standard CSV files and map CSV files (maps
+                    # subdirectory first). The two scans are independent, so
+                    # their directory listings run in worker threads at once
+                    standard_files, map_files = await asyncio.gather(
+                        asyncio.to_thread(
+                            discover_csv_files,
+                            working_dir,
+                            recursive=False,
+                            exclude_pattern=r'^map_',
+                            max_files=max_files
+                        ),
+                        asyncio.to_thread(discover_map_csv_files, working_dir, max_files=max_files)
                     )
 
-                    # Discover map CSV files (check maps subdirectory first)
-                    map_files = discover_map_csv_files(working_dir, max_files=max_files)
-
                     # Update result with file counts
                     result["standard_files"] = standard_files
                     result["map_files"] = map_files
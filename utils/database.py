@@ -92,16 +92,19 @@ class DatabaseManager:
         Returns:
             True if connected successfully, False otherwise
         """
-        if self._connected and self._client and self._db:
+        if self._connected and self._client is not None and self._db is not None:
             return True
             
         try:
-            # Create client and connect
-            self._client = motor.motor_asyncio.AsyncIOMotorClient(
-                self.connection_string,
-                serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000
-            )
+            # Create the client once and reuse its connection pool on retries
+            if self._client is None:
+                self._client = motor.motor_asyncio.AsyncIOMotorClient(
+                    self.connection_string,
+                    serverSelectionTimeoutMS=5000,
+                    connectTimeoutMS=5000,
+                    maxPoolSize=50,
+                    minPoolSize=5
+                )
             
             # Test connection
             await self._client.server_info()
@@ -191,10 +194,22 @@ class DatabaseManager:
         
         # Guild indexes
         await self._db.guilds.create_index("guild_id", unique=True)
+        await self._db.guilds.create_index([("guild_id", 1), ("servers.server_id", 1)])
         
         # Server indexes
         await self._db.game_servers.create_index("server_id", unique=True)
         await self._db.game_servers.create_index("guild_id")
+        await self._db.game_servers.create_index([("server_id", 1), ("guild_id", 1)])
+        await self._db.game_servers.create_index([("server_id_lower", 1), ("guild_id", 1)])
+        await self._db.servers.create_index([("server_id", 1), ("guild_id", 1)])
+        await self._db.servers.create_index([("server_id_lower", 1), ("guild_id", 1)])
+        
+        # Backfill the lowercase server ID used for case-insensitive lookups
+        for collection in (self._db.game_servers, self._db.servers):
+            await collection.update_many(
+                {"server_id": {"$exists": True}, "server_id_lower": {"$exists": False}},
+                [{"$set": {"server_id_lower": {"$toLower": {"$toString": "$server_id"}}}}]
+            )
         
         # Player indexes
         await self._db.players.create_index("player_id", unique=True)
@@ -202,6 +217,10 @@ class DatabaseManager:
         await self._db.players.create_index("name")
         await self._db.players.create_index([("server_id", 1), ("name", 1)])
         
+        # Leaderboard indexes so top-N queries are served in index order
+        for stat in ("kills", "deaths", "suicides", "headshots", "longest_shot", "highest_killstreak"):
+            await self._db.players.create_index([("server_id", 1), (stat, -1)])
+        
         # Player link indexes
         await self._db.player_links.create_index("link_id", unique=True)
         await self._db.player_links.create_index("player_id")
@@ -275,6 +294,7 @@ class DatabaseManager:
                         {"server_id": server_id},
                         {"$set": {
                             "original_server_id": original_id,
+                            "server_id_lower": str(server_id).lower(),
                             "updated_at": datetime.utcnow()
                         }},
                         upsert=True
@@ -335,6 +355,7 @@ class DatabaseManager:
                         {"server_id": server_id},
                         {"$set": {
                             "original_server_id": original_id,
+                            "server_id_lower": str(server_id).lower(),
                             "updated_at": datetime.utcnow()
                         }},
                         upsert=True
@@ -413,23 +434,15 @@ class DatabaseManager:
                             servers[i]["original_server_id"] = original_id
                             servers_updated = True
                             
-                            # Also update game_servers and servers collections
-                            await self._db.game_servers.update_one(
-                                {"server_id": server_id},
-                                {"$set": {
-                                    "original_server_id": original_id,
-                                    "updated_at": datetime.utcnow()
-                                }},
-                                upsert=True
-                            )
-                            
-                            await self._db.servers.update_one(
-                                {"server_id": server_id},
-                                {"$set": {
-                                    "original_server_id": original_id,
-                                    "updated_at": datetime.utcnow()
-                                }},
-                                upsert=True
+                            # Also update game_servers and servers collections concurrently
+                            sync_update = {"$set": {
+                                "original_server_id": original_id,
+                                "server_id_lower": str(server_id).lower(),
+                                "updated_at": datetime.utcnow()
+                            }}
+                            await asyncio.gather(
+                                self._db.game_servers.update_one({"server_id": server_id}, sync_update, upsert=True),
+                                self._db.servers.update_one({"server_id": server_id}, sync_update, upsert=True)
                             )
                         else:
                             # Fallback to using server_id if we couldn't find a better alternative
@@ -437,23 +450,15 @@ class DatabaseManager:
                             servers[i]["original_server_id"] = server_id
                             servers_updated = True
                             
-                            # Update other collections
-                            await self._db.game_servers.update_one(
-                                {"server_id": server_id},
-                                {"$set": {
-                                    "original_server_id": server_id,
-                                    "updated_at": datetime.utcnow()
-                                }},
-                                upsert=True
-                            )
-                            
-                            await self._db.servers.update_one(
-                                {"server_id": server_id},
-                                {"$set": {
-                                    "original_server_id": server_id,
-                                    "updated_at": datetime.utcnow()
-                                }},
-                                upsert=True
+                            # Update other collections concurrently
+                            sync_update = {"$set": {
+                                "original_server_id": server_id,
+                                "server_id_lower": str(server_id).lower(),
+                                "updated_at": datetime.utcnow()
+                            }}
+                            await asyncio.gather(
+                                self._db.game_servers.update_one({"server_id": server_id}, sync_update, upsert=True),
+                                self._db.servers.update_one({"server_id": server_id}, sync_update, upsert=True)
                             )
                 
                 # Update guild if servers were modified
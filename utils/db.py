@@ -30,7 +30,7 @@ async def initialize_db() -> AsyncIOMotorDatabase:
     global _db_client, _db
     
     # If already initialized and connected, return existing connection
-    if _db is None and _db_client is None:
+    if _db is not None:
         return _db
     
     # Get MongoDB connection info from environment
@@ -50,6 +50,7 @@ async def initialize_db() -> AsyncIOMotorDatabase:
             connectTimeoutMS=10000,         # 10 second timeout
             socketTimeoutMS=45000,          # 45 second timeout
             maxPoolSize=100,                # Connection pool size
+            minPoolSize=5,                  # Keep warm connections open
             retryWrites=True                # Retry writes on failure
         )
         
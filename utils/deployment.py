@@ -36,10 +36,46 @@ VERSION_HISTORY = []
 # Backup settings
 BACKUP_DIR = "backups"
 MAX_BACKUPS = 5
+# Files copied into each backup: (source path, name inside the backup)
+BACKUP_FILES = (
+    ("config.py", "config.py"),
+    (".env", ".env"),
+    (VERSION_FILE, "version.json")
+)
 
 # Database migration settings
 DB_MIGRATION_DIR = "migrations"
 
+def copy_file(source: str, destination: str) -> None:
+    """Copy a file and its metadata like shutil.copy2, but copy the data in-kernel
+    
+    os.copy_file_range moves the bytes between the two descriptors without a
+    userspace buffer (and can reflink on filesystems that support it). Falls
+    back to shutil.copy2 where the syscall is unavailable or refused.
+    
+    Args:
+        source: Path of the file to copy
+        destination: Path to copy the file to
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(source, destination)
+        return
+        
+    try:
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError:
+        # e.g. EXDEV across filesystems on older kernels, or unsupported filesystems
+        shutil.copy2(source, destination)
+        return
+        
+    shutil.copystat(source, destination)
+
 # Deployment stages
 class DeploymentStage:
     PREP = "preparation"
@@ -354,16 +390,17 @@ class DeploymentManager:
                 # This is more of a placeholder - real implementation would use mongodump
                 logger.info("Database backup would be performed here")
                 
-            # Back up configuration
-            if os.path.exists("config.py"):
-                shutil.copy2("config.py", os.path.join(backup_dir, "config.py"))
-                
-            if os.path.exists(".env"):
-                shutil.copy2(".env", os.path.join(backup_dir, ".env"))
-                
-            # Back up version info
-            if os.path.exists(VERSION_FILE):
-                shutil.copy2(VERSION_FILE, os.path.join(backup_dir, "version.json"))
+            # Back up configuration and version info. The copies touch
+            # disjoint files, so run them concurrently off the event loop
+            backup_files = [
+                (source, os.path.join(backup_dir, name))
+                for source, name in BACKUP_FILES
+                if os.path.exists(source)
+            ]
+            await asyncio.gather(*(
+                asyncio.to_thread(copy_file, source, destination)
+                for source, destination in backup_files
+            ))
                 
             # Create backup metadata
             metadata = {
@@ -396,10 +433,10 @@ class DeploymentManager:
         try:
             # List backups
             backups = []
-            for item in os.listdir(BACKUP_DIR):
-                if item.startswith("backup_") and os.path.isdir(os.path.join(BACKUP_DIR, item)):
-                    path = os.path.join(BACKUP_DIR, item)
-                    backups.append((path, os.path.getmtime(path)))
+            with os.scandir(BACKUP_DIR) as entries:
+                for entry in entries:
+                    if entry.name.startswith("backup_") and entry.is_dir():
+                        backups.append((entry.path, entry.stat().st_mtime))
                     
             # Sort by modification time (newest first)
             backups.sort(key=lambda x: x[1], reverse=True)
@@ -633,22 +670,21 @@ class DeploymentManager:
         # Restore from backup if available is not None
         if self.backup_path and os.path.exists(self.backup_path):
             try:
-                # Restore version info
-                version_backup = os.path.join(self.backup_path, "version.json")
-                if os.path.exists(version_backup):
-                    shutil.copy2(version_backup, VERSION_FILE)
+                # Restore configuration and version info concurrently
+                restore_files = [
+                    (os.path.join(self.backup_path, name), destination)
+                    for destination, name in BACKUP_FILES
+                    if os.path.exists(os.path.join(self.backup_path, name))
+                ]
+                await asyncio.gather(*(
+                    asyncio.to_thread(copy_file, source, destination)
+                    for source, destination in restore_files
+                ))
+                
+                # Reload version info once it has been restored
+                if any(destination == VERSION_FILE for _, destination in restore_files):
                     self.version_info = self._load_version_info()
                     
-                # Restore config
-                config_backup = os.path.join(self.backup_path, "config.py")
-                if os.path.exists(config_backup):
-                    shutil.copy2(config_backup, "config.py")
-                    
-                # Restore env
-                env_backup = os.path.join(self.backup_path, ".env")
-                if os.path.exists(env_backup):
-                    shutil.copy2(env_backup, ".env")
-                    
                 logger.info("Restored from backup")
                 
             except Exception as e:
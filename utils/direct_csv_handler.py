@@ -7,6 +7,7 @@ that bypasses all the complex infrastructure of the main application.
 It's designed to be used as a fallback when the main parsing logic fails.
 """
 import os
+import asyncio
 import csv
 import io
 import logging
@@ -23,6 +24,88 @@ logger = logging.getLogger(__name__)
 # Set the assets directory to a real path to ensure it works
 ASSETS_DIR = os.path.join(os.getcwd(), "attached_assets")
 
+# Filename patterns checked against every file walked, compiled once
+DATE_IN_FILENAME_PATTERN = re.compile(r'\d{4}[.-]\d{2}[.-]\d{2}')
+FULL_TIMESTAMP_PATTERN = re.compile(r'(\d{4})\.(\d{2})\.(\d{2})-(\d{2})\.(\d{2})\.(\d{2})')
+DATE_ONLY_PATTERN = re.compile(r'(\d{4})\.(\d{2})\.(\d{2})')
+
+# Number of CSV files parsed in worker threads ahead of the one being imported
+PARSE_AHEAD_DEPTH = 8
+
+# Characters of a file looked at when detecting its delimiter
+DELIMITER_SAMPLE_SIZE = 4096
+
+# Timestamp formats seen in CSV logs, tried in order
+TIMESTAMP_FORMATS = (
+    '%Y.%m.%d-%H.%M.%S',
+    '%Y.%m.%d-%H:%M:%S',
+    '%Y.%m.%d %H.%M.%S',
+    '%Y.%m.%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H.%M.%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S'
+)
+
+# Words in the first column that mark a header row
+HEADER_KEYWORDS = ('time', 'date', 'timestamp')
+
+def detect_delimiter(content_str: str, comma_ratio: float = 1.5, allow_tabs: bool = True) -> str:
+    """
+    Detect the delimiter of CSV content from the start of the content.
+    
+    Args:
+        content_str: CSV content as a string
+        comma_ratio: How many times more common commas must be than
+            semicolons for commas to be chosen
+        allow_tabs: Whether tab-separated content is recognized
+        
+    Returns:
+        The delimiter: tab, comma or semicolon (the default for game logs)
+    """
+    sample = content_str[:DELIMITER_SAMPLE_SIZE]
+    semicolons = sample.count(';')
+    commas = sample.count(',')
+    tabs = sample.count('\t') if allow_tabs else 0
+    
+    # Calculate which delimiter is most likely based on relative frequency
+    # and priority for different formats
+    if allow_tabs and tabs > max(semicolons, commas) * 0.8:  # Tab is at least 80% as common as the most common delimiter
+        logger.debug("Selected tab as delimiter based on frequency: %d tabs", tabs)
+        return '\t'
+    if commas > semicolons * comma_ratio:  # Significantly more commas than semicolons
+        logger.debug("Selected comma as delimiter based on frequency: %d commas vs %d semicolons", commas, semicolons)
+        return ','
+    # Default to semicolon delimiter
+    logger.debug("Selected semicolon as delimiter based on frequency or default: %d semicolons", semicolons)
+    return ';'
+
+def parse_timestamp(ts_str: str, preferred_format: Optional[str] = None) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Parse a CSV timestamp, trying the format that matched the previous row first.
+    
+    Args:
+        ts_str: Timestamp string from a CSV row
+        preferred_format: Format to try before TIMESTAMP_FORMATS, if any
+        
+    Returns:
+        Tuple of (parsed datetime or None, format to prefer for the next row)
+    """
+    if preferred_format is not None:
+        try:
+            return datetime.strptime(ts_str, preferred_format), preferred_format
+        except ValueError:
+            pass
+    
+    for fmt in TIMESTAMP_FORMATS:
+        if fmt == preferred_format:
+            continue
+        try:
+            return datetime.strptime(ts_str, fmt), fmt
+        except ValueError:
+            continue
+    return None, preferred_format
+
 def direct_parse_csv_content(content_str: str, file_path: str = "", server_id: str = "", 
                     track_line_numbers: bool = False, start_line: int = 0) -> Tuple[List[Dict[str, Any]], int]:
     """
@@ -47,19 +130,10 @@ def direct_parse_csv_content(content_str: str, file_path: str = "", server_id: s
             logger.error("Empty content provided")
             return [], 0
             
-        # Detect delimiter (semicolons or commas)
-        # CRITICAL FIX: Based on the screenshot, these logs explicitly use semicolon delimiter
-        # However, we'll still perform auto-detection for robustness
-        semicolons = content_str.count(';')
-        commas = content_str.count(',')
-        
-        # Default to semicolon (as seen in the screenshot) unless there's very strong evidence of commas
-        delimiter = ';'
-        if commas > semicolons * 3:  # Very high threshold to override
-            delimiter = ','
-            logger.warning(f"Unusual delimiter detected: using comma instead of semicolon")
-        
-        logger.debug(f"Using delimiter \'{delimiter}\' for content parsing (semicolons: {semicolons}, commas: {commas})")
+        # Detect delimiter, defaulting to semicolons as the game logs use;
+        # content only switches to commas on very strong evidence and is
+        # never treated as tab-separated
+        delimiter = detect_delimiter(content_str, comma_ratio=3, allow_tabs=False)
         
         # Create CSV reader
         csv_reader = csv.reader(io.StringIO(content_str), delimiter=delimiter)
@@ -67,6 +141,9 @@ def direct_parse_csv_content(content_str: str, file_path: str = "", server_id: s
         # Parse events
         events = []
         row_count = 0
+        # Rows of one file share a timestamp format, so the last one that
+        # matched is tried first
+        timestamp_format = None
         
         for row in csv_reader:
             row_count += 1
@@ -80,7 +157,7 @@ def direct_parse_csv_content(content_str: str, file_path: str = "", server_id: s
                 continue
                 
             # Skip header rows
-            if any(keyword in row[0].lower() for keyword in ['time', 'date', 'timestamp']):
+            if any(keyword in row[0].lower() for keyword in HEADER_KEYWORDS):
                 continue
                 
             # Extract data from row
@@ -112,28 +189,10 @@ def direct_parse_csv_content(content_str: str, file_path: str = "", server_id: s
                 ts_str = event['timestamp']
                 
                 # Try various timestamp formats
-                timestamp_formats = [
-                    '%Y.%m.%d-%H.%M.%S',
-                    '%Y.%m.%d-%H:%M:%S',
-                    '%Y.%m.%d %H.%M.%S',
-                    '%Y.%m.%d %H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S',
-                    '%Y-%m-%d %H.%M.%S',
-                    '%m/%d/%Y %H:%M:%S',
-                    '%d/%m/%Y %H:%M:%S'
-                ]
+                dt, timestamp_format = parse_timestamp(ts_str, timestamp_format)
                 
-                for fmt in timestamp_formats:
-                    try:
-                        dt = datetime.strptime(ts_str, fmt)
-                        event['timestamp'] = dt
-                        break
-                    except ValueError:
-                        continue
-                        
-                # If still a string, use current time
-                if isinstance(event['timestamp'], str):
-                    event['timestamp'] = datetime.now()
+                # If no format matched, use current time
+                event['timestamp'] = dt if dt is not None else datetime.now()
                     
             except Exception as e:
                 logger.error(f"Error parsing timestamp: {e}")
@@ -162,15 +221,13 @@ def direct_parse_csv_file(file_path: str, server_id: str, start_line: int = 0) -
     Returns:
         Tuple of (parsed event dictionaries, total line count)
     """
-    logger.info(f"Direct parsing CSV file: {file_path}")
+    # Called once per file, so the log calls below use lazy %-style
+    # formatting to skip building messages that are filtered out
+    logger.info("Direct parsing CSV file: %s", file_path)
     
     try:
         # FIXED: Enhanced file reading and content detection
-        logger.info(f"Processing file: {os.path.basename(file_path)}")
-        
-        
-        # FIXED: Enhanced file reading and content detection
-        logger.info(f"Processing file: {os.path.basename(file_path)}")
+        logger.info("Processing file: %s", os.path.basename(file_path))
         
         # Read file as binary for maximum compatibility
         try:
@@ -203,29 +260,12 @@ def direct_parse_csv_file(file_path: str, server_id: str, start_line: int = 0) -
             logger.error(f"Failed to decode file content with any encoding: {file_path}")
             return [], 0
             
-        logger.info(f"Successfully decoded file using {successful_encoding} encoding")
-        
-        # FIXED: Better delimiter detection with multiple passes if needed
-        # First check for standard delimiters
-        semicolons = content_str.count(';')
-        commas = content_str.count(',')
-        tabs = content_str.count('\t')
-        
-        # Calculate which delimiter is most likely based on relative frequency
-        # and priority for different formats
-        delimiter = ';'  # Default for most game logs
-        
-        if tabs > max(semicolons, commas) * 0.8:  # Tab is at least 80% as common as the most common delimiter
-            delimiter = '\t'
-            logger.info(f"Selected tab as delimiter based on frequency: {tabs} tabs")
-        elif commas > semicolons * 1.5:  # Significantly more commas than semicolons
-            delimiter = ','
-            logger.info(f"Selected comma as delimiter based on frequency: {commas} commas vs {semicolons} semicolons")
-        else:
-            # Default to semicolon delimiter
-            logger.info(f"Selected semicolon as delimiter based on frequency or default: {semicolons} semicolons")
+        logger.info("Successfully decoded file using %s encoding", successful_encoding)
+        
+        # Detect the delimiter from the start of the content
+        delimiter = detect_delimiter(content_str)
             
-        logger.info(f"Using delimiter '{delimiter}' for {file_path}")
+        logger.info("Using delimiter '%s' for %s", delimiter, file_path)
         
         # Create CSV reader
         csv_reader = csv.reader(io.StringIO(content_str), delimiter=delimiter)
@@ -233,6 +273,9 @@ def direct_parse_csv_file(file_path: str, server_id: str, start_line: int = 0) -
         # Parse events
         events = []
         row_count = 0
+        # Rows of one file share a timestamp format, so the last one that
+        # matched is tried first
+        timestamp_format = None
         
         for row in csv_reader:
             row_count += 1
@@ -246,7 +289,7 @@ def direct_parse_csv_file(file_path: str, server_id: str, start_line: int = 0) -
                 continue
                 
             # Skip header rows
-            if any(keyword in row[0].lower() for keyword in ['time', 'date', 'timestamp']):
+            if any(keyword in row[0].lower() for keyword in HEADER_KEYWORDS):
                 continue
                 
             # Extract data from row
@@ -278,28 +321,10 @@ def direct_parse_csv_file(file_path: str, server_id: str, start_line: int = 0) -
                 ts_str = event['timestamp']
                 
                 # Try various timestamp formats
-                timestamp_formats = [
-                    '%Y.%m.%d-%H.%M.%S',
-                    '%Y.%m.%d-%H:%M:%S',
-                    '%Y.%m.%d %H.%M.%S',
-                    '%Y.%m.%d %H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S',
-                    '%Y-%m-%d %H.%M.%S',
-                    '%m/%d/%Y %H:%M:%S',
-                    '%d/%m/%Y %H:%M:%S'
-                ]
+                dt, timestamp_format = parse_timestamp(ts_str, timestamp_format)
                 
-                for fmt in timestamp_formats:
-                    try:
-                        dt = datetime.strptime(ts_str, fmt)
-                        event['timestamp'] = dt
-                        break
-                    except ValueError:
-                        continue
-                        
-                # If still a string, use current time
-                if isinstance(event['timestamp'], str):
-                    event['timestamp'] = datetime.now()
+                # If no format matched, use current time
+                event['timestamp'] = dt if dt is not None else datetime.now()
                     
             except Exception as e:
                 logger.error(f"Error parsing timestamp: {e}")
@@ -308,7 +333,7 @@ def direct_parse_csv_file(file_path: str, server_id: str, start_line: int = 0) -
             # Add to events list
             events.append(event)
             
-        logger.info(f"Directly parsed {len(events)} events from {row_count} rows in {file_path}")
+        logger.info("Directly parsed %d events from %d rows in %s", len(events), row_count, file_path)
         return events, row_count
         
     except Exception as e:
@@ -330,12 +355,12 @@ async def direct_import_events(db, events: List[Dict[str, Any]]) -> int:
     if events is None:
         return 0
         
-    logger.info(f"Directly importing {len(events)} events")
+    logger.info("Directly importing %d events", len(events))
     
     try:
         result = await db.kills.insert_many(events)
         imported = len(result.inserted_ids)
-        logger.info(f"Successfully imported {imported} events directly")
+        logger.info("Successfully imported %d events directly", imported)
         return imported
     except Exception as e:
         logger.error(f"Error importing events: {e}")
@@ -497,10 +522,10 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
             for root, dirs, files in os.walk(base_dir):
                 # Log only if we find files or this is one of known important subdirectories
                 important_subdir = any(keyword in root.lower() for keyword in ['world_', 'deathlogs', 'actual'])
-                csv_in_dir = any(f.endswith('.csv') for f in files)
+                csv_count = sum(1 for f in files if f.endswith('.csv'))
                 
-                if csv_in_dir or important_subdir:
-                    logger.info(f"Searching in directory: {root} - contains {len(files)} files, {sum(1 for f in files if f.endswith('.csv'))} CSV files")
+                if csv_count or important_subdir:
+                    logger.info("Searching in directory: %s - contains %d files, %d CSV files", root, len(files), csv_count)
                 
                 # Always look for subdirectories that match our patterns
                 for subdir in dirs:
@@ -508,29 +533,27 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
                     if subdir.startswith('.'):
                         continue
                         
-                    # Check for important game subdirectories
-                    if any(pattern in subdir.lower() for pattern in ['world_', 'map_', 'deathlogs', 'logs', 'actual']):
+                    # Check for important game subdirectories. Numbered world
+                    # directories (world_0, world_1, etc.) are covered by 'world_'
+                    subdir_lower = subdir.lower()
+                    if any(pattern in subdir_lower for pattern in ('world_', 'map_', 'deathlogs', 'logs', 'actual')):
                         subdir_path = os.path.join(root, subdir)
-                        logger.info(f"Found important subdirectory: {subdir_path}")
-                        
-                    # Check specifically for numbered world directories (world_0, world_1, etc.)
-                    elif re.match(r'world_\d+', subdir.lower()):
-                        subdir_path = os.path.join(root, subdir)
-                        logger.info(f"Found numbered world directory: {subdir_path}")
+                        logger.info("Found important subdirectory: %s", subdir_path)
                 
                 # FIXED: Enhanced file discovery with better format support
                 for filename in files:
                     # Check for various file formats that might contain CSV data
+                    filename_lower = filename.lower()
                     is_csv_file = (
                         # Standard formats
-                        filename.lower().endswith('.csv') or
+                        filename_lower.endswith('.csv') or
                         
                         # Alternative formats that might contain CSV data
-                        (filename.lower().endswith('.log') and "death" in filename.lower()) or
-                        (filename.lower().endswith('.txt') and "kill" in filename.lower()) or
+                        (filename_lower.endswith('.log') and "death" in filename_lower) or
+                        (filename_lower.endswith('.txt') and "kill" in filename_lower) or
                         
                         # Check for date patterns common in game logs
-                        (re.search(r'\d{4}[.-]\d{2}[.-]\d{2}', filename) and not filename.lower().endswith('.zip'))
+                        (DATE_IN_FILENAME_PATTERN.search(filename) and not filename_lower.endswith('.zip'))
                     )
                     
                     if not is_csv_file:
@@ -541,7 +564,7 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
                     # Skip if we've already found this file
                     try:
                         if is_duplicate_file(full_path):
-                            logger.debug(f"Skipping duplicate file: {full_path}")
+                            logger.debug("Skipping duplicate file: %s", full_path)
                             continue
                     except:
                         # If the comparison fails (e.g., cross-device), compare paths
@@ -549,38 +572,38 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
                             continue
                     
                     # First try to extract date using the full timestamp pattern (YYYY.MM.DD-HH.MM.SS)
-                    date_match = re.search(r'(\d{4})\.(\d{2})\.(\d{2})-(\d{2})\.(\d{2})\.(\d{2})', filename)
+                    date_match = FULL_TIMESTAMP_PATTERN.search(filename)
                     
                     if date_match:
                         # Full timestamp pattern found
                         year, month, day, hour, minute, second = map(int, date_match.groups())
                         try:
                             file_date = datetime(year, month, day, hour, minute, second)
-                            logger.info(f"Found CSV file: {full_path} (datetime: {file_date.strftime('%Y-%m-%d %H:%M:%S')})")
+                            logger.info("Found CSV file: %s (datetime: %s)", full_path, file_date)
                         except ValueError:
                             # If parsing fails, try just the date part
                             try:
                                 file_date = datetime(year, month, day)
-                                logger.info(f"Found CSV file: {full_path} (date only: {file_date.strftime('%Y-%m-%d')})")
+                                logger.info("Found CSV file: %s (date only: %s)", full_path, file_date.date())
                             except ValueError:
                                 # Still failed, include file anyway
-                                logger.info(f"Found CSV file: {full_path} (datetime parsing failed)")
+                                logger.info("Found CSV file: %s (datetime parsing failed)", full_path)
                                 file_date = None
                     else:
                         # Try date-only pattern (YYYY.MM.DD)
-                        date_only_match = re.search(r'(\d{4})\.(\d{2})\.(\d{2})', filename)
+                        date_only_match = DATE_ONLY_PATTERN.search(filename)
                         if date_only_match:
                             year, month, day = map(int, date_only_match.groups())
                             try:
                                 file_date = datetime(year, month, day)
-                                logger.info(f"Found CSV file: {full_path} (date: {file_date.strftime('%Y-%m-%d')})")
+                                logger.info("Found CSV file: %s (date: %s)", full_path, file_date.date())
                             except ValueError:
                                 # If date parsing fails, still include file
-                                logger.info(f"Found CSV file: {full_path} (date parsing failed)")
+                                logger.info("Found CSV file: %s (date parsing failed)", full_path)
                                 file_date = None
                         else:
                             # No recognizable date pattern
-                            logger.info(f"Found CSV file: {full_path} (no date in filename)")
+                            logger.info("Found CSV file: %s (no date in filename)", full_path)
                             file_date = None
                     
                     # FIXED: Safer date filtering to avoid missing important files
@@ -589,11 +612,11 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
                     include_file = True
                     
                     # Log date information for debugging but don't use it to exclude files
-                    if file_date is not None and cutoff_date is not None:
+                    if file_date is not None and cutoff_date is not None and logger.isEnabledFor(logging.DEBUG):
                         if file_date < cutoff_date:
-                            logger.info(f"File date {file_date} is older than cutoff {cutoff_date}, but including it anyway: {os.path.basename(full_path)}")
+                            logger.debug("File date %s is older than cutoff %s, but including it anyway: %s", file_date, cutoff_date, os.path.basename(full_path))
                         else:
-                            logger.info(f"File date {file_date} is newer than cutoff {cutoff_date}: {os.path.basename(full_path)}")
+                            logger.debug("File date %s is newer than cutoff %s: %s", file_date, cutoff_date, os.path.basename(full_path))
                     
                     # Always add file to processing list regardless of date
                     if include_file:
@@ -610,6 +633,7 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
     files_processed = 0
     events_imported = 0
     
+    parseable_files = []
     for file_path in csv_files:
         # CRITICAL FIX: Check if file actually exists before processing
         if not os.path.exists(file_path):
@@ -624,40 +648,60 @@ async def process_directory(db, server_id: str, days: int = 30) -> Tuple[int, in
         except Exception as e:
             logger.error(f"Error checking file size: {e}")
             continue
+        parseable_files.append(file_path)
+    
+    # Files are parsed in worker threads up to PARSE_AHEAD_DEPTH files ahead of
+    # the one being imported, so parsing neither blocks the event loop nor
+    # waits for the previous file's database writes
+    pending_parses = {}
+    
+    try:
+        for file_index, file_path in enumerate(parseable_files):
+            for upcoming_file in parseable_files[file_index:file_index + PARSE_AHEAD_DEPTH]:
+                if upcoming_file not in pending_parses:
+                    pending_parses[upcoming_file] = asyncio.create_task(
+                        asyncio.to_thread(direct_parse_csv_file, upcoming_file, server_id)
+                    )
         
-        # FIXED: Improved parsing with better error handling and logging
-        try:
-            # Parse events - unpack tuple return value (events, line_count)
-            events, line_count = direct_parse_csv_file(file_path, server_id)
+            # FIXED: Improved parsing with better error handling and logging
+            try:
+                # Parse events - unpack tuple return value (events, line_count)
+                events, line_count = await pending_parses.pop(file_path)
             
-            if events is not None:
-                logger.info(f"Successfully parsed {len(events)} events from {os.path.basename(file_path)} ({line_count} total lines)")
+                if events is not None:
+                    logger.info("Successfully parsed %d events from %s (%d total lines)", len(events), os.path.basename(file_path), line_count)
                 
-                # Import events with better error handling
-                try:
-                    imported = await direct_import_events(db, events)
-                    if imported > 0:
-                        files_processed += 1
-                        events_imported += imported
-                        logger.info(f"Successfully imported {imported} events from {os.path.basename(file_path)}")
-                    else:
-                        logger.warning(f"No events were imported from {os.path.basename(file_path)} despite successful parsing")
-                        # Count the file as processed even if no events were imported
-                        files_processed += 1
-                except Exception as import_error:
-                    logger.error(f"Error importing events from {os.path.basename(file_path)}: {import_error}")
-                    # Try to continue with other files
-            else:
-                if line_count > 0:
-                    logger.warning(f"File {os.path.basename(file_path)} has {line_count} lines but no valid events were parsed")
+                    # Import events with better error handling
+                    try:
+                        imported = await direct_import_events(db, events)
+                        if imported > 0:
+                            files_processed += 1
+                            events_imported += imported
+                            logger.info("Successfully imported %d events from %s", imported, os.path.basename(file_path))
+                        else:
+                            logger.warning(f"No events were imported from {os.path.basename(file_path)} despite successful parsing")
+                            # Count the file as processed even if no events were imported
+                            files_processed += 1
+                    except Exception as import_error:
+                        logger.error(f"Error importing events from {os.path.basename(file_path)}: {import_error}")
+                        # Try to continue with other files
                 else:
-                    logger.warning(f"No valid content found in {os.path.basename(file_path)}")
+                    if line_count > 0:
+                        logger.warning(f"File {os.path.basename(file_path)} has {line_count} lines but no valid events were parsed")
+                    else:
+                        logger.warning(f"No valid content found in {os.path.basename(file_path)}")
                     
-                # Count this as processed to avoid reprocessing the same empty file
-                files_processed += 1
-        except Exception as parse_error:
-            logger.error(f"Error parsing file {os.path.basename(file_path)}: {parse_error}")
-            # Continue with other files
+                    # Count this as processed to avoid reprocessing the same empty file
+                    files_processed += 1
+            except Exception as parse_error:
+                logger.error(f"Error parsing file {os.path.basename(file_path)}: {parse_error}")
+                # Continue with other files
+    finally:
+        # Don't leave parses queued or running if the loop ends early
+        for parse in pending_parses.values():
+            parse.cancel()
+        if pending_parses:
+            await asyncio.gather(*pending_parses.values(), return_exceptions=True)
     
     logger.info(f"Direct processing complete: processed {files_processed} files, imported {events_imported} events")
     return files_processed, events_imported
@@ -127,7 +127,10 @@ def discover_csv_files(
         else:
             # Non-recursive - just look in the base directory
             if os.path.exists(base_dir) and os.path.isdir(base_dir):
-                files = [f for f in os.listdir(base_dir) if os.path.isfile(os.path.join(base_dir, f))]
+                # scandir reports each entry's type with its name, so files
+                # are picked out without a stat per entry
+                with os.scandir(base_dir) as entries:
+                    files = [entry.name for entry in entries if entry.is_file()]
                 _process_directory_files(base_dir, files, found_files, include_regex, exclude_regex, max_files)
     except Exception as e:
         logger.error(f"Error during file discovery: {str(e)}")
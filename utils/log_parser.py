@@ -69,6 +69,25 @@ CONVOY_PATTERN = re.compile(
     rf'{TIMESTAMP_PATTERN}LogSFPS: GameplayEvent ([^_]+_[^_]+_ConvoyEvent[^\s]+) switched to ([A-Z]+)'
 )
 
+# Every event pattern checked by parse_line after the server config lines
+# contains one of these markers, so one search rules out the other lines
+EVENT_MARKER_PATTERN = re.compile(r'LogSFPS: |LogOnline: ')
+
+# parse_line result keys that parse_file keeps as important events
+IMPORTANT_EVENT_KEYS = frozenset((
+    'player_register', 'player_unregister', 'player_kick',
+    'mission', 'airdrop', 'helicrash', 'trader', 'convoy'
+))
+
+# Kill and connection lines handled by parse_log_file, matched in a single
+# search per line; the alternative that matched tells the event type apart
+LOG_EVENT_PATTERN = re.compile(
+    r'\[(?P<timestamp>[^\]]+)\]\s+LogSFPS: Player (?P<player_id>[^\s]+) \((?P<player_name>[^\)]+)\) '
+    r'(?:killed player (?P<victim_id>[^\s]+) \((?P<victim_name>[^\)]+)\)(?: with (?P<weapon>.+))?'
+    r'|(?P<action>connected|disconnected))'
+)
+CONNECTION_ACTIONS = {"connected": "joined", "disconnected": "left"}
+
 # Mission level/difficulty regex pattern - looks for numbers that might indicate level
 MISSION_LEVEL_PATTERN = re.compile(r'_0?([1-4])_|_0?([1-4])$|_([1-4])_|_([1-4])$|_([1-4])Mis')
 
@@ -417,6 +436,10 @@ class LogParser:
                     'server_name': self.server_name
                 }
         
+        # Skip the per-event searches for lines no event pattern can match
+        if EVENT_MARKER_PATTERN.search(line) is None:
+            return result
+        
         # Check player name mapping
         match = PLAYER_NAME_PATTERN.search(line)
         if match is not None:
@@ -593,8 +616,7 @@ class LogParser:
                     break
                 
                 event = self.parse_line(line)
-                if any(key in event for key in ['player_register', 'player_unregister', 'player_kick', 
-                                               'mission', 'airdrop', 'helicrash', 'trader', 'convoy']):
+                if not IMPORTANT_EVENT_KEYS.isdisjoint(event):
                     # Store important events
                     important_events.append(event)
                     
@@ -784,18 +806,6 @@ def parse_log_file(file_content: str, hostname: str = "localhost", server_id: st
     Returns:
         List of parsed events from the log file
     """
-    # Define the regex patterns for parsing log entries
-    TIMESTAMP_PATTERN = r'\[([^\]]+)\]\s+'
-    KILL_PATTERN = re.compile(
-        rf'{TIMESTAMP_PATTERN}LogSFPS: Player ([^\s]+) \(([^\)]+)\) killed player ([^\s]+) \(([^\)]+)\)(?: with (.+))?'
-    )
-    PLAYER_JOINED_PATTERN = re.compile(
-        rf'{TIMESTAMP_PATTERN}LogSFPS: Player ([^\s]+) \(([^\)]+)\) connected'
-    )
-    PLAYER_LEFT_PATTERN = re.compile(
-        rf'{TIMESTAMP_PATTERN}LogSFPS: Player ([^\s]+) \(([^\)]+)\) disconnected'
-    )
-    
     # Helper function to parse log timestamps
     def parse_log_timestamp(timestamp_str: str) -> datetime:
         """Parse a timestamp string from the log into a datetime object."""
@@ -808,52 +818,34 @@ def parse_log_file(file_content: str, hostname: str = "localhost", server_id: st
         except ValueError:
             # If parsing fails, return current time
             return datetime.now()
-    # Split content into lines and filter out empty lines
-    lines = [line for line in file_content.splitlines() if line.strip()]
-    
     # Process each line to extract events
     events = []
-    for line in lines:
-        # Check for different event types
-        # Kill events
-        kill_match = KILL_PATTERN.search(line)
-        if kill_match:
-            timestamp, killer_id, killer_name, victim_id, victim_name, weapon = kill_match.groups()
-            events.append({
-                "timestamp": parse_log_timestamp(timestamp),
-                "event_type": "kill",
-                "killer_id": killer_id,
-                "killer_name": killer_name,
-                "victim_id": victim_id,
-                "victim_name": victim_name,
-                "weapon": weapon
-            })
+    for line in file_content.splitlines():
+        match = LOG_EVENT_PATTERN.search(line)
+        if not match:
             continue
-            
-        # Connection events - player joined
-        join_match = PLAYER_JOINED_PATTERN.search(line)
-        if join_match:
-            timestamp, player_id, player_name = join_match.groups()
-            events.append({
-                "timestamp": parse_log_timestamp(timestamp),
-                "event_type": "connection",
-                "player_id": player_id,
-                "player_name": player_name,
-                "action": "joined"
-            })
-            continue
-            
-        # Connection events - player left
-        left_match = PLAYER_LEFT_PATTERN.search(line)
-        if left_match:
-            timestamp, player_id, player_name = left_match.groups()
+
+        # Connection events - player joined or left
+        action = match.group("action")
+        if action is not None:
             events.append({
-                "timestamp": parse_log_timestamp(timestamp),
+                "timestamp": parse_log_timestamp(match.group("timestamp")),
                 "event_type": "connection",
-                "player_id": player_id,
-                "player_name": player_name,
-                "action": "left"
+                "player_id": match.group("player_id"),
+                "player_name": match.group("player_name"),
+                "action": CONNECTION_ACTIONS[action]
             })
             continue
-            
+
+        # Kill events
+        events.append({
+            "timestamp": parse_log_timestamp(match.group("timestamp")),
+            "event_type": "kill",
+            "killer_id": match.group("player_id"),
+            "killer_name": match.group("player_name"),
+            "victim_id": match.group("victim_id"),
+            "victim_name": match.group("victim_name"),
+            "weapon": match.group("weapon")
+        })
+
     return events
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Server document lookup for Tower of Temptation PvP Statistics Bot
+
+This module resolves a server ID to a raw server document across the
+game_servers and servers collections and the guild.servers arrays. It does
+not import the models at module level so it can be exercised and profiled in
+isolation.
+"""
+import asyncio
+import logging
+import re
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Field aliases for mapping servers-collection and guild.servers entries onto
+# Server attributes: (attribute, source fields in priority order, default)
+SERVERS_COLLECTION_ALIASES = (
+    ("sftp_host", ("hostname", "sftp_host"), None),
+    ("sftp_port", ("port", "sftp_port"), 22),
+    ("sftp_username", ("username", "sftp_username"), None),
+    ("sftp_password", ("password", "sftp_password"), None),
+    ("log_path", ("log_path", "sftp_path"), "")
+)
+GUILD_SERVER_ALIASES = (
+    ("sftp_host", ("sftp_host", "hostname"), None),
+    ("sftp_port", ("sftp_port", "port"), 22),
+    ("sftp_username", ("sftp_username", "username"), None),
+    ("sftp_password", ("sftp_password", "password"), None),
+    ("log_path", ("log_path", "sftp_path"), "")
+)
+
+# Runs of digits in a server ID, used to derive a fallback original_server_id
+DIGITS_PATTERN = re.compile(r"\d+")
+
+def extract_numeric_id(server_id: Any) -> Optional[str]:
+    """Extract the digits of a server ID for use as an original_server_id
+
+    Args:
+        server_id: Server ID in any format
+
+    Returns:
+        All digits of the server ID joined together, or None if it has none
+    """
+    if not server_id:
+        return None
+    return ''.join(DIGITS_PATTERN.findall(str(server_id))) or None
+
+def remap_fields(source: Dict[str, Any], aliases: Tuple) -> Dict[str, Any]:
+    """Map aliased connection fields from a raw document onto Server attributes
+
+    Args:
+        source: Raw server document or guild.servers entry
+        aliases: Alias table of (attribute, source fields, default) entries
+
+    Returns:
+        Dict of Server attribute names to values
+    """
+    return {
+        attribute: next((source[field] for field in fields if source.get(field)), default)
+        for attribute, fields, default in aliases
+    }
+
+async def find_server_document(db, server_id: str, guild_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Find the document for a server in any of the server collections
+
+    Args:
+        db: Database connection
+        server_id: Standardized server ID
+        guild_id: Optional Guild ID to verify ownership
+
+    Returns:
+        Document in the format expected by Server.from_document, or None if not found
+    """
+    # Build the query with standardized server ID
+    query = {"server_id": server_id}
+    if guild_id is not None:
+        # Ensure consistent string comparison for guild ID too
+        query["guild_id"] = str(guild_id)
+
+    # Case-insensitive variant backed by the server_id_lower index
+    lower_query = {"server_id_lower": server_id.lower()}
+    if guild_id is not None:
+        lower_query["guild_id"] = str(guild_id)
+
+    # First try exact match
+    document = await db.game_servers.find_one(query)
+    if document is not None:
+        return document
+
+    # On a miss, issue the remaining lookups concurrently instead of one
+    # round-trip at a time, then apply them in priority order
+    logger.debug(f"No exact match for server_id: {server_id}, checking fallback collections")
+    lookups = [
+        db.game_servers.find_one(lower_query),
+        db.servers.find_one(query),
+        db.servers.find_one(lower_query)
+    ]
+    if guild_id is not None:
+        # Only pull back the guild's servers array; entries may store the ID
+        # as an int or with padding/quotes, so they are matched below after
+        # standardizing rather than by an exact Mongo comparison
+        lookups.append(db.guilds.find_one(
+            {"guild_id": str(guild_id)},
+            {"servers": 1}
+        ))
+
+    results = await asyncio.gather(*lookups)
+    if results[0] is not None:
+        return results[0]
+
+    # If still not found, use the servers collection (where CSV data is stored)
+    servers_document = results[1] if results[1] is not None else results[2]
+    if servers_document is not None:
+        logger.info(f"Found server {server_id} in servers collection")
+
+        # Convert to expected format
+        return {
+            "server_id": servers_document.get("server_id"),
+            "guild_id": servers_document.get("guild_id"),
+            "name": servers_document.get("name", "Unknown Server"),
+            **remap_fields(servers_document, SERVERS_COLLECTION_ALIASES),
+            # Extract original server ID for path construction if available
+            "original_server_id": servers_document.get("original_server_id"),
+            "_id": servers_document.get("_id")
+        }
+
+    # If still no results and guild_id is provided, check the guild.servers entries
+    guild_doc = results[3] if guild_id is not None else None
+    if guild_doc is None:
+        return None
+
+    # Import standardize_server_id here to avoid circular imports
+    from utils.server_utils import standardize_server_id
+
+    server = next(
+        (entry for entry in guild_doc.get("servers", [])
+         if standardize_server_id(entry.get("server_id")) == server_id),
+        None
+    )
+    if server is None:
+        return None
+
+    logger.info(f"Found server {server_id} in guild.servers but not in game_servers")
+    # Extract the original numeric server ID for path construction
+    original_server_id = server.get("original_server_id")
+
+    # If original_server_id is not found, try to extract it from server_id
+    if original_server_id is None:
+        # Use the numeric part of server ID as fallback for original ID
+        original_server_id = extract_numeric_id(server.get("server_id"))
+        if original_server_id is not None:
+            logger.info(f"Extracted fallback original_server_id {original_server_id} from server_id {server.get('server_id')}")
+
+    now = datetime.utcnow()
+    return {
+        "server_id": server_id,
+        "guild_id": str(guild_id),
+        "name": server.get("server_name", "Unknown Server"),
+        **remap_fields(server, GUILD_SERVER_ALIASES),
+        "original_server_id": original_server_id,  # Include original numeric server ID
+        "created_at": now,
+        "updated_at": now
+    }
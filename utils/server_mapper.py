@@ -283,6 +283,7 @@ class ServerMapper:
                     {"server_id": uuid},
                     {"$set": {
                         "original_id": original_id,
+                        "server_id_lower": str(uuid).lower(),
                         "updated_at": datetime.now()
                     }},
                     upsert=False  # Don't create new servers
@@ -19,7 +19,9 @@ import random
 import stat
 import time
 import traceback
-from typing import List, Dict, Any, Optional, Tuple, Union, BinaryIO, Set, Callable, Sequence
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional, Tuple, BinaryIO, Set, Callable, Sequence, NamedTuple
 from datetime import datetime, timedelta
 import paramiko
 import asyncssh
@@ -32,12 +34,86 @@ logger = logging.getLogger(__name__)
 CONNECTION_POOL: Dict[str, 'SFTPClient'] = {}
 POOL_LOCK = asyncio.Lock()
 
+# Concurrent SSH handshakes allowed per (host, port, username). SSH daemons
+# start dropping unauthenticated connections past MaxStartups (10 by default),
+# which a scan of many servers hosted on one machine would otherwise hit
+MAX_CONCURRENT_HANDSHAKES = 4
+HANDSHAKE_SEMAPHORES: Dict[Tuple[str, int, str], asyncio.Semaphore] = {}
+
+# After this many consecutive failed connects to an endpoint, further attempts
+# fail immediately until the cooldown ends; then one attempt is let through to
+# probe whether the server is back
+CONNECT_FAILURE_THRESHOLD = 3
+CONNECT_FAILURE_COOLDOWN = 30.0
+# (host, port, username) -> (consecutive failures, monotonic time of next allowed attempt)
+CONNECT_FAILURES: Dict[Tuple[str, int, str], Tuple[int, float]] = {}
+
+# SFTP channels opened on one SSH connection before another connection is
+# made. sshd allows MaxSessions (10 by default) sessions per connection; one
+# is left free so the server never refuses a channel
+MAX_CHANNELS_PER_CONNECTION = 9
+# (host, port, username) -> SSH connections whose channels are shared by SFTP clients
+SSH_CONNECTIONS: Dict[Tuple[str, int, str], List['SharedSSHConnection']] = {}
+
 # Track active operations to prevent resource conflicts
 ACTIVE_OPERATIONS: Dict[str, Set[str]] = {}
 
 # Track operation timeouts to cleanup stuck operations
 OPERATION_TIMEOUTS: Dict[str, datetime] = {}
 
+class FileAttrs(NamedTuple):
+    """Minimal stand-in for asyncssh attributes, carrying only the permissions"""
+    permissions: int
+
+# Shared fallback attributes for entries known only to be a directory or a file
+DIRECTORY_ATTRS = FileAttrs(stat.S_IFDIR | 0o755)  # Directory with standard permissions
+FILE_ATTRS = FileAttrs(stat.S_IFREG | 0o644)  # File with standard permissions
+
+# How long SFTPManager.directory_exists results are reused, in seconds.
+# Missing paths are kept longer: the same nonexistent candidate paths are
+# probed on every historical and killfeed pass, and a directory that appears
+# later only has to wait out one TTL
+DIRECTORY_CACHE_TTL = 5.0
+MISSING_DIRECTORY_CACHE_TTL = 60.0
+# directory_exists results each SFTPManager keeps before starting over
+DIRECTORY_CACHE_MAX_ENTRIES = 1024
+
+# Directory listings one SFTPClient keeps in flight during a recursive search
+MAX_CONCURRENT_LISTINGS = 8
+
+# Names of the per-map subdirectories the game writes deathlogs into
+MAP_DIRECTORY_NAMES = frozenset(("world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"))
+
+# How long SFTPClient.scandir results are reused, in seconds. A processing pass
+# lists the same directories several times within a few seconds; new log files
+# missed by a stale listing are picked up on the next pass
+LISTING_CACHE_TTL = 30.0
+# Directory listings each SFTPClient keeps, least recently used evicted first
+LISTING_CACHE_MAX_ENTRIES = 1000
+
+# Bytes requested per read when streaming a download to a local file. asyncssh
+# splits each read into parallel block requests, so this also sets how much
+# is in flight at once
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Date patterns tried in order when filtering CSV files by date, each with the
+# strptime formats to parse its match, compiled once rather than per file
+CSV_DATE_PATTERNS = (
+    # Standard date formats
+    (re.compile(r'(\d{4}[.-]\d{2}[.-]\d{2})'), ['%Y-%m-%d', '%Y.%m.%d']),
+
+    # Date with time formats
+    (re.compile(r'(\d{4}[.-]\d{2}[.-]\d{2}[.-]\d{2}[.-]\d{2}[.-]\d{2})'), ['%Y-%m-%d-%H-%M-%S', '%Y.%m.%d.%H.%M.%S']),
+    (re.compile(r'(\d{4}[.-]\d{2}[.-]\d{2})[^0-9](\d{2})[^0-9](\d{2})[^0-9](\d{2})'),
+     ['combined:%Y-%m-%d %H:%M:%S', 'combined:%Y.%m.%d %H:%M:%S']),
+
+    # Fallback pattern with just year-month
+    (re.compile(r'(\d{4}[.-]\d{2})'), ['%Y-%m', '%Y.%m'])
+)
+
+# Hourly CSV files, skipped by the date filter unless requested
+HOURLY_FILE_PATTERN = re.compile(r'hourly|(\d{2}\.\d{2}\.\d{2})', re.IGNORECASE)
+
 def with_operation_tracking(op_name: str, timeout_minutes: int = 5):
     """Decorator to track and prevent conflicting SFTP operations with timeout handling.
 
@@ -245,6 +321,126 @@ async def periodic_connection_maintenance(interval: int = 60):
             logger.error(f"Error in connection maintenance: {e}")
             traceback.print_exc()
 
+class SharedSSHConnection:
+    """SSH connection carrying the SFTP channels of several clients"""
+
+    def __init__(self, endpoint: Tuple[str, int, str], connection: Any):
+        """Wrap an open connection with no channels reserved yet
+
+        Args:
+            endpoint: (host, port, username) of the SSH server
+            connection: Open asyncssh client connection
+        """
+        self.endpoint = endpoint
+        self.connection = connection
+        self.channels = 0
+        self.closed = False
+        # Drops the connection from the pool as soon as it closes, e.g. after
+        # missed keepalives, so no client is handed a dead connection
+        self._close_watcher = asyncio.ensure_future(self._watch_closed())
+
+    async def _watch_closed(self) -> None:
+        """Wait for the connection to close, then take it out of the pool"""
+        try:
+            await self.connection.wait_closed()
+        except Exception as e:
+            logger.debug(f"SSH connection to {self.endpoint[0]} closed with error: {e}")
+        self.closed = True
+        unlist_ssh_connection(self)
+
+def unlist_ssh_connection(shared: SharedSSHConnection) -> None:
+    """Stop handing out channels on a connection
+
+    Args:
+        shared: Connection to remove from the pool
+    """
+    connections = SSH_CONNECTIONS.get(shared.endpoint, [])
+    if shared in connections:
+        connections.remove(shared)
+        if not connections:
+            SSH_CONNECTIONS.pop(shared.endpoint, None)
+
+def reserve_ssh_channel(endpoint: Tuple[str, int, str]) -> Optional[SharedSSHConnection]:
+    """Reserve a channel on an open SSH connection to an endpoint
+
+    Args:
+        endpoint: (host, port, username) of the SSH server
+
+    Returns:
+        Connection with a channel reserved, or None if every connection is
+        closed or full
+    """
+    for shared in list(SSH_CONNECTIONS.get(endpoint, ())):
+        if shared.closed:
+            unlist_ssh_connection(shared)
+            continue
+        if shared.channels < MAX_CHANNELS_PER_CONNECTION:
+            shared.channels += 1
+            return shared
+    return None
+
+def share_ssh_connection(endpoint: Tuple[str, int, str], connection: Any) -> SharedSSHConnection:
+    """Make a new SSH connection available to other clients, reserving a channel on it
+
+    Args:
+        endpoint: (host, port, username) of the SSH server
+        connection: Newly opened asyncssh client connection
+
+    Returns:
+        Connection with one channel reserved
+    """
+    shared = SharedSSHConnection(endpoint, connection)
+    shared.channels = 1
+    SSH_CONNECTIONS.setdefault(endpoint, []).append(shared)
+    return shared
+
+def release_ssh_channel(shared: SharedSSHConnection, discard: bool = False) -> None:
+    """Give back a channel reservation, closing the connection once it has none left
+
+    Args:
+        shared: Connection the channel was reserved on
+        discard: Stop opening new channels on this connection, e.g. because the
+            server refused one
+    """
+    shared.channels -= 1
+    if discard or shared.channels <= 0:
+        unlist_ssh_connection(shared)
+    if shared.channels <= 0:
+        try:
+            shared.connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing SSH connection to {shared.endpoint[0]}: {e}")
+
+async def open_sftp_channel(shared: SharedSSHConnection) -> Any:
+    """Start an SFTP client on a reserved channel of a shared connection
+
+    A connection that refuses the channel is given back with discard=True, so
+    no further channels are opened on it.
+
+    Args:
+        shared: Connection with a channel reserved for this client
+
+    Returns:
+        asyncssh SFTP client
+    """
+    try:
+        return await shared.connection.start_sftp_client()
+    except BaseException:
+        release_ssh_channel(shared, discard=True)
+        raise
+
+def record_connect_failure(endpoint: Tuple[str, int, str]) -> None:
+    """Count a failed connect to an endpoint, starting its cooldown at the threshold
+
+    Args:
+        endpoint: (host, port, username) of the SSH server
+    """
+    failures = CONNECT_FAILURES.get(endpoint, (0, 0.0))[0] + 1
+    CONNECT_FAILURES[endpoint] = (failures, time.monotonic() + CONNECT_FAILURE_COOLDOWN)
+    if failures == CONNECT_FAILURE_THRESHOLD:
+        logger.warning(f"SFTP connections to {endpoint[0]}:{endpoint[1]} failed {failures} times in a row, "
+                       f"pausing attempts for {CONNECT_FAILURE_COOLDOWN:.0f}s")
+
 async def get_sftp_client(
     hostname: Optional[str] = None,
     port: Optional[int] = None,
@@ -316,7 +512,12 @@ async def get_sftp_client(
     async with POOL_LOCK:
         if not force_new and conn_key in CONNECTION_POOL:
             client = CONNECTION_POOL[conn_key]
-            if await client.check_connection():
+            # Only the local connection state is checked here. A round-trip
+            # probe would add a full RTT to every reuse while holding the
+            # global pool lock; a connection that died silently fails on its
+            # first real operation instead, and the SFTPManager retry path
+            # replaces it then
+            if client.is_connected:
                 logger.debug(f"Reusing existing SFTP connection: {conn_key}")
                 return client
             else:
@@ -324,31 +525,61 @@ async def get_sftp_client(
                 # Remove invalid connection
                 CONNECTION_POOL.pop(conn_key, None)
 
-    # Create new client with all parameters for maximum flexibility
-    client = SFTPClient(
-        hostname=host, 
-        port=port_num, 
-        username=user, 
-        password=pwd, 
-        timeout=timeout, 
-        max_retries=max_retries, 
-        server_id=server_id,
-        original_server_id=original_server_id,  # Pass original server ID to client
-        sftp_host=host,
-        sftp_port=port_num,
-        sftp_username=user,
-        sftp_password=pwd
-    )
-    connected = await client.connect()
-
-    if connected:
-        # Add to pool
+    # Bound the handshakes in flight to this SSH endpoint
+    endpoint = (host, port_num, user)
+    handshake_slots = HANDSHAKE_SEMAPHORES.get(endpoint)
+    if handshake_slots is None:
+        handshake_slots = HANDSHAKE_SEMAPHORES[endpoint] = asyncio.Semaphore(MAX_CONCURRENT_HANDSHAKES)
+
+    async with handshake_slots:
+        # Another caller for the same server may have connected while we
+        # waited for a slot; reuse that connection rather than handshaking again
+        client = CONNECTION_POOL.get(conn_key)
+        if not force_new and client is not None and client.is_connected:
+            logger.debug(f"Reusing SFTP connection opened while waiting: {conn_key}")
+            return client
+
+        # Fail fast while an endpoint that keeps failing is cooling down
+        failures, retry_at = CONNECT_FAILURES.get(endpoint, (0, 0.0))
+        if failures >= CONNECT_FAILURE_THRESHOLD:
+            now = time.monotonic()
+            if now < retry_at:
+                raise ConnectionError(f"SFTP connections to {host}:{port_num} failed {failures} times in a row, "
+                                      f"not retrying for another {retry_at - now:.0f}s")
+            # Let this attempt probe the server and hold everyone else off until it finishes
+            CONNECT_FAILURES[endpoint] = (failures, now + CONNECT_FAILURE_COOLDOWN)
+
+        # Create new client with all parameters for maximum flexibility
+        client = SFTPClient(
+            hostname=host, 
+            port=port_num, 
+            username=user, 
+            password=pwd, 
+            timeout=timeout, 
+            max_retries=max_retries, 
+            server_id=server_id,
+            original_server_id=original_server_id,  # Pass original server ID to client
+            sftp_host=host,
+            sftp_port=port_num,
+            sftp_username=user,
+            sftp_password=pwd
+        )
+        try:
+            await client.connect()
+        except Exception:
+            record_connect_failure(endpoint)
+            raise
+        # connect() returns the client either way, so check its state
+        if not client.is_connected:
+            record_connect_failure(endpoint)
+            raise ConnectionError(f"Failed to establish SFTP connection to {host}:{port_num}")
+        CONNECT_FAILURES.pop(endpoint, None)
+
+        # Add to pool before giving up the slot so waiters for this server find it
         async with POOL_LOCK:
             CONNECTION_POOL[conn_key] = client
 
-        return client
-    else:
-        raise ConnectionError(f"Failed to establish SFTP connection to {host}:{port_num}")
+    return client
 
 class SFTPManager:
     """Manager for SFTP connections with high-level operations
@@ -536,6 +767,8 @@ class SFTPManager:
             logger.info(f"Using server ID '{server_id}' for path construction")
         self.client = None
         self.last_error = None
+        # path -> (expiry on the monotonic clock, is directory)
+        self._directory_cache: Dict[str, Tuple[float, bool]] = {}
         
     @property
     def is_connected(self) -> bool:
@@ -582,6 +815,26 @@ class SFTPManager:
             # Still return self (manager) for consistent method chaining
             return self
 
+    async def _reacquire_client(self, attempt: int) -> None:
+        """Get a usable client back after a failed operation
+
+        If a cheap liveness check shows the connection is still up, the
+        failure was in the operation itself and the retry can go straight
+        ahead on the same connection. Otherwise the dead connection (which
+        check_connection has already dropped from the pool) is replaced
+        after an exponential backoff with jitter, so many managers failing
+        together do not all reconnect at once.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+        """
+        if self.client is not None and await self.client.check_connection():
+            return
+
+        await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+        self.client = None
+        await self.connect()
+
     # Delegation methods to forward calls to the client
     async def exists(self, path: str) -> bool:
         """Check if a path exists
@@ -602,45 +855,6 @@ class SFTPManager:
             logger.error(f"Failed to check if path exists {path}: {e}")
             return False
             
-    async def directory_exists(self, path: str) -> bool:
-        """Check if a directory exists on the remote server
-
-        Args:
-            path: Directory path to check
-
-        Returns:
-            bool: True if directory exists, False otherwise
-        """
-        # Validate input
-        if not path:
-            logger.error("Path parameter is empty in directory_exists")
-            return False
-
-        # Ensure client is connected
-        if not self.client:
-            logger.info(f"Creating new SFTP client connection for directory_exists({path})")
-            if not await self.connect():
-                logger.error(f"Failed to establish SFTP connection for directory_exists({path})")
-                return False
-
-        # Check if path exists and is a directory
-        try:
-            # First try to list the directory - if it succeeds, it's a directory
-            await self.listdir(path)
-            return True
-        except Exception as list_err:
-            # If listing fails, try to get file attributes
-            try:
-                # Get file attributes
-                if hasattr(self.client, 'sftp'):
-                    attrs = await self.client.sftp.stat(path)
-                    # Check if it's a directory using the stat module
-                    return stat.S_ISDIR(attrs.permissions)
-                return False
-            except Exception:
-                # If both methods fail, the directory doesn't exist
-                return False
-
     async def find_files_by_pattern(self, directory: str, pattern: str, recursive: bool = False, max_depth: int = 5) -> List[str]:
         """Find files matching a pattern in a directory
 
@@ -729,19 +943,14 @@ class SFTPManager:
             # As a fallback, use get_file_info and extract permissions
             file_info = await self.get_file_info(path)
             if file_info and isinstance(file_info, dict):
-                # Create a simple object with permissions attribute
-                class FileAttrs:
-                    def __init__(self, permissions):
-                        self.permissions = permissions
-                        
                 # Check if file_info contains permissions
                 if 'permissions' in file_info:
                     return FileAttrs(file_info['permissions'])
                 # Check if it's a directory based on is_dir flag
                 elif file_info.get('is_dir', False):
-                    return FileAttrs(stat.S_IFDIR | 0o755)  # Directory with standard permissions
+                    return DIRECTORY_ATTRS
                 elif file_info.get('is_file', False):
-                    return FileAttrs(stat.S_IFREG | 0o644)  # File with standard permissions
+                    return FILE_ATTRS
                     
             # If all methods fail, return None
             return None
@@ -777,81 +986,6 @@ class SFTPManager:
             logger.warning(f"Failed to check if path is a file {path}: {e}")
             return False
 
-    async def download_file(self, remote_path: str, local_path: Optional[str] = None) -> Optional[bytes]:
-        """Download a file from the SFTP server
-
-        Args:
-            remote_path: Remote file path
-            local_path: Optional local file path to save to
-
-        Returns:
-            Optional[bytes]: File content if local_path is not provided, None otherwise
-        """
-        if not self.client:
-            logger.error(f"SFTP client is missing when trying to download file: {remote_path}")
-            return None
-
-        try:
-            return await self.client.download_file(remote_path, local_path)
-        except Exception as e:
-            logger.error(f"Failed to download file {remote_path}: {e}")
-            return None
-
-    async def list_files(self, directory: str, pattern: Optional[str] = None) -> List[str]:
-        """List files in a directory
-
-        Args:
-            directory: Directory to list
-            pattern: Optional regex pattern to filter filenames
-
-        Returns:
-            List[str]: List of filenames (relative to the directory, NOT full paths)
-        """
-        if not self.client:
-            logger.error(f"SFTP client is missing when trying to list files: {directory}")
-            return []
-
-        # CRITICAL FIX: Sanitize directory path
-        # Ensure there are no doubled slashes that could cause path issues
-        if directory:
-            directory = directory.replace('//', '/')
-
-        try:
-            # Log the exact pattern being used for file filtering
-            if pattern:
-                logger.info(f"Listing files in {directory} with pattern: {pattern}")
-
-            if hasattr(self.client, 'list_files'):
-                # Using client's dedicated list_files method
-                files = await self.client.list_files(directory, pattern or '')
-                logger.info(f"Found {len(files)} files using client.list_files in {directory}")
-                return files
-            elif pattern is None and hasattr(self.client, '_sftp_client') and hasattr(self.client._sftp_client, 'listdir'):
-                # Make sure client is not None before accessing its attributes
-                if self.client and self.client._sftp_client:
-                    # Using raw SFTP listdir method
-                    files = await self.client._sftp_client.listdir(directory)
-                    logger.info(f"Found {len(files)} files using _sftp_client.listdir in {directory}")
-                    return files
-                return []
-            else:
-                # Fallback to find_files_by_pattern
-                if hasattr(self.client, 'find_files_by_pattern'):
-                    # Use find_files pattern matching for more flexibility
-                    files = await self.client.find_files_by_pattern(directory, pattern or '.*', recursive=False)
-                    logger.info(f"Found {len(files)} files using find_files_by_pattern in {directory}")
-                    
-                    # CRITICAL FIX: Ensure we're returning just filenames, not full paths
-                    # If the client returned full paths, extract just the filename part
-                    if files and files[0].startswith('/'):
-                        # Strip the directory prefix to get just the filenames
-                        return [os.path.basename(f) for f in files]
-                    return files
-                return []
-        except Exception as e:
-            logger.error(f"Failed to list files in {directory}: {e}")
-            return []
-            
     async def listdir(self, directory: str) -> List[str]:
         """List all files and directories in a directory (compatibility method)
         
@@ -864,129 +998,6 @@ class SFTPManager:
         # This is a compatibility method that delegates to list_files
         return await self.list_files(directory)
 
-    async def read_file(self, remote_path: str, start_line: int = 0, max_lines: int = -1) -> Optional[Union[bytes, List[str]]]:
-        """Read a file from the SFTP server
-
-        Args:
-            remote_path: Remote file path
-            start_line: Line to start reading from (0-based)
-            max_lines: Maximum number of lines to read (-1 for all)
-
-        Returns:
-            Optional[Union[bytes, List[str]]]: File content as bytes or list of lines
-        """
-        if not self.client:
-            logger.error(f"SFTP client is missing when trying to read file: {remote_path}")
-            return None
-
-        # CRITICAL FIX: Sanitize remote path
-        # Ensure there are no doubled slashes that could cause path issues
-        if remote_path:
-            remote_path = remote_path.replace('//', '/')
-            logger.debug(f"Sanitized path for reading: {remote_path}")
-
-        try:
-            # Log that we're attempting to read from this file
-            logger.info(f"Reading file: {remote_path}")
-            
-            # First try to directly read the file content if the client supports it
-            if hasattr(self.client, 'read_file'):
-                content = await self.client.read_file(remote_path, start_line, max_lines)
-                
-                # CRITICAL FIX: Log the content type for better debugging
-                if content is not None:
-                    logger.info(f"Successfully read content from {remote_path} " 
-                              f"(type: {type(content)}, length: {len(content) if hasattr(content, '__len__') else 'N/A'})")
-                    return content
-                else:
-                    logger.warning(f"No content read from {remote_path}")
-                    return None
-            else:
-                # Fallback to download_file if read_file is not available
-                logger.info(f"Falling back to download_file for {remote_path}")
-                content = await self.download_file(remote_path)
-                if isinstance(content, bytes):
-                    # If we receive bytes, return it directly
-                    logger.info(f"Successfully downloaded {len(content)} bytes from {remote_path}")
-                    return content
-                else:
-                    logger.warning(f"Failed to download content from {remote_path}")
-                    return None
-        except Exception as e:
-            logger.error(f"Failed to read file {remote_path}: {e}")
-            traceback.print_exc()
-            return None
-
-    async def read_csv_lines(self, remote_path: str, encoding: str = 'utf-8', fallback_encodings: Optional[List[str]] = None, timeout: Optional[float] = None) -> Optional[List[str]]:
-        """Read CSV lines from a remote file
-
-        Args:
-            remote_path: Path to CSV file
-            encoding: Encoding to use
-            fallback_encodings: List of encodings to try if the primary encoding fails
-            timeout: Optional timeout for the operation in seconds
-
-        Returns:
-            Optional[List[str]]: List of CSV lines
-        """
-        if not self.client:
-            logger.error(f"SFTP client is missing when trying to read CSV lines: {remote_path}")
-            return None
-
-        try:
-            # Ensure we don't pass fallback_encodings as timeout
-            # This addresses a type issue in the method signature
-            if hasattr(self.client, 'read_csv_lines'):
-                # Check if the client's method accepts timeout
-                import inspect
-                client_method = getattr(self.client, 'read_csv_lines')
-                sig = inspect.signature(client_method)
-                
-                if 'timeout' in sig.parameters:
-                    # Make sure we're passing parameters in the correct order
-                    # remote_path, encoding, timeout, fallback_encodings
-                    return await self.client.read_csv_lines(remote_path, encoding, timeout, fallback_encodings)
-                else:
-                    # Fall back to original call without timeout
-                    # Make sure we're not passing timeout as fallback_encodings
-                    return await self.client.read_csv_lines(remote_path, encoding, fallback_encodings=fallback_encodings)
-            else:
-                # Fall back to read_file if read_csv_lines doesn't exist
-                lines = await self.read_file(remote_path)
-                return lines
-        except Exception as e:
-            logger.error(f"Failed to read CSV lines from {remote_path}: {e}")
-            return None
-
-    async def get_file_stats(self, path: str) -> Optional[Any]:
-        """Get file stats (modification time, size, etc.)
-
-        Args:
-            path: Path to file
-
-        Returns:
-            Optional[Any]: File stats object or None if file not found
-        """
-        if not self.client:
-            logger.error(f"SFTP client is missing when trying to get file stats: {path}")
-            return None
-
-        try:
-            # Try to get file stats - first try through stat if available
-            if hasattr(self.client, 'stat'):
-                return await self.client.stat(path)
-
-            # Fallback to get_file_info method
-            file_info = await self.get_file_info(path)
-            if file_info:
-                # Convert file_info to a stat-like object
-                return file_info
-
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get file stats for {path}: {e}")
-            return None
-
     async def disconnect(self) -> None:
         """Disconnect from SFTP server with proper resource cleanup
 
@@ -1285,9 +1296,7 @@ class SFTPManager:
                 # If this isn't the last attempt, try reconnecting
                 if attempt < max_attempts:
                     logger.info(f"Attempting to reconnect for list_files retry ({attempt}/{max_attempts})")
-                    await self.disconnect()
-                    await asyncio.sleep(1)  # Brief delay before retry
-                    await self.connect()
+                    await self._reacquire_client(attempt)
 
         # If we get here, all attempts failed
         logger.warning(f"All attempts to list files in {directory} failed")
@@ -1373,9 +1382,7 @@ class SFTPManager:
                 # If this isn't the last attempt, try reconnecting
                 if attempt < max_attempts:
                     logger.info(f"Attempting to reconnect for find_csv_files retry ({attempt}/{max_attempts})")
-                    await self.disconnect()
-                    await asyncio.sleep(1)  # Brief delay before retry
-                    await self.connect()
+                    await self._reacquire_client(attempt)
 
         # If we get here, all attempts failed
         logger.warning(f"All attempts to find CSV files in {directory} failed")
@@ -1425,9 +1432,7 @@ class SFTPManager:
                 # If this isn't the last attempt, try reconnecting
                 if attempt < max_attempts:
                     logger.info(f"Attempting to reconnect for read_csv_lines retry ({attempt}/{max_attempts})")
-                    await self.disconnect()
-                    await asyncio.sleep(1)  # Brief delay before retry
-                    await self.connect()
+                    await self._reacquire_client(attempt)
 
         # If we get here, all attempts failed
         logger.warning(f"All attempts to read CSV file {path} failed")
@@ -1447,6 +1452,11 @@ class SFTPManager:
             logger.error("Path parameter is empty in directory_exists")
             return False
 
+        # Answer repeated probes of the same path from the cache
+        cached = self._directory_cache.get(path)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
         # Ensure client is connected
         if not self.client:
             logger.info(f"Creating new SFTP client connection for directory_exists({path})")
@@ -1460,18 +1470,22 @@ class SFTPManager:
             try:
                 # Check if path exists and is a directory
                 try:
-                    # First try to list the directory - if it succeeds, it's a directory
-                    await self.listdir(path)
-                    return True
-                except Exception as list_err:
-                    # If listing fails, try to get file attributes
-                    try:
-                        attrs = await self.client.get_file_attrs(path)
-                        # Check if it's a directory
-                        return attrs is not None and stat.S_ISDIR(attrs.permissions)
-                    except Exception:
-                        # If both methods fail, the directory doesn't exist
-                        return False
+                    # A single stat tells us both whether the path exists and
+                    # whether it is a directory
+                    attrs = await self.client.get_file_attrs(path)
+                except (asyncssh.SFTPNoSuchFile, FileNotFoundError):
+                    # Only a confirmed missing path counts as "not a directory";
+                    # any other error goes to the retry handler below uncached
+                    attrs = None
+                is_directory = attrs is not None and stat.S_ISDIR(attrs.permissions)
+
+                if len(self._directory_cache) >= DIRECTORY_CACHE_MAX_ENTRIES:
+                    self._directory_cache.clear()
+                # Only paths confirmed not to exist get the longer TTL; a path
+                # that exists but is not a directory keeps the short one
+                ttl = MISSING_DIRECTORY_CACHE_TTL if attrs is None else DIRECTORY_CACHE_TTL
+                self._directory_cache[path] = (time.monotonic() + ttl, is_directory)
+                return is_directory
 
             except Exception as e:
                 self.last_error = str(e)
@@ -1480,9 +1494,7 @@ class SFTPManager:
                 # If this isn't the last attempt, try reconnecting
                 if attempt < max_attempts:
                     logger.info(f"Attempting to reconnect for directory_exists retry ({attempt}/{max_attempts})")
-                    await self.disconnect()
-                    await asyncio.sleep(1)  # Brief delay before retry
-                    await self.connect()
+                    await self._reacquire_client(attempt)
 
         # If we get here, all attempts failed
         logger.warning(f"All attempts to check if directory exists failed: {path}")
@@ -1522,14 +1534,7 @@ class SFTPManager:
                         file_info['st_mtime'] = file_info['mtime']
 
                 # Create a simple object to mimic os.stat_result
-                class StatResult:
-                    pass
-
-                result = StatResult()
-                for key, value in file_info.items():
-                    setattr(result, key, value)
-
-                return result
+                return SimpleNamespace(**file_info)
 
             # Return the original result if it's not a dict
             return file_info
@@ -1716,9 +1721,7 @@ class SFTPManager:
                 # If this isn't the last attempt, try reconnecting
                 if attempt < max_attempts:
                     logger.info(f"Attempting to reconnect for download_file retry ({attempt}/{max_attempts})")
-                    await self.disconnect()
-                    await asyncio.sleep(1)  # Brief delay before retry
-                    await self.connect()
+                    await self._reacquire_client(attempt)
 
         # If we get here, all attempts failed
         logger.warning(f"All attempts to download file {path} failed")
@@ -1794,6 +1797,8 @@ class SFTPClient:
         self.max_retries = max_retries
         self._sftp_client = None
         self._ssh_client = None
+        # Shared SSH connection this client's SFTP channel is open on
+        self._shared_connection: Optional[SharedSSHConnection] = None
         self._connected = False
         self._connection_attempts = 0
         self.server_id = str(server_id) if server_id else None
@@ -1819,6 +1824,10 @@ class SFTPClient:
         self.host = hostname  # Alias for compatibility
         self.operation_count = 0
         self.last_activity = datetime.now()
+        # Bounds the directory listings a recursive search has in flight
+        self._listing_slots = asyncio.Semaphore(MAX_CONCURRENT_LISTINGS)
+        # directory -> (expiry on the monotonic clock, scandir entries)
+        self._listing_cache: 'OrderedDict[str, Tuple[float, List[Tuple[str, Any]]]]' = OrderedDict()
 
     @property
     def is_connected(self) -> bool:
@@ -1915,6 +1924,9 @@ class SFTPClient:
             await asyncio.sleep(30)
             self._connection_attempts = 1
 
+        # Give back the channel of the connection being replaced
+        self._release_connection()
+
         # For cleanup in finally block
         temp_ssh_client = None
         
@@ -1935,25 +1947,39 @@ class SFTPClient:
 
             # Use asyncio timeout for more reliable timeouts
             async with asyncio.timeout(self.timeout):
-                # Create asyncssh connection with improved settings
-                temp_ssh_client = await asyncssh.connect(
-                    host=self.hostname,
-                    port=self.port,
-                    username=self.username,
-                    password=self.password,
-                    known_hosts=None,  # Disable known hosts check
-                    connect_timeout=self.timeout,
-                    login_timeout=self.timeout,
-                    keepalive_interval=30,   # Send keepalive every 30 seconds
-                    keepalive_count_max=3    # Disconnect after 3 failed keepalives
-                )
-                
-                # Only assign to instance var after successful connection
-                self._ssh_client = temp_ssh_client
-                temp_ssh_client = None  # Prevent double close in finally block
+                # Open the SFTP channel on an existing connection to this SSH
+                # server when one has a free session, skipping the handshake
+                endpoint = (self.hostname, self.port, self.username)
+                shared = reserve_ssh_channel(endpoint)
+                if shared is not None:
+                    try:
+                        self._sftp_client = await open_sftp_channel(shared)
+                    except Exception as e:
+                        # The pooled connection went bad since its last use; the
+                        # endpoint itself may be fine, so open a fresh connection
+                        # rather than fail this attempt
+                        logger.info(f"Shared SSH connection to {self.hostname} refused a channel, opening a new one: {e}")
+                        shared = None
+                if shared is None:
+                    # Create asyncssh connection with improved settings
+                    temp_ssh_client = await asyncssh.connect(
+                        host=self.hostname,
+                        port=self.port,
+                        username=self.username,
+                        password=self.password,
+                        known_hosts=None,  # Disable known hosts check
+                        connect_timeout=self.timeout,
+                        login_timeout=self.timeout,
+                        keepalive_interval=30,   # Send keepalive every 30 seconds
+                        keepalive_count_max=3    # Disconnect after 3 failed keepalives
+                    )
+                    shared = share_ssh_connection(endpoint, temp_ssh_client)
+                    temp_ssh_client = None  # Closed through release_ssh_channel from here on
 
-                # Get SFTP client
-                self._sftp_client = await self._ssh_client.start_sftp_client()
+                    # Get SFTP client
+                    self._sftp_client = await open_sftp_channel(shared)
+                self._shared_connection = shared
+                self._ssh_client = shared.connection
 
             self._connected = True
             self._connection_attempts = 0
@@ -2038,26 +2064,27 @@ class SFTPClient:
                 logger.info(f"Clearing {len(ACTIVE_OPERATIONS[self.server_id])} active operations for {self.server_id}")
                 ACTIVE_OPERATIONS.pop(self.server_id, None)
 
-        # Close SFTP client
-        if self._sftp_client:
-            try:
-                # The SFTP client will be closed when the SSH client is closed
-                # but we set it to None to avoid any further operations
-                pass
-            except Exception as e:
-                logger.warning(f"Error handling SFTP client: {e}")
-            self._sftp_client = None
+        # Close the SFTP channel, and the SSH connection if no other client uses it
+        self._release_connection()
 
-        # Close SSH client
-        if self._ssh_client:
+        self._connected = False
+        logger.info(f"Disconnected from SFTP server: {self.connection_id}")
+
+    def _release_connection(self) -> None:
+        """Close this client's SFTP channel and give back its SSH connection slot"""
+        if self._sftp_client is not None:
             try:
-                self._ssh_client.close()
+                # Other clients may still have channels open on the SSH
+                # connection, so only this session is ended here
+                self._sftp_client.exit()
             except Exception as e:
-                logger.warning(f"Error closing SSH client: {e}")
-            self._ssh_client = None
+                logger.warning(f"Error closing SFTP channel: {e}")
+            self._sftp_client = None
 
-        self._connected = False
-        logger.info(f"Disconnected from SFTP server: {self.connection_id}")
+        if self._shared_connection is not None:
+            release_ssh_channel(self._shared_connection)
+            self._shared_connection = None
+        self._ssh_client = None
 
     @retryable(max_retries=1, delay=1.0, backoff=1.5, 
                exceptions=(asyncio.TimeoutError, ConnectionError, OSError))
@@ -2119,21 +2146,81 @@ class SFTPClient:
         Returns:
             List of filenames
         """
-        await self.ensure_connected()
-
         try:
-            if self._sftp_client:
-                entries = await self._sftp_client.listdir(directory)
-                self.last_activity = datetime.now()  # Update last activity timestamp
-                self.operation_count += 1
-                return entries
-            else:
-                logger.error(f"SFTP client is missing when trying to list directory {directory}")
-                return []
+            # Shares scandir's listing cache
+            return [name for name, _ in await self.scandir(directory)]
         except Exception as e:
             logger.error(f"Failed to list directory {directory}: {e}")
             return []
 
+    async def scandir(self, directory: str) -> List[Tuple[str, Any]]:
+        """List a directory together with the attributes of each entry
+
+        readdir returns each entry's attributes in the same round trip as its
+        name, so callers can tell files from directories without a stat per
+        entry.
+
+        Non-empty listings are reused for LISTING_CACHE_TTL seconds, so the
+        repeated searches of one processing pass don't list the same directory
+        again. Empty and failed listings are never cached.
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            List of (filename, attrs) tuples, excluding . and ..
+
+        Raises:
+            ConnectionError: If there is no SFTP session
+        """
+        cached = self._listing_cache.get(directory)
+        if cached is not None and cached[0] > time.monotonic():
+            self._listing_cache.move_to_end(directory)
+            return list(cached[1])
+
+        await self.ensure_connected()
+
+        if not self._sftp_client:
+            raise ConnectionError(f"SFTP client is missing when trying to scan directory {directory}")
+
+        names = await self._sftp_client.readdir(directory)
+        self.last_activity = datetime.now()  # Update last activity timestamp
+        self.operation_count += 1
+        entries = [(name.filename, name.attrs) for name in names if name.filename not in ('.', '..')]
+
+        # An empty listing is often a directory the game hasn't written to
+        # yet, so it is not cached and its first files show up immediately
+        if entries:
+            self._listing_cache[directory] = (time.monotonic() + LISTING_CACHE_TTL, entries)
+            self._listing_cache.move_to_end(directory)
+            if len(self._listing_cache) > LISTING_CACHE_MAX_ENTRIES:
+                self._listing_cache.popitem(last=False)
+        return list(entries)
+
+    async def _classify_entry(self, path: str, attrs: Any) -> Tuple[bool, bool]:
+        """Work out whether a scanned entry is a file or a directory
+
+        Uses the type readdir already returned, and only falls back to a stat
+        for entries it does not classify, such as symlinks.
+
+        Args:
+            path: Full path of the entry
+            attrs: Attributes returned for the entry by scandir
+
+        Returns:
+            Tuple of (is_file, is_dir)
+        """
+        entry_type = getattr(attrs, 'type', None)
+        if entry_type == 1:  # asyncssh.FILEXFER_TYPE_REGULAR = 1
+            return True, False
+        if entry_type == 2:  # asyncssh.FILEXFER_TYPE_DIRECTORY = 2
+            return False, True
+
+        entry_info = await self.get_file_info(path)
+        if not entry_info:
+            return False, False
+        return entry_info["is_file"], entry_info["is_dir"]
+
     async def get_file_info(self, path: str) -> Optional[Dict[str, Any]]:
         """Get file information
 
@@ -2181,25 +2268,34 @@ class SFTPClient:
             
         Returns:
             File attributes or None if not found
+
+        Raises:
+            ConnectionError: If there is no SFTP session
+            Exception: Any other failure except the path not existing, so callers
+                can tell a missing path from a broken connection
         """
         await self.ensure_connected()
         
+        # ensure_connected returns quietly when it can't reconnect, so a
+        # missing session has to be reported as an error, not as a missing path
+        if not self._sftp_client:
+            raise ConnectionError(f"SFTP client is missing when trying to get file attributes for {path}")
+        
         try:
-            if self._sftp_client:
-                # Get the file's stat information directly
-                stat = await self._sftp_client.stat(path)
-                
-                # Update activity tracking
-                self.last_activity = datetime.now()
-                self.operation_count += 1
-                
-                return stat
-            else:
-                logger.error(f"SFTP client is missing when trying to get file attributes for {path}")
-                return None
+            # Get the file's stat information directly
+            stat = await self._sftp_client.stat(path)
+            
+            # Update activity tracking
+            self.last_activity = datetime.now()
+            self.operation_count += 1
+            
+            return stat
+        except (asyncssh.SFTPNoSuchFile, FileNotFoundError):
+            logger.debug(f"No file attributes for {path}: path does not exist")
+            return None
         except Exception as e:
             logger.error(f"Failed to get file attributes for {path}: {e}")
-            return None
+            raise
 
     async def _download_to_memory(self, remote_path: str) -> Optional[bytes]:
         """Helper to download file to memory with multiple implementation strategies
@@ -2387,9 +2483,20 @@ class SFTPClient:
                         if isinstance(self._sftp_client, asyncssh.SFTPClient):
                             logger.info(f"Using AsyncSSH open+write method instead of get")
                             async with await self._sftp_client.open(remote_path, 'rb') as remote_file:
-                                content = await remote_file.read()
                                 with open(local_path, 'wb') as local_file:
-                                    local_file.write(content)
+                                    # Reserve the whole file up front so it is laid out
+                                    # contiguously, then stream it across in large chunks
+                                    # rather than holding all of it in memory
+                                    remote_size = (await remote_file.stat()).size
+                                    if remote_size and hasattr(os, 'posix_fallocate'):
+                                        os.posix_fallocate(local_file.fileno(), 0, remote_size)
+                                    while True:
+                                        chunk = await remote_file.read(DOWNLOAD_CHUNK_SIZE)
+                                        if not chunk:
+                                            break
+                                        local_file.write(chunk)
+                                    # Drop any reserved space the file no longer fills
+                                    local_file.truncate()
                         else:
                             # Use standard get method for other clients
                             await self._sftp_client.get(remote_path, local_path)
@@ -2816,7 +2923,8 @@ class SFTPClient:
 
             for attempt in range(1, max_attempts + 1):
                 try:
-                    entries = await self._sftp_client.listdir(directory)
+                    async with self._listing_slots:
+                        entries = await self.scandir(directory)
                     if entries:
                         logger.debug(f"Found {len(entries)} entries in {directory}")
                         break
@@ -2838,12 +2946,11 @@ class SFTPClient:
                 logger.debug(f"No entries found in directory {directory} after all attempts")
                 return result
 
-            # Process all entries
-            for entry in entries:
-                # Avoid . and .. entries that could cause loops
-                if entry in ('.', '..'):
-                    continue
+            # Subdirectories are searched concurrently once this directory is done
+            subdirectories = []
 
+            # Process all entries (scandir already drops . and .. which could cause loops)
+            for entry, entry_attrs in entries:
                 # STRICT FILE FILTERING: Only process entries that match our pattern
                 # This is critical for avoiding .sav and other unwanted files
                 # Skip any files that don't match our pattern immediately
@@ -2861,30 +2968,33 @@ class SFTPClient:
                 entry_path = f"{directory}{entry}"
 
                 try:
-                    # Get file info with proper error handling
-                    entry_info = await self.get_file_info(entry_path)
+                    # Use the type returned by the listing, with proper error handling
+                    is_file, is_dir = await self._classify_entry(entry_path, entry_attrs)
 
-                    if not entry_info:
-                        # Silently continue without logging
-                        continue
-
-                    # Check if it's a file matching our pattern (CSV or log)
-                    if entry_info["is_file"] and pattern_re.search(entry):
+                    # The name was already matched against the pattern above
+                    if is_file:
                         # Only add to results without any logging (essential for reducing console spam)
                         result.append(entry_path)
 
                     # Recursively explore directories if needed
-                    elif entry_info["is_dir"] and recursive:
+                    elif is_dir and recursive:
                         # Only log at the top level to avoid spam
                         if current_depth <= 1:
                             logger.debug(f"Exploring subdirectory: {entry_path}")
-                        # Pass result by reference for batch processing efficiency
-                        await self._find_files_recursive(entry_path, pattern_re, result, recursive, max_depth, current_depth + 1)
+                        subdirectories.append(entry_path)
 
                 except Exception:
                     # Silently continue without logging every error
                     continue
 
+            # Pass result by reference for batch processing efficiency. Listings
+            # overlap on the one SFTP session, bounded by _listing_slots
+            await asyncio.gather(
+                *(self._find_files_recursive(subdirectory, pattern_re, result, recursive, max_depth, current_depth + 1)
+                  for subdirectory in subdirectories),
+                return_exceptions=True
+            )
+
         except Exception as e:
             logger.error(f"Failed to process directory {directory}: {e}")
             logger.debug(f"Directory error details:\n{traceback.format_exc()}")
@@ -3060,7 +3170,6 @@ class SFTPClient:
         logger.info(f"Using standardized path: {directory}")
 
         # Check if we need to look for map subdirectories first
-        known_map_dirs = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
         map_directories = []
 
         # If we're in the deathlogs directory, check for map subdirectories
@@ -3069,31 +3178,27 @@ class SFTPClient:
 
             # First try to list the directory contents to find map subdirectories
             try:
-                entries = await self._sftp_client.listdir(directory)
+                entries = await self.scandir(directory)
                 logger.debug(f"Found {len(entries)} entries in directory")
 
-                # Check each entry to see if it's a directory
-                for entry in entries:
-                    if entry in (".", ".."):
+                # Check each entry to see if it's a map directory
+                for entry, entry_attrs in entries:
+                    # Only entries named like one of our known map directories
+                    # or containing "world" or "map" are candidates. Checking the
+                    # name first keeps other entries from costing a stat when
+                    # readdir did not report their type
+                    entry_lower = entry.lower()
+                    if not (entry in MAP_DIRECTORY_NAMES or "world" in entry_lower or "map" in entry_lower):
                         continue
 
                     entry_path = os.path.join(directory, entry)
                     try:
                         # Check if it's a directory
-                        is_dir = False
-                        try:
-                            stat_info = await self._sftp_client.stat(entry_path)
-                            is_dir = stat.S_ISDIR(stat_info.st_mode)
-                        except:
-                            # If stat fails, try get_file_info which has better error handling
-                            file_info = await self.get_file_info(entry_path)
-                            is_dir = file_info and file_info.get("is_dir", False)
+                        _, is_dir = await self._classify_entry(entry_path, entry_attrs)
 
                         if is_dir:
-                            # Check if entry is one of our known map directory names or contains "world" or "map"
-                            if entry in known_map_dirs or "world" in entry.lower() or "map" in entry.lower():
-                                logger.debug(f"Found map directory: {entry_path}")
-                                map_directories.append(entry_path)
+                            logger.debug(f"Found map directory: {entry_path}")
+                            map_directories.append(entry_path)
                     except Exception as e:
                         logger.debug(f"Error checking if {entry_path} is a directory: {e}")
             except Exception as e:
@@ -3135,7 +3240,7 @@ class SFTPClient:
         if map_directories:
             logger.debug(f"Searching in {len(map_directories)} map directories")
 
-            for map_dir in map_directories:
+            async def search_map_directory(map_dir: str) -> List[str]:
                 # Only use the primary pattern first for efficiency
                 try:
                     map_files = await self.find_files_by_pattern(
@@ -3147,8 +3252,7 @@ class SFTPClient:
 
                     if map_files:
                         logger.debug(f"Found {len(map_files)} files in map directory")
-                        all_csv_files.extend(map_files)
-                        continue  # Go to next map directory since we found files
+                        return map_files
 
                     # Try fallback pattern only if needed
                     map_files = await self.find_files_by_pattern(
@@ -3160,9 +3264,15 @@ class SFTPClient:
 
                     if map_files:
                         logger.debug(f"Found {len(map_files)} generic CSV files in map directory")
-                        all_csv_files.extend(map_files)
+                    return map_files
                 except Exception as e:
                     logger.warning(f"Error searching map directory: {e}")
+                    return []
+
+            # List all map directories at once so their round trips overlap;
+            # results are still collected in directory order
+            for map_files in await asyncio.gather(*(search_map_directory(map_dir) for map_dir in map_directories)):
+                all_csv_files.extend(map_files)
 
             # If we found CSV files in map directories, use those
             if all_csv_files:
@@ -3245,14 +3355,14 @@ class SFTPClient:
                         logger.debug(f"Checking for map subdirectories in: {deathlog_dir}")
                         try:
                             # List all subdirectories (these would be the map directories)
-                            dirs = await self._sftp_client.listdir(deathlog_dir)
-                            for subdir in dirs:
+                            dirs = await self.scandir(deathlog_dir)
+                            for subdir, subdir_attrs in dirs:
                                 if not subdir.startswith("."):  # Skip hidden directories
                                     map_path = os.path.join(deathlog_dir, subdir)
                                     try:
-                                        # Check if it's a directory using file_info
-                                        file_info = await self.get_file_info(map_path)
-                                        if file_info and file_info.get("is_dir", False):
+                                        # Check if it's a directory from the listing
+                                        _, is_dir = await self._classify_entry(map_path, subdir_attrs)
+                                        if is_dir:
                                             map_subdirs.append(map_path)
                                             logger.debug(f"Found map subdirectory: {map_path}")
                                     except Exception as subdir_err:
@@ -3316,20 +3426,6 @@ class SFTPClient:
         filtered_files = []
         file_dates = {}  # Store dates for sorting
 
-        # Date format patterns to try
-        date_patterns = [
-            # Standard date formats
-            (r'(\d{4}[.-]\d{2}[.-]\d{2})', ['%Y-%m-%d', '%Y.%m.%d']),
-
-            # Date with time formats
-            (r'(\d{4}[.-]\d{2}[.-]\d{2}[.-]\d{2}[.-]\d{2}[.-]\d{2})', ['%Y-%m-%d-%H-%M-%S', '%Y.%m.%d.%H.%M.%S']),
-            (r'(\d{4}[.-]\d{2}[.-]\d{2})[^0-9](\d{2})[^0-9](\d{2})[^0-9](\d{2})', 
-             ['combined:%Y-%m-%d %H:%M:%S', 'combined:%Y.%m.%d %H:%M:%S']),
-
-            # Fallback pattern with just year-month
-            (r'(\d{4}[.-]\d{2})', ['%Y-%m', '%Y.%m'])
-        ]
-
         for file_path in csv_files:
             # Extract date from filename using patterns
             file_name = os.path.basename(file_path)
@@ -3337,8 +3433,8 @@ class SFTPClient:
             matched = False
 
             # Try all patterns until one matches
-            for pattern, formats in date_patterns:
-                date_match = re.search(pattern, file_name)
+            for pattern, formats in CSV_DATE_PATTERNS:
+                date_match = pattern.search(file_name)
                 if not date_match:
                     continue
 
@@ -3381,7 +3477,7 @@ class SFTPClient:
                     break
 
             # If we didn't extract a date but file has "hourly" pattern, try to parse it specially
-            if not matched and not include_hourly and re.search(r'hourly|(\d{2}\.\d{2}\.\d{2})', file_name, re.IGNORECASE):
+            if not matched and not include_hourly and HOURLY_FILE_PATTERN.search(file_name):
                 # Skip hourly files if requested
                 continue
 
@@ -3432,23 +3528,20 @@ class SFTPClient:
             try:
                 # List all entries in the directory
                 # These could be map directories or CSV files directly
-                entries = await self._sftp_client.listdir(directory)
+                entries = await self.scandir(directory)
                 logger.debug(f"Found {len(entries)} entries in directory - checking for map directories and CSV files")
 
                 # Check each entry - could be a map directory or CSV directly
-                for entry in entries:
-                    if entry in ('.', '..'):
-                        continue
-
+                for entry, entry_attrs in entries:
                     full_path = os.path.join(directory, entry)
-                    entry_info = await self.get_file_info(full_path)
+                    is_file, is_dir = await self._classify_entry(full_path, entry_attrs)
 
-                    if not entry_info:
+                    if not is_file and not is_dir:
                         logger.debug(f"Could not get info for {full_path}")
                         continue
 
                     # If it's a directory, it could be a map directory - search it for CSV files
-                    if entry_info.get("is_dir", False):
+                    if is_dir:
                         logger.debug(f"Found potential map directory: {full_path}")
                         map_csv_files = await self.find_files_by_pattern(
                             full_path,
@@ -3473,7 +3566,7 @@ class SFTPClient:
                                 all_csv_files.extend(generic_map_csvs)
 
                     # If it's a file and matches CSV pattern, add it directly
-                    elif entry_info.get("is_file", False) and entry.lower().endswith('.csv'):
+                    elif is_file and entry.lower().endswith('.csv'):
                         logger.debug(f"Found CSV file directly in directory")
                         all_csv_files.append(full_path)
 
@@ -3509,7 +3602,7 @@ class SFTPClient:
                         all_csv_files.extend(generic_csvs)
 
             # Remove duplicates and sort files by name
-            unique_files = list(set(all_csv_files))
+            unique_files = list(dict.fromkeys(all_csv_files))
             logger.debug(f"Total CSV files found after deduplication: {len(unique_files)} (from {len(all_csv_files)} total)")
 
             # Log sample of found files
@@ -3745,14 +3838,14 @@ class SFTPClient:
 
             # First try to get entries in the deathlogs directory - these could be map subdirectories
             try:
-                entries = await self._sftp_client.listdir(deathlogs_path)
+                entries = await self.scandir(deathlogs_path)
                 logger.debug(f"Found {len(entries)} entries in deathlogs path")
 
                 # Check for CSV files directly in deathlogs path
                 direct_csv_pattern = re.compile(r'\.csv$', re.IGNORECASE)
                 direct_csvs = [
                     os.path.join(deathlogs_path, entry)
-                    for entry in entries
+                    for entry, _ in entries
                     if direct_csv_pattern.search(entry)
                 ]
 
@@ -3763,19 +3856,16 @@ class SFTPClient:
                 # Check each entry to find map directories
                 map_directories = []
 
-                for entry in entries:
-                    if entry in ('.', '..'):
-                        continue
-
+                for entry, entry_attrs in entries:
                     entry_path = os.path.join(deathlogs_path, entry)
 
                     try:
-                        entry_info = await self.get_file_info(entry_path)
-                        if not entry_info:
-                            continue
+                        # The listing already carries each entry's type, so
+                        # this only costs a round trip for unusual entries
+                        _, is_dir = await self._classify_entry(entry_path, entry_attrs)
 
                         # If this is a directory, it might be a map directory
-                        if entry_info.get("is_dir", False):
+                        if is_dir:
                             logger.debug(f"Found potential map directory: {entry_path}")
                             map_directories.append(entry_path)
                     except Exception as entry_err:
@@ -3855,8 +3945,9 @@ class SFTPClient:
                 logger.error(f"No CSV files found for server {self.server_id} after exhaustive search")
                 return None
 
-            # Remove duplicates
-            all_csv_files = list(set(all_csv_files))
+            # Remove duplicates, keeping the order the directories were searched
+            # in so ties between equally new files resolve the same way every run
+            all_csv_files = list(dict.fromkeys(all_csv_files))
             logger.debug(f"Found {len(all_csv_files)} unique CSV files across all map directories")
 
             # First try to find the newest file by date in the filename
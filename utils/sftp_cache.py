@@ -0,0 +1,92 @@
+"""
+SFTP manager cache for Tower of Temptation PvP Statistics Bot
+
+This module keeps one SFTPManager per server so the CSV processing paths share
+a single implementation of connection reuse. One cache is kept on the bot and
+shared by every path that runs on it. The managers themselves draw their SSH
+connections from the pool in utils.sftp.
+"""
+import logging
+from typing import Dict, Any, Optional
+
+from utils.sftp import SFTPManager
+
+logger = logging.getLogger(__name__)
+
+class SFTPConnectionCache:
+    """SFTP managers cached by server ID"""
+
+    def __init__(self):
+        """Initialize an empty cache"""
+        self.managers: Dict[str, SFTPManager] = {}
+
+    async def acquire(self, server_id: str, config: Dict[str, Any], connect: bool = True) -> Optional[SFTPManager]:
+        """Get the cached SFTP manager for a server, creating it if needed
+
+        Args:
+            server_id: Server ID
+            config: Server configuration with SFTP details, using either the
+                hostname/port/username/password or the sftp_* key names
+            connect: Whether to connect the manager before returning it.
+                Managers that are not connected up front connect on first use
+
+        Returns:
+            SFTPManager for this server, or None if it could not be created
+        """
+        sftp = self.managers.get(server_id)
+        if sftp is not None:
+            # A manager that was never connected is still usable, it
+            # connects on first use; only a dropped connection is replaced
+            if not connect or sftp.is_connected:
+                return sftp
+            await sftp.disconnect()
+            del self.managers[server_id]
+
+        hostname = config.get("hostname") or config.get("sftp_host")
+        if not hostname:
+            logger.error(f"Missing hostname for server {server_id}")
+            return None
+
+        try:
+            sftp = SFTPManager(
+                hostname=hostname,
+                port=config.get("port") or config.get("sftp_port", 22),
+                username=config.get("username") or config.get("sftp_username"),
+                password=config.get("password") or config.get("sftp_password"),
+                server_id=server_id,
+                original_server_id=config.get("original_server_id")
+            )
+            if connect:
+                await sftp.connect()
+        except Exception as e:
+            logger.error(f"Failed to create SFTP manager for server {server_id}: {e}")
+            return None
+
+        # Store the manager for reuse
+        self.managers[server_id] = sftp
+        return sftp
+
+    async def close_all(self) -> None:
+        """Disconnect and forget every cached manager"""
+        managers = list(self.managers.values())
+        self.managers.clear()
+        for sftp in managers:
+            try:
+                await sftp.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting SFTP manager for {sftp.hostname}: {e}")
+
+def get_shared_connection_cache(bot) -> SFTPConnectionCache:
+    """Get the SFTP manager cache shared by everything running on a bot
+
+    Args:
+        bot: The Discord bot instance the cache is kept on
+
+    Returns:
+        The bot's SFTPConnectionCache, created on first use
+    """
+    cache = getattr(bot, "sftp_connection_cache", None)
+    if cache is None:
+        cache = SFTPConnectionCache()
+        bot.sftp_connection_cache = cache
+    return cache
@@ -25,9 +25,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# MongoDB connection
+# MongoDB connection, created on first use and shared by later calls
+_db_client = None
+_db = None
+
 async def get_database():
-    """Connect to MongoDB database"""
+    """Connect to MongoDB database, reusing the existing connection if there is one"""
+    global _db_client, _db
+
+    if _db is not None:
+        return _db
+
     mongodb_uri = os.environ.get("MONGODB_URI")
     if mongodb_uri is None:
         logger.error("MONGODB_URI environment variable not set")
@@ -35,24 +43,25 @@ async def get_database():
         
     try:
         # Create client with configuration
-        client = motor.motor_asyncio.AsyncIOMotorClient(
-            mongodb_uri,
-            serverSelectionTimeoutMS=5000,
-            connectTimeoutMS=10000,
-            socketTimeoutMS=45000,
-            maxPoolSize=100,
-            retryWrites=True
-        )
+        if _db_client is None:
+            _db_client = motor.motor_asyncio.AsyncIOMotorClient(
+                mongodb_uri,
+                serverSelectionTimeoutMS=5000,
+                connectTimeoutMS=10000,
+                socketTimeoutMS=45000,
+                maxPoolSize=100,
+                retryWrites=True
+            )
         
         # Verify connection
-        await client.admin.command('ping')
+        await _db_client.admin.command('ping')
         
         # Get database
         db_name = os.environ.get("MONGODB_DB", "tower_of_temptation")
-        db = client[db_name]
+        _db = _db_client[db_name]
         logger.info(f"Connected to MongoDB database: {db_name}")
         
-        return db
+        return _db
     except (mongo_errors.ConnectionFailure, mongo_errors.ServerSelectionTimeoutError) as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         return None
@@ -1,9 +1,17 @@
+import mmap
 import re
 import os
 
 def process_file(file_path):
-    with open(file_path, 'r') as file:
-        content = file.read()
+    # Scan through a read-only mapping first so cogs without any embed calls
+    # are never copied into memory or decoded
+    if os.path.getsize(file_path) == 0:
+        return 0
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'EmbedBuilder.create_') == -1:
+                return 0
+            content = mm[:].decode('utf-8')
     
     # Count the number of replacements
     replacements = 0
@@ -1,10 +1,127 @@
 """Update embed creation to use Guild models instead of Discord Guild objects"""
-import re
+import io
+import mmap
 import os
+import re
+import textwrap
+import tokenize
+
+# Embed factory calls that should be themed with the guild model
+EMBED_CALL_PATTERN = re.compile(r'EmbedBuilder\.create_(?:error|success|base)_embed')
+
+# Guild model lookup inserted at the top of a function's try block
+GUILD_MODEL_INIT = (
+    "# Get guild model for themed embed\n"
+    "guild_data = None\n"
+    "guild_model = None\n"
+    "try:\n"
+    "    guild_data = await self.bot.db.guilds.find_one({\"guild_id\": ctx.guild.id})\n"
+    "    if guild_data is not None:\n"
+    "        guild_model = Guild(self.bot.db, guild_data)\n"
+    "except Exception as e:\n"
+    "    logger.warning(f\"Error getting guild model: {e}\")\n"
+)
+
+def index_async_functions(content):
+    """Find the line span of every async function with a single tokenizer pass
+    
+    A function ends at the first logical line that starts at or left of the
+    column its definition starts at. Its body column is taken from the
+    INDENT token that follows the definition's header line.
+    
+    Returns:
+        List of (start_line, end_line, body_column) tuples, 1-based with
+        end_line exclusive; body_column is None for one-line functions
+    """
+    spans = []
+    open_functions = []  # [column, start_line, body_column] of functions still being read
+    at_line_start = True
+    pending_async = None
+    header = None  # function whose definition line is being read
+    awaiting_body = None  # function whose body has not started yet
+    
+    for token in tokenize.generate_tokens(io.StringIO(content).readline):
+        if token.type == tokenize.INDENT and awaiting_body is not None:
+            awaiting_body[2] = token.end[1]
+            awaiting_body = None
+            continue
+        if token.type in (tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT):
+            continue
+        if token.type == tokenize.NEWLINE:
+            at_line_start = True
+            if header is not None:
+                awaiting_body, header = header, None
+            continue
+        if token.type == tokenize.ENDMARKER:
+            break
+        
+        line, column = token.start
+        if pending_async is not None:
+            if token.string == 'def':
+                header = [*pending_async, None]
+                open_functions.append(header)
+            pending_async = None
+        
+        if at_line_start:
+            at_line_start = False
+            # The body was on the definition line itself
+            awaiting_body = None
+            while open_functions and open_functions[-1][0] >= column:
+                _, start_line, body_column = open_functions.pop()
+                spans.append((start_line, line, body_column))
+            if token.string == 'async':
+                pending_async = (column, line)
+    
+    end_of_file = content.count('\n') + 2
+    spans.extend((start_line, end_of_file, body_column) for _, start_line, body_column in open_functions)
+    return spans
+
+def add_guild_models(content):
+    """Initialize guild_model in functions that build embeds without one
+    
+    The initialization goes at the top of the first try block ahead of the
+    function's first embed call. Only a try at the function body's own
+    indentation counts, so nested tries and closures are left alone.
+    """
+    lines = content.splitlines(keepends=True)
+    insertions = {}
+    
+    for start_line, end_line, body_column in index_async_functions(content):
+        if body_column is None:
+            continue
+        body = lines[start_line - 1:end_line - 1]
+        first_embed = next((i for i, line in enumerate(body) if EMBED_CALL_PATTERN.search(line)), None)
+        if first_embed is None or any('guild_model' in line for line in body[:first_embed]):
+            continue
+        
+        try_line = next(
+            (i for i, line in enumerate(body[:first_embed])
+             if line.strip() == 'try:' and len(line) - len(line.lstrip()) == body_column),
+            None
+        )
+        if try_line is None:
+            continue
+        
+        # Match the indentation of the try block's first statement
+        statement = next(line for line in body[try_line + 1:] if line.strip())
+        indent = statement[:len(statement) - len(statement.lstrip())]
+        insertions[start_line + try_line] = textwrap.indent(GUILD_MODEL_INIT, indent)
+    
+    # Insert from the bottom up so earlier line numbers stay valid
+    for index in sorted(insertions, reverse=True):
+        lines.insert(index, insertions[index])
+    return ''.join(lines)
 
 def process_file(file_path):
-    with open(file_path, 'r') as file:
-        content = file.read()
+    # Scan through a read-only mapping first so cogs without any embed calls
+    # are never copied into memory or decoded
+    if os.path.getsize(file_path) == 0:
+        return False
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'EmbedBuilder.create_') == -1:
+                return False
+            content = mm[:].decode('utf-8')
     
     # Track original content to check if changes were made
     original_content = content
@@ -32,25 +149,7 @@ def process_file(file_path):
     
     # Pattern 5: Add Guild model initialization where it doesn't exist
     # Find functions that use EmbedBuilder but don't create a guild_model
-    function_pattern = r'(async\s+def\s+[^\(]+\([^\)]*\)\s*:\s*[^"]*?"""[^"]*"""\s*try\s*:\s*.*?)(EmbedBuilder\.create_(?:error|success|base)_embed)'
-    
-    def add_guild_model(match):
-        function_code = match.group(1)
-        embed_creation = match.group(2)
-        
-        # Check if guild_model is already defined or used
-        if 'guild_model' not in function_code:
-            # Get proper indentation
-            indentation = re.search(r'\n(\s+)', function_code)
-            if indentation:
-                indent = indentation.group(1)
-                # Add guild model initialization before embed creation
-                guild_model_code = f"\n{indent}# Get guild model for themed embed\n{indent}guild_data = None\n{indent}guild_model = None\n{indent}try:\n{indent}    guild_data = await self.bot.db.guilds.find_one({{\"guild_id\": ctx.guild.id}})\n{indent}    if guild_data is not None:\n{indent}        guild_model = Guild(self.bot.db, guild_data)\n{indent}except Exception as e:\n{indent}    logger.warning(f\"Error getting guild model: {{e}}\")\n"
-                return function_code.replace('try:', 'try:' + guild_model_code, 1) + embed_creation
-        
-        return function_code + embed_creation
-    
-    content = re.sub(function_pattern, add_guild_model, content, flags=re.DOTALL)
+    content = add_guild_models(content)
     
     # Only write the file if changes were made
     if content != original_content:
@@ -60,14 +159,18 @@ def process_file(file_path):
     
     return False
 
-# Process all cog files
-cog_files = [f for f in os.listdir('cogs') if f.endswith('.py')]
-updated_files = 0
-
-for cog_file in cog_files:
-    file_path = os.path.join('cogs', cog_file)
-    if process_file(file_path):
-        print(f"Updated Guild model usage in {file_path}")
-        updated_files += 1
+def main():
+    # Process all cog files
+    cog_files = [f for f in os.listdir('cogs') if f.endswith('.py')]
+    updated_files = 0
+    
+    for cog_file in cog_files:
+        file_path = os.path.join('cogs', cog_file)
+        if process_file(file_path):
+            print(f"Updated Guild model usage in {file_path}")
+            updated_files += 1
+    
+    print(f"\nTotal updated files: {updated_files}")
 
-print(f"\nTotal updated files: {updated_files}")
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ import astor
 import importlib
 import importlib.util
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Set, Tuple, Any, Optional, Union
 from pathlib import Path
 
@@ -67,6 +68,16 @@ FEATURES = {
     ]
 }
 
+# Below this many files, analyzing them serially beats starting a process pool
+PARALLEL_ANALYSIS_MIN_FILES = 3
+
+# Each feature's patterns compiled once into a single alternation, so a
+# source snippet is scanned once per feature instead of once per pattern
+FEATURE_PATTERNS = {
+    feature: re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    for feature, patterns in FEATURES.items()
+}
+
 class CommandUpgrader(ast.NodeVisitor):
     """AST visitor to analyze and upgrade command functions."""
     
@@ -132,7 +143,7 @@ class CommandUpgrader(ast.NodeVisitor):
         if self.current_function:
             # Check for guild-only checks
             if_source = astor.to_source(node).strip()
-            if any(re.search(pattern, if_source) for pattern in FEATURES["guild_check"]):
+            if FEATURE_PATTERNS["guild_check"].search(if_source):
                 self.current_features.add("guild_check")
         self.generic_visit(node)
     
@@ -143,8 +154,8 @@ class CommandUpgrader(ast.NodeVisitor):
             call_source = astor.to_source(node).strip()
             
             # Check for all feature patterns
-            for feature, patterns in FEATURES.items():
-                if any(re.search(pattern, call_source) for pattern in patterns):
+            for feature, pattern in FEATURE_PATTERNS.items():
+                if pattern.search(call_source):
                     self.current_features.add(feature)
                 
         self.generic_visit(node)
@@ -168,11 +179,12 @@ def find_command_files() -> List[str]:
                 if file.endswith(".py"):
                     file_path = os.path.join(directory, file)
                     
-                    # Check if file contains command patterns but not our enhanced handler
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    # Check if file contains command patterns but not our enhanced handler.
+                    # The markers are ASCII, so the raw bytes are searched without decoding
+                    with open(file_path, 'rb') as f:
                         content = f.read()
                         
-                        if "command" in content and "@command" in content and "command_handler" not in content:
+                        if b"@command" in content and b"command_handler" not in content:
                             command_files.append(file_path)
     
     return command_files
@@ -263,13 +275,18 @@ def suggest_command_upgrades() -> Dict[str, Any]:
     command_files = find_command_files()
     logger.info(f"Found {len(command_files)} files with potential commands to upgrade")
     
-    # Analyze each file
+    # Analyze each file. Parsing and walking each file's AST is CPU-bound and
+    # independent of the other files, so larger sets are spread over processes
+    if len(command_files) < PARALLEL_ANALYSIS_MIN_FILES:
+        analyses = [analyze_command_file(file_path) for file_path in command_files]
+    else:
+        with ProcessPoolExecutor() as executor:
+            analyses = list(executor.map(analyze_command_file, command_files))
+    
     all_upgrades = {}
     file_upgrades = {}
     
-    for file_path in command_files:
-        command_features = analyze_command_file(file_path)
-        
+    for file_path, command_features in zip(command_files, analyses):
         if command_features:
             # Generate upgrade suggestions for each command
             file_suggestions = {}